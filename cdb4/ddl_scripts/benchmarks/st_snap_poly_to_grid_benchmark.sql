@@ -0,0 +1,314 @@
+-- ***********************************************************************
+--
+--      QGIS Package for the CityGML 3D City Database (for PostgreSQL)
+--
+--
+--                        Copyright 2023
+--
+-- Delft University of Technology, The Netherlands
+-- 3D Geoinformation Group
+-- https://3d.bk.tudelft.nl/
+-- 
+-- Licensed under the Apache License, Version 2.0 (the "License");
+-- you may not use this file except in compliance with the License.
+-- You may obtain a copy of the License at
+-- 
+--     http://www.apache.org/licenses/LICENSE-2.0
+--     
+-- Unless required by applicable law or agreed to in writing, software
+-- distributed under the License is distributed on an "AS IS" BASIS,
+-- WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+-- See the License for the specific language governing permissions and
+-- limitations under the License.
+--
+-- ***********************************************************************
+--
+-- Benchmark of qgis_pkg.st_snap_poly_to_grid(...) and qgis_pkg.st_3darea_poly(...)
+-- against their previous versions (up to 0.10.4: loop over ST_DumpPoints with one ST_SetPoint
+-- per vertex, and a PL/pgSQL walk over ST_PointN). It is not part of the installation.
+--
+-- Requirements:
+-- * qgis_pkg installed (current version) in the database, and a user allowed to use it
+-- * the bundled test dataset (test_datasets/FZK-Haus-LoD-all-KIT-IAI-KHH-B36-V1.zip) imported
+--   with the 3DCityDB Importer/Exporter into a citydb schema (default: citydb)
+--
+-- Run with psql, e.g.:
+--   psql -d <database> -v cdb_schema=citydb -v n_runs=200 -f st_snap_poly_to_grid_benchmark.sql
+--
+-- All polygons of table surface_geometry are processed n_runs times (FZK-Haus is small) by each
+-- function, sequentially (no parallel workers), after a warm-up run. The old functions are created
+-- in pg_temp, so nothing is left in the database. The output reports, for each function, the number
+-- of calls, the total time and the time per call, and then the number of results that differ
+-- between the old and the new versions (it must be 0).
+--
+-- ***********************************************************************
+
+\set ON_ERROR_STOP on
+\if :{?cdb_schema}
+\else
+  \set cdb_schema citydb
+\endif
+\if :{?n_runs}
+\else
+  \set n_runs 100
+\endif
+
+SET max_parallel_workers_per_gather = 0;
+
+----------------------------------------------------------------
+-- Previous versions (as of 0.10.4), created in pg_temp
+----------------------------------------------------------------
+CREATE OR REPLACE FUNCTION pg_temp.st_3darea_poly_old(
+polygon3d geometry			-- must be a 3D polygon
+)
+RETURNS numeric AS $$
+DECLARE
+ring geometry;
+n_points integer;
+i integer; j integer;
+p1 geometry; p2 geometry;
+x1 numeric; y1 numeric; z1 numeric;
+x2 numeric; y2 numeric; z2 numeric;
+n_interior_rings integer;
+nx_t numeric := 0;
+ny_t numeric := 0;
+nz_t numeric := 0;
+nl_t numeric := 0;
+area numeric := 0;
+
+BEGIN
+
+--polygon3d := ST_Force3D(polygon3d);
+ring := ST_RemoveRepeatedPoints(ST_ExteriorRing(polygon3d));
+ring := ST_ExteriorRing(polygon3d);
+n_points := ST_NPoints(ring);
+p1 := ST_PointN(ring,1);
+x1 := ST_X(p1);
+y1 := ST_Y(p1);
+z1 := ST_Z(p1);
+
+FOR i IN 2..n_points LOOP
+	p2 := ST_PointN(ring,i);
+	x2 := ST_X(p2);
+	y2 := ST_Y(p2);
+	z2 := ST_Z(p2);
+	nx_t := nx_t + (y1-y2)*(z1+z2); 
+	ny_t := ny_t + (z1-z2)*(x1+x2);
+	nz_t := nz_t + (x1-x2)*(y1+y2);
+	x1 := x2;
+	y1 := y2;
+	z1 := z2;
+END LOOP;
+
+n_interior_rings := ST_NumInteriorRings(polygon3d);
+IF n_interior_rings > 0 THEN
+	FOR j IN 1..n_interior_rings LOOP
+		ring := ST_RemoveRepeatedPoints(ST_Reverse(ST_InteriorRingN(polygon3d,j)));	
+		n_points := ST_NPoints(ring);
+		p1 := ST_PointN(ring,1);
+		x1 := ST_X(p1);
+		y1 := ST_Y(p1);
+		z1 := ST_Z(p1);
+		FOR i IN 2..n_points LOOP
+			p2 := ST_PointN(ring,i);
+			x2 := ST_X(p2);
+			y2 := ST_Y(p2);
+			z2 := ST_Z(p2);
+			nx_t := nx_t - (y1-y2)*(z1+z2); 
+			ny_t := ny_t - (z1-z2)*(x1+x2);
+			nz_t := nz_t - (x1-x2)*(y1+y2);
+			x1 := x2;
+			y1 := y2;
+			z1 := z2;
+		END LOOP; --loop ring points		
+	END LOOP; -- loop ring
+END IF;
+
+area := sqrt(nx_t^2+ny_t^2+nz_t^2)/2;
+
+RETURN area;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'util_pkg.st_3darea_poly(): Error QUERY_CANCELED';
+	WHEN OTHERS THEN
+		RAISE EXCEPTION 'util_pkg.st_3darea_poly(): %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION pg_temp.st_snap_poly_to_grid_old(
+polygon 			geometry,
+perform_snapping 	integer DEFAULT 0, 			-- i.e. default is 0 ("do nothing"), otherwise 1.
+digits 				integer DEFAULT 3,			-- number of digits after comma for precision
+area_min			numeric DEFAULT 0.0001 		-- minimum acceptable area of a polygon 
+)
+RETURNS geometry AS $$
+DECLARE
+dec_prec 		numeric;
+srid_id 		integer;
+snapped_poly 	geometry(PolygonZ);
+num_geoms		integer;
+is_empty_geom 	boolean;
+ring 			geometry(LinestringZ);
+o_ring 			geometry(LinestringZ);
+i_ring			geometry(LinestringZ);
+i_rings 		geometry(LinestringZ)[];
+n_int_rings		integer;
+i integer; r RECORD;
+area_poly 		numeric;
+new_polygon 	geometry(PolygonZ);
+
+BEGIN
+
+CASE 
+	WHEN perform_snapping = 0 THEN
+		RETURN polygon;
+	WHEN perform_snapping = 1 THEN
+		dec_prec := 10^(-digits);
+		srid_id := ST_SRID(polygon);
+		snapped_poly := ST_SnapToGrid(polygon, ST_GeomFromText('Point(0 0 0)'), dec_prec, dec_prec, dec_prec, 0);
+		is_empty_geom := ST_IsEmpty(snapped_poly);
+
+		IF is_empty_geom IS TRUE THEN
+			RETURN NULL;
+		ELSE -- there is a geometry from the resulting snap to grid process
+			num_geoms := ST_NumGeometries(snapped_poly);
+			IF num_geoms > 1 THEN
+				RAISE NOTICE 'Number of geometries resulting from the snapped polygon is %', num_geoms;
+			END IF;
+
+			ring := ST_ExteriorRing(snapped_poly);
+			o_ring := ring;
+			FOR r IN SELECT
+				foo.path[1]-1 AS zero_based_index,
+				round(ST_x(foo.geom)::numeric,digits)::double precision AS px,
+				round(ST_y(foo.geom)::numeric,digits)::double precision AS py,
+				round(ST_z(foo.geom)::numeric,digits)::double precision AS pz
+			FROM ST_DumpPoints(ring) AS foo
+			LOOP
+				o_ring := ST_SetPoint(o_ring, r.zero_based_index, ST_MakePoint(r.px, r.py, r.pz));
+			END LOOP;
+			o_ring := ST_SetSRID(o_ring, srid_id);
+
+			n_int_rings	:= ST_NumInteriorRings(snapped_poly);
+			IF n_int_rings > 0 THEN
+				FOR i IN 1..n_int_rings LOOP
+					ring := ST_InteriorRingN(snapped_poly, i);
+					i_ring := ring;
+					FOR r IN SELECT
+						foo.path[1]-1 AS zero_based_index,
+						round(ST_x(foo.geom)::numeric,digits)::double precision AS px,
+						round(ST_y(foo.geom)::numeric,digits)::double precision AS py,
+						round(ST_z(foo.geom)::numeric,digits)::double precision AS pz
+					FROM ST_DumpPoints(ring) AS foo
+					LOOP
+						i_ring := ST_SetPoint(i_ring, r.zero_based_index, ST_MakePoint(r.px, r.py, r.pz));
+					END LOOP;			
+					i_rings := array_append(i_rings, i_ring);
+				END LOOP;
+			END IF;
+		END IF;
+ELSE
+	RAISE EXCEPTION 'Value of "perform_snapping" input parameter is invalid. It must be either 0 or 1'; 
+END CASE;
+
+IF n_int_rings = 0 THEN
+	new_polygon := ST_MakePolygon(o_ring);
+ELSE
+	new_polygon := ST_MakePolygon(o_ring, i_rings);
+END IF;
+
+area_poly := pg_temp.st_3darea_poly_old(new_polygon);
+
+IF (area_poly IS NULL) OR (area_poly <= area_min) THEN
+	RETURN NULL;
+ELSE
+	RETURN new_polygon;
+END IF;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.st_snap_poly_to_grid(): Error QUERY_CANCELED';
+	WHEN OTHERS THEN
+		RAISE EXCEPTION 'qgis_pkg.st_snap_poly_to_grid(): %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+----------------------------------------------------------------
+-- Input polygons and settings
+----------------------------------------------------------------
+DROP TABLE IF EXISTS pg_temp.bench_poly;
+CREATE TEMP TABLE bench_poly AS
+SELECT sg.id, sg.geometry
+FROM :"cdb_schema".surface_geometry AS sg
+WHERE sg.geometry IS NOT NULL AND ST_GeometryType(sg.geometry) = 'ST_Polygon';
+
+DROP TABLE IF EXISTS pg_temp.bench_cfg;
+CREATE TEMP TABLE bench_cfg AS
+SELECT :n_runs::integer AS n_runs, 3 AS digits, 0.0001::numeric AS area_min;
+
+DROP TABLE IF EXISTS pg_temp.bench_res;
+CREATE TEMP TABLE bench_res (
+  func     varchar,
+  version  varchar,
+  n_calls  bigint,
+  total_ms numeric
+);
+
+----------------------------------------------------------------
+-- Timings
+----------------------------------------------------------------
+DO $BENCH$
+DECLARE
+  cfg    RECORD;
+  n_poly bigint;
+  t0     timestamptz;
+  dummy  bigint;
+BEGIN
+SELECT * INTO cfg FROM bench_cfg;
+SELECT count(*) INTO n_poly FROM bench_poly;
+IF n_poly = 0 THEN
+  RAISE EXCEPTION 'No polygons found in table surface_geometry: is the test dataset imported?';
+END IF;
+
+-- Warm-up (caches, function compilation)
+PERFORM count(pg_temp.st_snap_poly_to_grid_old(p.geometry, 1, cfg.digits, cfg.area_min)) FROM bench_poly AS p;
+PERFORM count(qgis_pkg.st_snap_poly_to_grid(p.geometry, 1, cfg.digits, cfg.area_min)) FROM bench_poly AS p;
+
+t0 := clock_timestamp();
+SELECT count(pg_temp.st_3darea_poly_old(p.geometry)) INTO dummy FROM bench_poly AS p, generate_series(1, cfg.n_runs) AS s;
+INSERT INTO bench_res VALUES ('st_3darea_poly', 'old', n_poly * cfg.n_runs, extract(epoch FROM clock_timestamp() - t0) * 1000);
+
+t0 := clock_timestamp();
+SELECT count(qgis_pkg.st_3darea_poly(p.geometry)) INTO dummy FROM bench_poly AS p, generate_series(1, cfg.n_runs) AS s;
+INSERT INTO bench_res VALUES ('st_3darea_poly', 'new', n_poly * cfg.n_runs, extract(epoch FROM clock_timestamp() - t0) * 1000);
+
+t0 := clock_timestamp();
+SELECT count(pg_temp.st_snap_poly_to_grid_old(p.geometry, 1, cfg.digits, cfg.area_min)) INTO dummy FROM bench_poly AS p, generate_series(1, cfg.n_runs) AS s;
+INSERT INTO bench_res VALUES ('st_snap_poly_to_grid', 'old', n_poly * cfg.n_runs, extract(epoch FROM clock_timestamp() - t0) * 1000);
+
+t0 := clock_timestamp();
+SELECT count(qgis_pkg.st_snap_poly_to_grid(p.geometry, 1, cfg.digits, cfg.area_min)) INTO dummy FROM bench_poly AS p, generate_series(1, cfg.n_runs) AS s;
+INSERT INTO bench_res VALUES ('st_snap_poly_to_grid', 'new', n_poly * cfg.n_runs, extract(epoch FROM clock_timestamp() - t0) * 1000);
+END $BENCH$;
+
+SELECT
+  r.func,
+  r.version,
+  r.n_calls,
+  round(r.total_ms, 1) AS total_ms,
+  round(r.total_ms * 1000 / r.n_calls, 2) AS us_per_call,
+  round(o.total_ms / r.total_ms, 2) AS speed_up
+FROM bench_res AS r
+  INNER JOIN bench_res AS o ON (o.func = r.func AND o.version = 'old')
+ORDER BY r.func, r.version DESC;
+
+----------------------------------------------------------------
+-- Same results?
+----------------------------------------------------------------
+SELECT
+  count(*) AS n_polygons,
+  count(*) FILTER (WHERE abs(pg_temp.st_3darea_poly_old(p.geometry) - qgis_pkg.st_3darea_poly(p.geometry)) > 1e-9) AS n_diff_area,
+  count(*) FILTER (WHERE ST_AsEWKB(pg_temp.st_snap_poly_to_grid_old(p.geometry, 1, c.digits, c.area_min))
+    IS DISTINCT FROM ST_AsEWKB(qgis_pkg.st_snap_poly_to_grid(p.geometry, 1, c.digits, c.area_min))) AS n_diff_snap
+FROM bench_poly AS p, bench_cfg AS c;
@@ -53,6 +53,7 @@
 -- qgis_pkg.list_usr_schemas()
 -- qgis_pkg.grant_qgis_usr_privileges(...)
 -- qgis_pkg.revoke_qgis_usr_privileges(...)
+-- qgis_pkg.get_cdb_schema_signature(...)
 -- qgis_pkg.compute_cdb_schema_extents(...)
 -- qgis_pkg.upsert_extents(...)
 -- qgis_pkg.generate_mview_bbox_poly(...)
@@ -61,9 +62,19 @@
 -- qgis_pkg.feature_type_counter(...)
 -- qgis_pkg.root_class_checker(...)
 -- qgis_pkg.root_class_counter(...)
+-- qgis_pkg.geometry_column_counter(...)
+-- qgis_pkg.geometry_column_checker(...)
 -- qgis_pkg.has_layers_for_cdb_schema(...)
 -- qgis_pkg.class_name_to_class_id(...)
+-- qgis_pkg.get_cdb_schema_srid(...)
+-- qgis_pkg.list_gviews(...)
+-- qgis_pkg.list_gview_root_geoms(...)
 -- qgis_pkg.gview_counter(...)
+-- qgis_pkg.gview_counter_bulk(...)
+-- qgis_pkg.gview_delta(...)
+-- qgis_pkg.drop_gview(...)
+-- qgis_pkg.refresh_gview(...)
+-- qgis_pkg.refresh_gview_delta(...)
 -- qgis_pkg.upsert_settings(...)
 -- qgis_pkg.compute_schema_size()
 -- qgis_pkg.st_3darea_poly(...)
@@ -72,6 +83,7 @@
 -- qgis_pkg.generate_sql_matview_footer(...)
 -- qgis_pkg.generate_sql_view_header(...)
 -- qgis_pkg.generate_sql_matview_else(...)
+-- qgis_pkg.generate_sql_root_geom_cache(...)
 -- qgis_pkg.generate_sql_triggers(...)
 --
 -- ***********************************************************************
@@ -105,9 +117,9 @@ DECLARE
 BEGIN
 major_version  := 0;
 minor_version  := 10;
-minor_revision := 4;
+minor_revision := 5;
 code_name      := 'November rain';
-release_date   := '2023-11-18'::date;
+release_date   := '2023-12-04'::date;
 version        := concat(major_version,'.',minor_version,'.',minor_revision);
 full_version   := concat(major_version,'.',minor_version,'.',minor_revision,' "',code_name,'", released on ',release_date);
 
@@ -119,7 +131,7 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.qgis_pkg_version(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql STABLE;
 COMMENT ON FUNCTION qgis_pkg.qgis_pkg_version() IS 'Returns the version of the QGIS Package for the 3DCityDB';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.qgis_pkg_version() FROM public;
 
@@ -185,7 +197,7 @@ RETURNS void
 AS $$
 DECLARE
 cdb_schemas_array 	CONSTANT varchar[] := (SELECT array_agg(s.cdb_schema) FROM qgis_pkg.list_cdb_schemas(FALSE) AS s);
-rec RECORD;
+tables_list text;
 
 BEGIN
 -- Check that the cdb_schema exists and is valid
@@ -193,34 +205,34 @@ IF (cdb_schema IS NULL) OR NOT cdb_schema = ANY(cdb_schemas_array) THEN
 	RAISE EXCEPTION 'cdb_schema is invalid. It must be one of %', cdb_schemas_array;
 END IF;
 
--- Truncate tables
-FOR rec IN
-    SELECT table_name FROM information_schema.tables where table_schema = cdb_schema
-    AND table_name <> 'database_srs'
-    AND table_name <> 'objectclass'
-    AND table_name <> 'index_table'
-    AND table_name <> 'ade'
-    AND table_name <> 'schema'
-    AND table_name <> 'schema_to_objectclass'
-    AND table_name <> 'schema_referencing'
-    AND table_name <> 'aggregation_info'
-    AND table_name NOT LIKE 'tmp_%'
-  LOOP
-   	EXECUTE format('TRUNCATE TABLE %I.%I CASCADE', cdb_schema, rec.table_name);
+-- Truncate all tables at once: a single statement takes all the locks and checks the foreign keys only once.
+SELECT string_agg(format('%I.%I', t.table_schema, t.table_name), ', ' ORDER BY t.table_name) INTO tables_list
+FROM information_schema.tables AS t
+WHERE t.table_schema = cdb_schema AND t.table_type = 'BASE TABLE'
+    AND t.table_name <> 'database_srs'
+    AND t.table_name <> 'objectclass'
+    AND t.table_name <> 'index_table'
+    AND t.table_name <> 'ade'
+    AND t.table_name <> 'schema'
+    AND t.table_name <> 'schema_to_objectclass'
+    AND t.table_name <> 'schema_referencing'
+    AND t.table_name <> 'aggregation_info'
+    AND t.table_name NOT LIKE 'tmp_%';
+
+IF tables_list IS NOT NULL THEN
+	EXECUTE format('TRUNCATE TABLE %s CASCADE', tables_list);
 	-- This would suffice, if the tables were created using the IDENTITY clause.
-	--EXECUTE format('TRUNCATE TABLE %I.%I RESTART IDENTITY CASCADE', cdb_schema, rec.table_name);
-  END LOOP;
-
-FOR rec IN 
-    SELECT sequence_name FROM information_schema.sequences where sequence_schema = cdb_schema
-    AND sequence_name <> 'ade_seq'
-    AND sequence_name <> 'schema_seq'
-  LOOP
-	-- The user must be owner of the sequence to RESTART it.
-	-- EXECUTE format('ALTER SEQUENCE %I.%I RESTART', cdb_schema, rec.sequence_name);
-	-- In this way, the user can reset it to 1 even without ownership.
-    EXECUTE format('SELECT setval(''%I.%I'', 1, false)', cdb_schema, rec.sequence_name);
-  END LOOP;
+	--EXECUTE format('TRUNCATE TABLE %s RESTART IDENTITY CASCADE', tables_list);
+END IF;
+
+-- Reset all sequences at once.
+-- The user must be owner of the sequence to RESTART it (ALTER SEQUENCE ... RESTART).
+-- In this way, the user can reset it to 1 even without ownership.
+PERFORM setval(format('%I.%I', s.sequence_schema, s.sequence_name)::regclass, 1, false)
+FROM information_schema.sequences AS s
+WHERE s.sequence_schema = cdb_schema
+    AND s.sequence_name <> 'ade_seq'
+    AND s.sequence_name <> 'schema_seq';
 
 EXCEPTION
 	WHEN QUERY_CANCELED THEN
@@ -259,7 +271,7 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.create_qgis_pkg_usrgroup_name(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql STABLE;
 COMMENT ON FUNCTION qgis_pkg.create_qgis_pkg_usrgroup_name() IS 'Creates the name of the qgis_pkg database group for the current database';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.create_qgis_pkg_usrgroup_name() FROM public;
 
@@ -496,7 +508,7 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.create_qgis_usr_schema_name(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql STABLE;
 COMMENT ON FUNCTION qgis_pkg.create_qgis_usr_schema_name(varchar) IS 'Creates the qgis schema name for the provided user';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.create_qgis_usr_schema_name(varchar) FROM public;
 
@@ -1813,14 +1825,59 @@ COMMENT ON FUNCTION qgis_pkg.revoke_qgis_usr_privileges(varchar, varchar[]) IS '
 REVOKE EXECUTE ON FUNCTION qgis_pkg.revoke_qgis_usr_privileges(varchar, varchar[]) FROM public;
 
 
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.GET_CDB_SCHEMA_SIGNATURE
+----------------------------------------------------------------
+-- Returns a cheap signature of table cityobject, read from the PostgreSQL statistics:
+-- it changes whenever rows are updated or deleted, or the table is truncated or rewritten.
+-- Inserts do not change it: new rows are detected by their id (see qgis_pkg.compute_cdb_schema_extents(...)).
+-- Please note that the statistics of the most recent transactions may lag (typically < 1 s).
+DROP FUNCTION IF EXISTS    qgis_pkg.get_cdb_schema_signature(varchar);
+CREATE OR REPLACE FUNCTION qgis_pkg.get_cdb_schema_signature(
+cdb_schema 		varchar
+)
+RETURNS varchar
+AS $$
+DECLARE
+cdb_signature varchar := NULL;
+
+BEGIN
+SELECT concat_ws('/', c.relfilenode, s.n_tup_upd, s.n_tup_del)
+INTO cdb_signature
+FROM pg_class AS c
+	INNER JOIN pg_namespace AS n ON (n.oid = c.relnamespace)
+	LEFT JOIN pg_stat_all_tables AS s ON (s.relid = c.oid)
+WHERE n.nspname::varchar = cdb_schema AND c.relname = 'cityobject';
+
+RETURN cdb_signature;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.get_cdb_schema_signature(): Error QUERY_CANCELED';
+  WHEN OTHERS THEN 
+		RAISE EXCEPTION 'qgis_pkg.get_cdb_schema_signature(): %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql STABLE;
+COMMENT ON FUNCTION    qgis_pkg.get_cdb_schema_signature(varchar) IS 'Returns the signature of table cityobject of the selected cdb_schema, used to detect stale extents';
+REVOKE ALL ON FUNCTION qgis_pkg.get_cdb_schema_signature(varchar) FROM PUBLIC;
+
+-- Example:
+--SELECT qgis_pkg.get_cdb_schema_signature('citydb');
+
+
 ----------------------------------------------------------------
 -- Create FUNCTION QGIS_PKG.COMPUTE_CDB_SCHEMA_EXTENTS
 ----------------------------------------------------------------
+-- If the usr_schema is passed, the extents stored in table usr_schema.extents are reused, as long as
+-- table cityobject was not updated or deleted from since then: only the new objects, if any, are scanned.
+-- Otherwise, the whole table cityobject is scanned.
 DROP FUNCTION IF EXISTS    qgis_pkg.compute_cdb_schema_extents(varchar, boolean);
+DROP FUNCTION IF EXISTS    qgis_pkg.compute_cdb_schema_extents(varchar, boolean, varchar);
 CREATE OR REPLACE FUNCTION qgis_pkg.compute_cdb_schema_extents(
 cdb_schema 		varchar,
-is_geographic	boolean DEFAULT FALSE  -- TRUE is EPSG uses long-lat, FALSE if is projected (Default)
+is_geographic	boolean DEFAULT FALSE,  -- TRUE is EPSG uses long-lat, FALSE if is projected (Default)
 -- The polygon will have its coordinated approximated to the 6th decimal position
+usr_schema		varchar DEFAULT NULL	-- If not NULL, the extents cached in usr_schema.extents are reused, if still valid
 )
 RETURNS TABLE(
 	is_geom_null boolean,
@@ -1833,7 +1890,11 @@ RETURNS TABLE(
 AS $$
 DECLARE
 cdb_extents box2d := NULL;
+new_extents box2d := NULL;
 geog_coords_prec integer := 6;
+cached_envelope geometry := NULL;
+cached_max_id bigint := NULL;
+is_cache_valid boolean := FALSE;
 
 BEGIN
 IF is_geographic IS NULL THEN
@@ -1847,7 +1908,25 @@ x_max := NULL;
 y_max := NULL;
 srid := NULL;
 
-EXECUTE format('SELECT ST_Extent(envelope) FROM %I.cityobject AS co', cdb_schema) INTO cdb_extents;
+IF usr_schema IS NOT NULL THEN
+	EXECUTE format('
+		SELECT e.envelope, e.cdb_max_id, e.cdb_signature = qgis_pkg.get_cdb_schema_signature(%L)
+		FROM %I.extents AS e
+		WHERE e.cdb_schema = %L AND e.bbox_type = ''db_schema''',
+		cdb_schema, usr_schema, cdb_schema)
+	INTO cached_envelope, cached_max_id, is_cache_valid;
+END IF;
+
+IF is_cache_valid IS TRUE AND cached_envelope IS NOT NULL AND cached_max_id IS NOT NULL THEN
+	-- The cached extents are still valid: add the extents of the objects inserted since then (uses the primary key index)
+	cdb_extents := Box2D(cached_envelope);
+	EXECUTE format('SELECT ST_Extent(envelope) FROM %I.cityobject AS co WHERE co.id > %s', cdb_schema, cached_max_id) INTO new_extents;
+	IF new_extents IS NOT NULL THEN
+		cdb_extents := (SELECT ST_Extent(t.geom) FROM (VALUES (cdb_extents::geometry), (new_extents::geometry)) AS t(geom));
+	END IF;
+ELSE
+	EXECUTE format('SELECT ST_Extent(envelope) FROM %I.cityobject AS co', cdb_schema) INTO cdb_extents;
+END IF;
 
 IF cdb_extents IS NULL THEN
 	is_geom_null := TRUE;
@@ -1886,13 +1965,14 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.compute_cdb_schema_extents(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
-COMMENT ON FUNCTION    qgis_pkg.compute_cdb_schema_extents(varchar, boolean) IS 'Computes extents of the selected cdb_schema';
-REVOKE ALL ON FUNCTION qgis_pkg.compute_cdb_schema_extents(varchar, boolean) FROM PUBLIC;
+$$ LANGUAGE plpgsql STABLE;
+COMMENT ON FUNCTION    qgis_pkg.compute_cdb_schema_extents(varchar, boolean, varchar) IS 'Computes extents of the selected cdb_schema';
+REVOKE ALL ON FUNCTION qgis_pkg.compute_cdb_schema_extents(varchar, boolean, varchar) FROM PUBLIC;
 
 -- Example:
 -- will default to projected coordinate systems and round to next integer.
 --SELECT qgis_pkg.compute_cdb_schema_extents('citydb');
+--SELECT qgis_pkg.compute_cdb_schema_extents('citydb', FALSE, 'qgis_user_rw');
 
 
 ----------------------------------------------------------------
@@ -1912,6 +1992,8 @@ DECLARE
 	ext_label	varchar;
 	srid integer;
 	creation_timestamp timestamptz(3);
+	cdb_signature varchar := NULL;
+	cdb_max_id bigint := NULL;
 	upserted_id	integer := NULL;
 	bbox_obj RECORD;
 	
@@ -1928,7 +2010,10 @@ CASE
 	WHEN cdb_bbox_type = 'db_schema' THEN
 
 		ext_label := concat(cdb_schema, '-bbox_extents');
-		bbox_obj  := (SELECT qgis_pkg.compute_cdb_schema_extents(cdb_schema, is_geographic));
+		-- Take the signature before computing the extents: later changes will be detected next time
+		cdb_signature := qgis_pkg.get_cdb_schema_signature(cdb_schema);
+		EXECUTE format('SELECT max(id) FROM %I.cityobject', cdb_schema) INTO cdb_max_id;
+		bbox_obj  := (SELECT qgis_pkg.compute_cdb_schema_extents(cdb_schema, is_geographic, usr_schema));
 	
 		IF bbox_obj.is_geom_null IS FALSE THEN
 			creation_timestamp := clock_timestamp();
@@ -1961,17 +2046,17 @@ END CASE;
 
 EXECUTE format('
 	INSERT INTO %I.extents AS e 
-		(cdb_schema, bbox_type, label, envelope, creation_date)
-	VALUES (%L, %L, %L, %L, %L)
+		(cdb_schema, bbox_type, label, envelope, creation_date, cdb_signature, cdb_max_id)
+	VALUES (%L, %L, %L, %L, %L, %L, %L)
 	ON CONFLICT ON CONSTRAINT extents_cdb_schema_bbox_type_key DO
 		UPDATE SET
-			envelope = %L, label = %L, creation_date = %L
+			envelope = %L, label = %L, creation_date = %L, cdb_signature = %L, cdb_max_id = %L
 		WHERE 
 			e.cdb_schema = %L AND e.bbox_type = %L
 	RETURNING id',
 	usr_schema,
-	cdb_schema, cdb_bbox_type, ext_label, cdb_envelope, creation_timestamp,
-	cdb_envelope, ext_label, creation_timestamp,
+	cdb_schema, cdb_bbox_type, ext_label, cdb_envelope, creation_timestamp, cdb_signature, cdb_max_id,
+	cdb_envelope, ext_label, creation_timestamp, cdb_signature, cdb_max_id,
 	cdb_schema, cdb_bbox_type)
 INTO STRICT upserted_id;
 
@@ -2046,7 +2131,7 @@ EXCEPTION
 	WHEN OTHERS THEN
 		RAISE EXCEPTION 'qgis_pkg.generate_mview_bbox_poly(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql STABLE;
 COMMENT ON FUNCTION qgis_pkg.generate_mview_bbox_poly(varchar, numeric[], boolean) IS 'Create polygon of mview bbox';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.generate_mview_bbox_poly(varchar, numeric[], boolean) FROM public;
 
@@ -2152,7 +2237,7 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.feature_type_checker(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql STABLE;
 COMMENT ON FUNCTION qgis_pkg.feature_type_checker(varchar, varchar, varchar) IS 'Checks whether features types (CityGML modules) exist in the selected cdb_schema';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.feature_type_checker(varchar, varchar, varchar) FROM public;
 
@@ -2190,7 +2275,7 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.feature_type_counter(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql STABLE;
 COMMENT ON FUNCTION qgis_pkg.feature_type_counter(varchar, varchar, varchar) IS 'Counts features types (CityGML modules) in the selected cdb_schema';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.feature_type_counter(varchar, varchar, varchar) FROM public;
 
@@ -2297,11 +2382,15 @@ REVOKE EXECUTE ON FUNCTION qgis_pkg.root_class_checker(varchar, varchar, varchar
 ----------------------------------------------------------------
 -- Create FUNCTION QGIS_PKG.ROOT_CLASS_COUNTER
 ----------------------------------------------------------------
-DROP FUNCTION IF EXISTS    qgis_pkg.root_class_counter(varchar, varchar, varchar) CASCADE;
+-- Counts root-class objects in a single GROUP BY pass over table cityobject.
+-- If is_approximate is TRUE and the table is large, counts are estimated from a sample of the table,
+-- while classes not found in the sample are counted exactly (they are rare, so this is cheap).
+DROP FUNCTION IF EXISTS    qgis_pkg.root_class_counter(varchar, varchar, varchar, boolean) CASCADE;
 CREATE OR REPLACE FUNCTION qgis_pkg.root_class_counter(
-cdb_schema	varchar,
-ade_prefix	varchar DEFAULT NULL,   -- NULL = CityGML, <> NULL = CityGML AND selected ADE
-extents		varchar DEFAULT NULL	-- PostGIS polygon without SRID, e.g. passed as: ST_AsEWKT(ST_MakeEnvelope(229234, 476749, 230334, 479932))
+cdb_schema		varchar,
+ade_prefix		varchar DEFAULT NULL,   -- NULL = CityGML, <> NULL = CityGML AND selected ADE
+extents			varchar DEFAULT NULL,	-- PostGIS polygon without SRID, e.g. passed as: ST_AsEWKT(ST_MakeEnvelope(229234, 476749, 230334, 479932))
+is_approximate	boolean DEFAULT FALSE	-- TRUE = estimate the counts from a sample of table cityobject
 )
 RETURNS TABLE (
 	feature_type 	varchar,
@@ -2312,14 +2401,17 @@ RETURNS TABLE (
 AS $$
 DECLARE
 cdb_schemas_array 	varchar[] := (SELECT array_agg(s.cdb_schema) FROM qgis_pkg.list_cdb_schemas() AS s); 
+sample_rows			CONSTANT integer := 100000; -- Approx. number of rows to sample in approximate mode
 a_pref				varchar := ade_prefix;
+qi_cdb_schema		varchar := quote_ident(cdb_schema);
 srid				integer;
-n_co				bigint;
-oc_id				integer;
+n_rows_est			real;
+sample_pct			numeric := 100;
 query_geom			geometry(Polygon);
 sql_where 			varchar;
+sql_sample			varchar;
+sql_n_feature		varchar;
 sql_statement 		varchar;
-r 					RECORD;
 
 BEGIN
 -- Check if the cdb_schema exists
@@ -2345,28 +2437,44 @@ ELSE
 	sql_where  := concat(' AND ST_MakeEnvelope(',ST_XMin(query_geom),',',ST_YMin(query_geom),',',ST_XMax(query_geom),',',ST_YMax(query_geom),',',srid,') && co.envelope');
 END IF;
 
-FOR r IN 
-	SELECT t.feature_type, t.toplevel_feature 
-	FROM qgis_pkg.feature_type_to_toplevel_feature AS t
-	WHERE 
-		t.ade_prefix IS NULL OR t.ade_prefix IS NOT DISTINCT FROM a_pref
-		AND t.is_supported IS TRUE
-LOOP
-	feature_type := r.feature_type;
-	root_class := r.toplevel_feature;
-	EXECUTE format('SELECT id FROM %I.objectclass WHERE classname = %L LIMIT 1', cdb_schema, r.toplevel_feature) INTO oc_id;
-	objectclass_id := oc_id;
+IF is_approximate IS TRUE THEN
+	-- Use the planner statistics to decide whether sampling is worth it
+	SELECT c.reltuples INTO n_rows_est
+	FROM pg_class AS c INNER JOIN pg_namespace AS n ON (n.oid = c.relnamespace)
+	WHERE n.nspname::varchar = cdb_schema AND c.relname = 'cityobject';
 
-	sql_statement := concat('SELECT count(id) AS n_co FROM ', quote_ident(cdb_schema),'.cityobject AS co WHERE co.objectclass_id = ', oc_id, sql_where, ';');
-	EXECUTE sql_statement INTO n_co;
-	--RAISE NOTICE '%, % (oc_id=%): %', feature_type, root_class, oc_id, n_co;
+	IF n_rows_est > sample_rows THEN
+		sample_pct := round((100 * sample_rows / n_rows_est)::numeric, 4);
+	END IF;
+END IF;
 
-	n_feature := n_co;
-	
-	RETURN NEXT;
-END LOOP;
+IF sample_pct < 100 THEN
+	sql_sample    := concat(' TABLESAMPLE SYSTEM (',sample_pct,')');
+	sql_n_feature := concat('coalesce(c.n_co, (SELECT count(co.id) FROM ',qi_cdb_schema,'.cityobject AS co WHERE co.objectclass_id = t.oc_id',sql_where,'))');
+ELSE
+	sql_sample    := NULL;
+	sql_n_feature := 'coalesce(c.n_co, 0)';
+END IF;
 
-RETURN;
+sql_statement := concat('
+WITH t AS (
+	SELECT ft.id, ft.feature_type, ft.toplevel_feature,
+		(SELECT o.id FROM ',qi_cdb_schema,'.objectclass AS o WHERE o.classname = ft.toplevel_feature LIMIT 1) AS oc_id
+	FROM qgis_pkg.feature_type_to_toplevel_feature AS ft
+	WHERE 
+		ft.ade_prefix IS NULL OR ft.ade_prefix IS NOT DISTINCT FROM ',quote_nullable(a_pref),'
+		AND ft.is_supported IS TRUE
+), c AS (
+	SELECT co.objectclass_id, round(count(co.id) * 100 / ',sample_pct,')::bigint AS n_co
+	FROM ',qi_cdb_schema,'.cityobject AS co',sql_sample,'
+	WHERE co.objectclass_id IN (SELECT t.oc_id FROM t)',sql_where,'
+	GROUP BY co.objectclass_id
+)
+SELECT t.feature_type::varchar, t.toplevel_feature::varchar, t.oc_id::integer, ',sql_n_feature,'::bigint
+FROM t LEFT JOIN c ON (c.objectclass_id = t.oc_id)
+ORDER BY t.id;');
+
+RETURN QUERY EXECUTE sql_statement;
 
 EXCEPTION
 	WHEN QUERY_CANCELED THEN
@@ -2374,13 +2482,139 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.root_class_counter(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
-COMMENT ON FUNCTION qgis_pkg.root_class_counter(varchar, varchar, varchar) IS 'Counts root-class objects in the selected cdb_schema';
-REVOKE EXECUTE ON FUNCTION qgis_pkg.root_class_counter(varchar, varchar, varchar) FROM public;
+$$ LANGUAGE plpgsql STABLE;
+COMMENT ON FUNCTION qgis_pkg.root_class_counter(varchar, varchar, varchar, boolean) IS 'Counts (or estimates) root-class objects in the selected cdb_schema';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.root_class_counter(varchar, varchar, varchar, boolean) FROM public;
 
 -- Example: 
 --SELECT * FROM qgis_pkg.root_class_counter('alderaan', NULL);
---SELECT * FROM qgis_pkg.root_class_counter('rh', ST_AsEWKT(ST_MakeEnvelope(229234, 476749, 230334, 479932)));
+--SELECT * FROM qgis_pkg.root_class_counter('rh', NULL, ST_AsEWKT(ST_MakeEnvelope(229234, 476749, 230334, 479932)));
+--SELECT * FROM qgis_pkg.root_class_counter('rh', NULL, NULL, TRUE);
+
+
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.GEOMETRY_COLUMN_COUNTER
+----------------------------------------------------------------
+-- Statistics pre-pass used by the generate_sql_layers_* functions.
+-- For each of the input tables, it counts in a single scan the non-null geometry columns (lod* columns and columns of
+-- type geometry), grouped by objectclass_id, for the objects whose envelope intersects the mview_bbox (if any).
+-- Tables without objectclass_id (e.g. address) are counted over the whole table, with key 'all' instead of the objectclass_id.
+-- The result is a json object like {"building": {"26": {"lod2_solid_id": 12, ...}, ...}, ...}
+DROP FUNCTION IF EXISTS    qgis_pkg.geometry_column_counter(varchar, varchar[], geometry) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.geometry_column_counter(
+cdb_schema		varchar,
+tables			varchar[],
+mview_bbox		geometry DEFAULT NULL
+)
+RETURNS jsonb
+AS $$
+DECLARE
+cdb_schemas_array 	CONSTANT varchar[] := (SELECT array_agg(s.cdb_schema) FROM qgis_pkg.list_cdb_schemas() AS s); 
+qi_cdb_schema		CONSTANT varchar := quote_ident(cdb_schema);
+srid				integer;
+tab					varchar;
+cols				varchar[];
+has_class			boolean;
+sql_where 			varchar;
+sql_cols			varchar;
+sql_statement		varchar;
+tab_stats			jsonb;
+col_stats			jsonb := '{}'::jsonb;
+
+BEGIN
+-- Check if the cdb_schema exists
+IF (cdb_schema IS NULL) OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
+	RAISE EXCEPTION 'cdb_schema is invalid. It must correspond to an existing citydb schema';
+END IF;
+
+-- Get the srid from the cdb_schema
+EXECUTE format('SELECT srid FROM %I.database_srs LIMIT 1', cdb_schema) INTO srid;
+
+-- Check that the srid is the same if the mview_box
+IF ST_SRID(mview_bbox) IS NULL OR ST_SRID(mview_bbox) <> srid THEN
+	sql_where := NULL;
+ELSE
+	sql_where := concat(' AND ST_MakeEnvelope(',ST_XMin(mview_bbox),',',ST_YMin(mview_bbox),',',ST_XMax(mview_bbox),',',ST_YMax(mview_bbox),',',srid,') && co.envelope');
+END IF;
+
+FOREACH tab IN ARRAY tables LOOP
+	SELECT 
+		array_agg(c.column_name::varchar ORDER BY c.ordinal_position) FILTER (WHERE c.column_name ~ '^lod([0-4]|$)' OR c.udt_name = 'geometry'),
+		bool_or(c.column_name = 'objectclass_id')
+	INTO cols, has_class
+	FROM information_schema.columns AS c
+	WHERE c.table_schema::varchar = cdb_schema AND c.table_name::varchar = tab;
+
+	CONTINUE WHEN cols IS NULL;
+
+	SELECT string_agg(concat(quote_literal(col),', count(*) FILTER (WHERE o.',quote_ident(col),' IS NOT NULL)'), ', ')
+	INTO sql_cols
+	FROM unnest(cols) AS col;
+
+	IF has_class IS TRUE THEN
+		sql_statement := concat('
+		SELECT coalesce(jsonb_object_agg(t.objectclass_id, t.stats), ''{}''::jsonb) FROM (
+			SELECT o.objectclass_id, jsonb_build_object(',sql_cols,') AS stats
+			FROM ',qi_cdb_schema,'.',quote_ident(tab),' AS o
+				INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o.id',sql_where,')
+			GROUP BY o.objectclass_id
+		) AS t');
+	ELSE
+		sql_statement := concat('
+		SELECT jsonb_build_object(''all'', jsonb_build_object(',sql_cols,'))
+		FROM ',qi_cdb_schema,'.',quote_ident(tab),' AS o');
+	END IF;
+
+	EXECUTE sql_statement INTO tab_stats;
+	col_stats := col_stats || jsonb_build_object(tab, tab_stats);
+END LOOP;
+
+RETURN col_stats;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.geometry_column_counter(): Error QUERY_CANCELED';
+  WHEN OTHERS THEN 
+		RAISE EXCEPTION 'qgis_pkg.geometry_column_counter(): %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql STABLE;
+COMMENT ON FUNCTION qgis_pkg.geometry_column_counter(varchar, varchar[], geometry) IS 'Counts the non-null geometry columns of the selected tables, per objectclass_id';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.geometry_column_counter(varchar, varchar[], geometry) FROM public;
+
+-- Example: 
+--SELECT qgis_pkg.geometry_column_counter('citydb', ARRAY['building','thematic_surface','address']);
+--SELECT qgis_pkg.geometry_column_counter('rh', ARRAY['building'], ST_MakeEnvelope(229234, 476749, 230334, 479932, 28992));
+
+
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.GEOMETRY_COLUMN_CHECKER
+----------------------------------------------------------------
+-- Checks, using the output of qgis_pkg.geometry_column_counter(), whether any of the input columns of the table
+-- is not null (for the given objectclass_id, or for any class if NULL, or if the table has no objectclass_id).
+-- It is conservative: if the table or a column is not in the statistics, it returns TRUE (i.e. the exact count must be carried out).
+DROP FUNCTION IF EXISTS    qgis_pkg.geometry_column_checker(jsonb, varchar, varchar[], integer) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.geometry_column_checker(
+col_stats		jsonb,
+tab				varchar,
+cols			varchar[],
+class_id		integer DEFAULT NULL
+)
+RETURNS boolean
+AS $$
+SELECT CASE
+	WHEN col_stats -> tab IS NULL THEN TRUE
+	ELSE coalesce((
+		SELECT bool_or(t.stats -> col IS NULL OR (t.stats ->> col)::bigint > 0)
+		FROM jsonb_each(col_stats -> tab) AS t(objectclass_id, stats), unnest(cols) AS col
+		WHERE class_id IS NULL OR t.objectclass_id IN (class_id::text, 'all')
+		), FALSE)
+	END;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+COMMENT ON FUNCTION qgis_pkg.geometry_column_checker(jsonb, varchar, varchar[], integer) IS 'Checks whether the geometry columns of a table contain features, according to the statistics';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.geometry_column_checker(jsonb, varchar, varchar[], integer) FROM public;
+
+-- Example: 
+--SELECT qgis_pkg.geometry_column_checker(qgis_pkg.geometry_column_counter('citydb', ARRAY['building']), 'building', ARRAY['lod2_solid_id','lod2_multi_surface_id'], 26);
 
 
 ----------------------------------------------------------------
@@ -2435,7 +2669,7 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.has_layers_for_cdb_schema(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql STABLE;
 COMMENT ON FUNCTION qgis_pkg.has_layers_for_cdb_schema(varchar,varchar,varchar) IS 'Searches for cdb_schema name into the view names of the usr_schema to determine if it supports the input cdb_schema and the selected ADE.';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.has_layers_for_cdb_schema(varchar,varchar,varchar) FROM public;
 
@@ -2443,7 +2677,9 @@ REVOKE EXECUTE ON FUNCTION qgis_pkg.has_layers_for_cdb_schema(varchar,varchar,va
 ----------------------------------------------------------------
 -- Create FUNCTION CLASS_NAME_TO_CLASS_ID
 ----------------------------------------------------------------
--- Returns the class_id from table OBJECTCLASS of the given class
+-- Returns the class_id from table OBJECTCLASS of the given class.
+-- The result is cached for the rest of the session (as a custom setting), so that
+-- table OBJECTCLASS is looked up only once per cdb_schema and class.
 DROP FUNCTION IF EXISTS    qgis_pkg.class_name_to_class_id(varchar, varchar, varchar);
 CREATE OR REPLACE FUNCTION qgis_pkg.class_name_to_class_id(
 	cdb_schema	varchar,
@@ -2452,9 +2688,15 @@ CREATE OR REPLACE FUNCTION qgis_pkg.class_name_to_class_id(
 )
 RETURNS integer AS $$
 DECLARE
+	-- The oid of the schema is part of the key, in case the cdb_schema is dropped and recreated
+	cache_key	varchar := concat('qgis_pkg.class_id_', md5(concat_ws('@', cdb_schema, to_regnamespace(quote_ident(cdb_schema))::oid, class_name, ade_prefix)));
 	ade_id		integer := NULL;
-	class_id	varchar := NULL;
+	class_id	varchar := NULLIF(current_setting(cache_key, TRUE), '');
 BEGIN
+IF class_id IS NOT NULL THEN
+	RETURN class_id;
+END IF;
+
 IF ade_prefix IS NOT NULL THEN
 	EXECUTE format('SELECT a.id FROM %I.ade AS a WHERE a.db_prefix=%L', cdb_schema, ade_prefix) INTO ade_id;
 	IF ade_id IS NULL THEN
@@ -2473,6 +2715,7 @@ END IF;
 IF class_id IS NULL THEN
 	RAISE EXCEPTION 'There is no class found with name "%" in schema "%"!', class_name,  cdb_schema;
 ELSE
+	PERFORM set_config(cache_key, class_id, FALSE);
 	RETURN class_id;
 END IF;
 
@@ -2483,7 +2726,7 @@ EXCEPTION
 		RAISE EXCEPTION 'qgis_pkg.class_name_to_class_id(%, %, %): %', cdb_schema, class_name, ade_prefix, SQLERRM;
 END;
 $$ LANGUAGE plpgsql;
-COMMENT ON FUNCTION qgis_pkg.class_name_to_class_id(varchar, varchar, varchar) IS 'Returns the class_id from table OBJECTCLASS of the given class';
+COMMENT ON FUNCTION qgis_pkg.class_name_to_class_id(varchar, varchar, varchar) IS 'Returns the class_id from table OBJECTCLASS of the given class (cached for the session)';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.class_name_to_class_id(varchar, varchar, varchar) FROM public;
 
 -- Example:
@@ -2491,16 +2734,141 @@ REVOKE EXECUTE ON FUNCTION qgis_pkg.class_name_to_class_id(varchar, varchar, var
 --SELECT qgis_pkg.class_name_to_class_id('citydb', 'ThermalZone', 'ng');
 
 
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.GET_CDB_SCHEMA_SRID
+----------------------------------------------------------------
+-- Returns the srid of the cdb_schema (from table DATABASE_SRS).
+-- As for qgis_pkg.class_name_to_class_id(...), the result is cached for the rest of the session,
+-- so that the insert/update functions of the tables do not read table DATABASE_SRS for each feature.
+-- The cache key includes the type modifier of column cityobject.envelope, which holds the srid:
+-- after an in-place change of the srid (citydb_pkg.change_schema_srid(...)), the old value is not used anymore.
+DROP FUNCTION IF EXISTS    qgis_pkg.get_cdb_schema_srid(varchar);
+CREATE OR REPLACE FUNCTION qgis_pkg.get_cdb_schema_srid(
+	cdb_schema	varchar
+)
+RETURNS integer AS $$
+DECLARE
+	cache_key	varchar := concat('qgis_pkg.srid_', md5(concat_ws('@', cdb_schema, to_regnamespace(quote_ident(cdb_schema))::oid,
+					(SELECT a.atttypmod FROM pg_attribute AS a WHERE a.attrelid = to_regclass(concat(quote_ident(cdb_schema), '.cityobject')) AND a.attname = 'envelope'))));
+	srid		integer := NULLIF(current_setting(cache_key, TRUE), '')::integer;
+BEGIN
+IF srid IS NULL THEN
+	EXECUTE format('SELECT t.srid FROM %I.database_srs AS t LIMIT 1', cdb_schema) INTO srid;
+	IF srid IS NOT NULL THEN
+		PERFORM set_config(cache_key, srid::text, FALSE);
+	END IF;
+END IF;
+
+RETURN srid;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.get_cdb_schema_srid(): Error QUERY_CANCELED';
+	WHEN OTHERS THEN 
+		RAISE EXCEPTION 'qgis_pkg.get_cdb_schema_srid(%): %', cdb_schema, SQLERRM;
+END;
+$$ LANGUAGE plpgsql;
+COMMENT ON FUNCTION qgis_pkg.get_cdb_schema_srid(varchar) IS 'Returns the srid of the cdb_schema (cached for the session)';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.get_cdb_schema_srid(varchar) FROM public;
+
+-- Example:
+--SELECT qgis_pkg.get_cdb_schema_srid('citydb');
+
+
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.LIST_GVIEWS
+----------------------------------------------------------------
+-- Lists the relations with geometries of a usr_schema: the gviews (_g_*) and the shared root geometries (_rg_*).
+-- They are tables, populated from their definition view (<name>_def). The mat views created by previous versions are listed as well.
+-- A table is always populated: it is empty until refreshed.
+DROP FUNCTION IF EXISTS    qgis_pkg.list_gviews(varchar) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.list_gviews(
+usr_schema	varchar
+)
+RETURNS TABLE (
+gv_name			varchar,
+is_matview		boolean,
+is_populated	boolean
+)
+AS $$
+BEGIN
+RETURN QUERY
+	SELECT c.relname::varchar, c.relkind = 'm', c.relispopulated
+	FROM pg_class AS c
+		INNER JOIN pg_namespace AS n ON (n.oid = c.relnamespace)
+	WHERE n.nspname::varchar = usr_schema AND c.relkind IN ('r', 'm')
+		AND (c.relname LIKE '\_g\_%' OR c.relname LIKE '\_rg\_%')
+	ORDER BY c.relname;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.list_gviews(): Error QUERY_CANCELED';
+  WHEN OTHERS THEN 
+		RAISE EXCEPTION 'qgis_pkg.list_gviews(): %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql STABLE;
+COMMENT ON FUNCTION qgis_pkg.list_gviews(varchar) IS 'List the gviews (and the shared root geometries) of a usr_schema';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.list_gviews(varchar) FROM public;
+
+-- Example:
+--SELECT * FROM qgis_pkg.list_gviews('qgis_giorgio');
+
+
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.LIST_GVIEW_ROOT_GEOMS
+----------------------------------------------------------------
+-- Lists the gviews of a usr_schema that select from shared root geometries (_rg_*), with the name of the latter.
+-- They are found through the dependencies of the definition views of the gviews (<gv_name>_def).
+DROP FUNCTION IF EXISTS    qgis_pkg.list_gview_root_geoms(varchar) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.list_gview_root_geoms(
+usr_schema	varchar
+)
+RETURNS TABLE (
+gv_name		varchar,
+rg_name		varchar
+)
+AS $$
+BEGIN
+RETURN QUERY
+	SELECT DISTINCT
+		-- Definition views of the gviews, or mat views created by previous versions
+		CASE WHEN v.relkind = 'v' THEN left(v.relname::varchar, -4) ELSE v.relname::varchar END,
+		rg.relname::varchar
+	FROM pg_depend AS d
+		INNER JOIN pg_rewrite AS rw ON (rw.oid = d.objid)
+		INNER JOIN pg_class AS v ON (v.oid = rw.ev_class)
+		INNER JOIN pg_class AS rg ON (rg.oid = d.refobjid AND rg.relnamespace = v.relnamespace AND rg.relkind IN ('r', 'm'))
+		INNER JOIN pg_namespace AS n ON (n.oid = v.relnamespace)
+	WHERE d.classid = 'pg_rewrite'::regclass AND d.refclassid = 'pg_class'::regclass
+		AND n.nspname::varchar = usr_schema
+		AND ((v.relkind = 'v' AND v.relname LIKE '\_g\_%\_def') OR (v.relkind = 'm' AND v.relname LIKE '\_g\_%'))
+		AND rg.relname LIKE '\_rg\_%'
+	ORDER BY 2, 1;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.list_gview_root_geoms(): Error QUERY_CANCELED';
+  WHEN OTHERS THEN 
+		RAISE EXCEPTION 'qgis_pkg.list_gview_root_geoms(): %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql STABLE;
+COMMENT ON FUNCTION qgis_pkg.list_gview_root_geoms(varchar) IS 'List the gviews of a usr_schema selecting from shared root geometries';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.list_gview_root_geoms(varchar) FROM public;
+
+-- Example:
+--SELECT * FROM qgis_pkg.list_gview_root_geoms('qgis_giorgio');
+
+
 ----------------------------------------------------------------
 -- Create FUNCTION QGIS_PKG.GVIEW_COUNTER
 ----------------------------------------------------------------
--- Counts records in the selected materialized view with geometries (gview)
+-- Counts records in the selected gview
 -- This function can be run providing only the name of the gview, OR, alternatively, also the extents.
 DROP FUNCTION IF EXISTS    qgis_pkg.gview_counter(varchar, varchar, varchar, varchar) CASCADE;
 CREATE OR REPLACE FUNCTION qgis_pkg.gview_counter(
 usr_schema	varchar,
 cdb_schema	varchar,
-gview_name	varchar, 				-- Materialised view name containing geometries (i.e. prefixed with _g_)
+gview_name	varchar, 				-- Name of the gview (i.e. prefixed with _g_)
 extents		varchar DEFAULT NULL	-- PostGIS polygon without SRID, e.g. passed as: ST_AsEWKT(ST_MakeEnvelope(229234, 476749, 230334, 479932))
 )
 RETURNS integer
@@ -2512,7 +2880,7 @@ query_geom	geometry(Polygon);
 query_bbox	box2d;
 
 BEGIN
-IF EXISTS(SELECT mv.matviewname FROM pg_matviews AS mv WHERE mv.schemaname::varchar = usr_schema AND mv.ispopulated IS TRUE) THEN
+IF EXISTS(SELECT 1 FROM qgis_pkg.list_gviews(usr_schema) AS g WHERE g.gv_name = gview_name AND g.is_populated IS TRUE) THEN
 	IF extents IS NULL THEN
 		EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, gview_name) INTO counter;
 	ELSE
@@ -2531,8 +2899,8 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.gview_counter(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
-COMMENT ON FUNCTION qgis_pkg.gview_counter(varchar, varchar, varchar, varchar) IS 'Counts records in the selected materialized view for geometries';
+$$ LANGUAGE plpgsql STABLE;
+COMMENT ON FUNCTION qgis_pkg.gview_counter(varchar, varchar, varchar, varchar) IS 'Counts records in the selected gview';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.gview_counter(varchar, varchar, varchar, varchar) FROM public;
 
 -- Example: 
@@ -2540,6 +2908,439 @@ REVOKE EXECUTE ON FUNCTION qgis_pkg.gview_counter(varchar, varchar, varchar, var
 --SELECT qgis_pkg.gview_counter('qgis_giorgio','citydb2','citydb_bdg_lod0_footprint', ST_AsEWKT(ST_MakeEnvelope(229234, 476749, 230334, 479932)));
 
 
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.GVIEW_COUNTER_BULK
+----------------------------------------------------------------
+-- Counts records in the selected gviews in a single call.
+-- Only populated gviews are counted, the others are skipped.
+-- This function can be run providing only the names of the gviews, OR, alternatively, also the extents.
+DROP FUNCTION IF EXISTS    qgis_pkg.gview_counter_bulk(varchar, varchar, varchar[], varchar) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.gview_counter_bulk(
+usr_schema		varchar,
+cdb_schema		varchar,
+gview_names		varchar[], 				-- Array of gview names (i.e. prefixed with _g_)
+extents			varchar DEFAULT NULL	-- PostGIS polygon without SRID, e.g. passed as: ST_AsEWKT(ST_MakeEnvelope(229234, 476749, 230334, 479932))
+)
+RETURNS TABLE (
+gv_name		varchar,
+n_selected	bigint
+)
+AS $$
+DECLARE
+usr_schemas_array CONSTANT varchar[] := (SELECT array_agg(s.usr_schema) FROM qgis_pkg.list_usr_schemas() AS s);
+cdb_schemas_array CONSTANT varchar[] := (SELECT array_agg(d.cdb_schema) FROM qgis_pkg.list_cdb_schemas() AS d);
+srid			integer;
+query_geom		geometry(Polygon);
+query_bbox		box2d := NULL;
+sql_where		varchar := NULL;
+sql_statement	text := NULL;
+r 				RECORD;
+
+BEGIN
+-- Check that the usr_schema exists
+IF usr_schema IS NULL OR (NOT usr_schema = ANY(usr_schemas_array)) THEN
+	RAISE EXCEPTION 'usr_schema value is invalid. It must correspond to an existing usr_schema';
+END IF;
+-- Check that the cdb_schema exists
+IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
+	RAISE EXCEPTION 'cdb_schema value is invalid. It must correspond to an existing cdb_schema';
+END IF;
+
+IF extents IS NOT NULL THEN
+	EXECUTE format('SELECT srid FROM %I.database_srs LIMIT 1', cdb_schema) INTO srid;
+	query_geom := ST_GeomFromText(extents, srid);
+	query_bbox := ST_Extent(query_geom);
+	sql_where  := ' WHERE $1 && t.geom';
+END IF;
+
+FOR r IN 
+	SELECT g.gv_name AS mv_name
+	FROM qgis_pkg.list_gviews(usr_schema) AS g
+	WHERE g.gv_name = ANY(gview_names) AND g.is_populated IS TRUE
+	ORDER BY g.gv_name
+LOOP
+	sql_statement := concat(sql_statement, CASE WHEN sql_statement IS NULL THEN NULL ELSE ' UNION ALL ' END,
+		format('SELECT %L::varchar, count(t.co_id) FROM %I.%I AS t', r.mv_name, usr_schema, r.mv_name), sql_where);
+END LOOP;
+
+IF sql_statement IS NOT NULL THEN
+	RETURN QUERY EXECUTE sql_statement USING query_bbox;
+END IF;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.gview_counter_bulk(): Error QUERY_CANCELED';
+  WHEN OTHERS THEN 
+		RAISE EXCEPTION 'qgis_pkg.gview_counter_bulk(): %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql STABLE;
+COMMENT ON FUNCTION qgis_pkg.gview_counter_bulk(varchar, varchar, varchar[], varchar) IS 'Counts records in the selected gviews, optionally within the extents';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.gview_counter_bulk(varchar, varchar, varchar[], varchar) FROM public;
+
+-- Example: 
+--SELECT * FROM qgis_pkg.gview_counter_bulk('qgis_giorgio','citydb2',ARRAY['_g_citydb2_bdg_lod0_footprint','_g_citydb2_bdg_lod1_solid'], NULL);
+--SELECT * FROM qgis_pkg.gview_counter_bulk('qgis_giorgio','citydb2',ARRAY['_g_citydb2_bdg_lod0_footprint','_g_citydb2_bdg_lod1_solid'], ST_AsEWKT(ST_MakeEnvelope(229234, 476749, 230334, 479932)));
+
+
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.GVIEW_DELTA
+----------------------------------------------------------------
+-- Returns, for each gview of a cdb_schema, the features (co_id) whose rows must be replaced since its last refresh:
+-- the features inserted or modified (according to cityobject.last_modification_date, or creation_date), also when only
+-- their child features (parts, thematic surfaces, openings, installations, etc.) were, walking up the hierarchy links,
+-- and the features still in the gview, but no more in the cdb_schema (deleted).
+-- The same is returned for the shared root geometries (_rg_*) of the cdb_schema, by owner of the roots, since the latest
+-- refresh of the gviews selecting from them (the root geometries are always refreshed before these gviews).
+-- Counters and co_ids are NULL if they cannot be determined (e.g. gview never refreshed, mat view created by a previous
+-- version, or features that are not cityobjects, like addresses).
+-- If the extents are passed, only the changes within them are counted: features whose (new or old) geometry intersects
+-- the extents, so that the refresh after a local change can be limited to the gviews affected by it.
+-- The co_ids are never limited to the extents, so that the delta of a gview can be applied in full.
+-- Note: the changes that do not update table cityobject (e.g. the deletion of a child feature alone) cannot be detected.
+DROP FUNCTION IF EXISTS    qgis_pkg.gview_delta(varchar, varchar, varchar) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.gview_delta(
+usr_schema	varchar,
+cdb_schema	varchar,
+extents		varchar DEFAULT NULL	-- PostGIS polygon without SRID, e.g. passed as: ST_AsEWKT(ST_MakeEnvelope(229234, 476749, 230334, 479932))
+)
+RETURNS TABLE (
+gv_name		varchar,
+n_features	integer,
+n_modified	bigint,
+n_deleted	bigint,
+co_ids		bigint[]
+)
+AS $$
+DECLARE
+usr_schemas_array CONSTANT varchar[] := (SELECT array_agg(s.usr_schema) FROM qgis_pkg.list_usr_schemas() AS s);
+cdb_schemas_array CONSTANT varchar[] := (SELECT array_agg(d.cdb_schema) FROM qgis_pkg.list_cdb_schemas() AS d);
+-- Links from the child features to their parent feature (table, child id column, parent id column)
+links CONSTANT varchar[] := ARRAY[
+	['building'                , 'id'                       , 'building_parent_id'],
+	['room'                    , 'id'                       , 'building_id'],
+	['building_installation'   , 'id'                       , 'building_id'],
+	['building_installation'   , 'id'                       , 'room_id'],
+	['building_furniture'      , 'id'                       , 'room_id'],
+	['thematic_surface'        , 'id'                       , 'building_id'],
+	['thematic_surface'        , 'id'                       , 'room_id'],
+	['thematic_surface'        , 'id'                       , 'building_installation_id'],
+	['opening_to_them_surface' , 'opening_id'               , 'thematic_surface_id'],
+	['bridge'                  , 'id'                       , 'bridge_parent_id'],
+	['bridge_room'             , 'id'                       , 'bridge_id'],
+	['bridge_installation'     , 'id'                       , 'bridge_id'],
+	['bridge_installation'     , 'id'                       , 'bridge_room_id'],
+	['bridge_constr_element'   , 'id'                       , 'bridge_id'],
+	['bridge_furniture'        , 'id'                       , 'bridge_room_id'],
+	['bridge_thematic_surface' , 'id'                       , 'bridge_id'],
+	['bridge_thematic_surface' , 'id'                       , 'bridge_room_id'],
+	['bridge_thematic_surface' , 'id'                       , 'bridge_installation_id'],
+	['bridge_thematic_surface' , 'id'                       , 'bridge_constr_element_id'],
+	['bridge_open_to_them_srf' , 'bridge_opening_id'        , 'bridge_thematic_surface_id'],
+	['tunnel'                  , 'id'                       , 'tunnel_parent_id'],
+	['tunnel_hollow_space'     , 'id'                       , 'tunnel_id'],
+	['tunnel_installation'     , 'id'                       , 'tunnel_id'],
+	['tunnel_installation'     , 'id'                       , 'tunnel_hollow_space_id'],
+	['tunnel_furniture'        , 'id'                       , 'tunnel_hollow_space_id'],
+	['tunnel_thematic_surface' , 'id'                       , 'tunnel_id'],
+	['tunnel_thematic_surface' , 'id'                       , 'tunnel_hollow_space_id'],
+	['tunnel_thematic_surface' , 'id'                       , 'tunnel_installation_id'],
+	['tunnel_open_to_them_srf' , 'tunnel_opening_id'        , 'tunnel_thematic_surface_id'],
+	['traffic_area'            , 'id'                       , 'transportation_complex_id'],
+	['auxiliary_traffic_area'  , 'id'                       , 'transportation_complex_id'],
+	['waterbod_to_waterbnd_srf', 'waterboundary_surface_id' , 'waterbody_id'],
+	['relief_feat_to_rel_comp' , 'relief_component_id'      , 'relief_feature_id']];
+class_id	integer;
+srid		integer;
+query_bbox	box2d := NULL;
+since		timestamptz := NULL;
+sql_links	text := NULL;
+ch_ids		bigint[];		-- Changed features and all their parent features
+ch_ts		timestamptz[];	-- Time of the latest change of each of them, or of their child features
+own_ids		bigint[];		-- Changed features alone
+own_ts		timestamptz[];
+mod_ids		bigint[];
+del_ids		bigint[];
+i			integer;
+r 			RECORD;
+
+BEGIN
+-- Check that the usr_schema exists
+IF usr_schema IS NULL OR (NOT usr_schema = ANY(usr_schemas_array)) THEN
+	RAISE EXCEPTION 'usr_schema value is invalid. It must correspond to an existing usr_schema';
+END IF;
+-- Check that the cdb_schema exists
+IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
+	RAISE EXCEPTION 'cdb_schema value is invalid. It must correspond to an existing cdb_schema';
+END IF;
+
+IF extents IS NOT NULL THEN
+	EXECUTE format('SELECT srid FROM %I.database_srs LIMIT 1', cdb_schema) INTO srid;
+	query_bbox := ST_Extent(ST_GeomFromText(extents, srid));
+END IF;
+
+-- The changes are collected once, since the earliest refresh of the gviews of the cdb_schema
+EXECUTE format('SELECT min(lm.refresh_date) FROM %I.layer_metadata AS lm WHERE lm.cdb_schema = %L AND lm.ade_prefix IS NULL',
+	usr_schema, cdb_schema) INTO since;
+
+IF since IS NOT NULL THEN
+	FOR i IN array_lower(links, 1)..array_upper(links, 1) LOOP
+		sql_links := concat_ws(' UNION ALL ', sql_links, format('SELECT %I, %I FROM %I.%I', links[i][2], links[i][3], cdb_schema, links[i][1]));
+	END LOOP;
+	-- Walk up from the changed features to all their parent features, which changed as well
+	EXECUTE format('
+		WITH RECURSIVE a(id, ts, is_own) AS (
+			SELECT co.id, greatest(co.creation_date, co.last_modification_date), TRUE
+			FROM %I.cityobject AS co
+			WHERE co.creation_date > $1 OR co.last_modification_date > $1
+		UNION
+			SELECT l.parent_id, a.ts, FALSE
+			FROM
+				(%s) AS l(child_id, parent_id)
+				INNER JOIN a ON (a.id = l.child_id)
+			WHERE l.parent_id IS NOT NULL
+		)
+		SELECT array_agg(s.id), array_agg(s.ts), array_agg(s.id) FILTER (WHERE s.is_own), array_agg(s.ts) FILTER (WHERE s.is_own)
+		FROM (SELECT a.id, max(a.ts) AS ts, bool_or(a.is_own) AS is_own FROM a GROUP BY a.id) AS s',
+		cdb_schema, sql_links) INTO ch_ids, ch_ts, own_ids, own_ts USING since;
+END IF;
+
+FOR r IN EXECUTE format('
+	SELECT lm.gv_name, lm.class, lm.n_features, lm.refresh_date, g.is_matview
+	FROM %I.layer_metadata AS lm
+		INNER JOIN qgis_pkg.list_gviews(%L) AS g ON (g.gv_name = lm.gv_name)
+	WHERE lm.cdb_schema = %L AND lm.ade_prefix IS NULL
+	ORDER BY lm.gv_name', usr_schema, usr_schema, cdb_schema)
+LOOP
+	gv_name    := r.gv_name;
+	n_features := r.n_features;
+	n_modified := NULL;
+	n_deleted  := NULL;
+	co_ids     := NULL;
+	class_id   := NULL;
+
+	IF r.refresh_date IS NOT NULL AND r.class <> 'Address' AND r.is_matview IS FALSE THEN
+		EXECUTE format('SELECT o.id FROM %I.objectclass AS o WHERE o.classname = %L AND o.ade_id IS NULL', cdb_schema, r.class) INTO class_id;
+	END IF;
+
+	IF class_id IS NOT NULL THEN
+		-- Features of the class of the gview changed since its last refresh, themselves or their child features
+		EXECUTE format('SELECT array_agg(co.id) FROM unnest($1, $2) AS a(id, ts) INNER JOIN %I.cityobject AS co ON (co.id = a.id AND co.objectclass_id = %L) WHERE a.ts > $3',
+			cdb_schema, class_id) INTO mod_ids USING ch_ids, ch_ts, r.refresh_date;
+		-- Features still in the gview, but no more in the cdb_schema
+		EXECUTE format('SELECT array_agg(g.co_id) FROM %I.%I AS g WHERE NOT EXISTS (SELECT 1 FROM %I.cityobject AS co WHERE co.id = g.co_id)',
+			usr_schema, r.gv_name, cdb_schema) INTO del_ids;
+		co_ids := coalesce(mod_ids, '{}'::bigint[]) || coalesce(del_ids, '{}'::bigint[]);
+
+		IF query_bbox IS NULL THEN
+			n_modified := coalesce(cardinality(mod_ids), 0);
+			n_deleted  := coalesce(cardinality(del_ids), 0);
+		ELSE
+			-- Modified features are checked both in their new position and in their old one (still in the gview)
+			EXECUTE format('SELECT count(co.id) FROM %I.cityobject AS co WHERE co.id = ANY($2) AND ($1 && co.envelope OR EXISTS (SELECT 1 FROM %I.%I AS g WHERE g.co_id = co.id AND $1 && g.geom))',
+				cdb_schema, usr_schema, r.gv_name) INTO n_modified USING query_bbox, mod_ids;
+			EXECUTE format('SELECT count(g.co_id) FROM %I.%I AS g WHERE g.co_id = ANY($2) AND $1 && g.geom',
+				usr_schema, r.gv_name) INTO n_deleted USING query_bbox, del_ids;
+		END IF;
+	END IF;
+
+	RETURN NEXT;
+END LOOP;
+
+-- The shared root geometries of the cdb_schema, by owner of the roots (co_id)
+FOR r IN
+	SELECT g.gv_name, g.is_matview, array_agg(rg.gv_name) AS gv_names
+	FROM qgis_pkg.list_gviews(usr_schema) AS g
+		INNER JOIN qgis_pkg.list_gview_root_geoms(usr_schema) AS rg ON (rg.rg_name = g.gv_name)
+	WHERE left(g.gv_name, length(cdb_schema) + 5) = concat('_rg_', cdb_schema, '_')
+	GROUP BY g.gv_name, g.is_matview
+	ORDER BY g.gv_name
+LOOP
+	gv_name    := r.gv_name;
+	n_features := NULL;
+	n_modified := NULL;
+	n_deleted  := NULL;
+	co_ids     := NULL;
+	since      := NULL;
+
+	IF r.is_matview IS FALSE THEN
+		-- Unless one of them was never refreshed, the root geometries are at least as recent as the gviews selecting from them
+		EXECUTE format('SELECT CASE WHEN bool_and(lm.refresh_date IS NOT NULL) THEN max(lm.refresh_date) END FROM %I.layer_metadata AS lm WHERE lm.gv_name = ANY($1)',
+			usr_schema) INTO since USING r.gv_names;
+	END IF;
+
+	IF since IS NOT NULL THEN
+		SELECT array_agg(a.id) INTO mod_ids FROM unnest(own_ids, own_ts) AS a(id, ts) WHERE a.ts > since;
+		EXECUTE format('SELECT array_agg(DISTINCT g.co_id) FROM %I.%I AS g WHERE NOT EXISTS (SELECT 1 FROM %I.cityobject AS co WHERE co.id = g.co_id)',
+			usr_schema, r.gv_name, cdb_schema) INTO del_ids;
+		co_ids     := coalesce(mod_ids, '{}'::bigint[]) || coalesce(del_ids, '{}'::bigint[]);
+		n_modified := coalesce(cardinality(mod_ids), 0);
+		n_deleted  := coalesce(cardinality(del_ids), 0);
+	END IF;
+
+	RETURN NEXT;
+END LOOP;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.gview_delta(): Error QUERY_CANCELED';
+  WHEN OTHERS THEN 
+		RAISE EXCEPTION 'qgis_pkg.gview_delta(): %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql STABLE;
+COMMENT ON FUNCTION qgis_pkg.gview_delta(varchar, varchar, varchar) IS 'Lists the features changed in the cdb_schema since the last refresh of each gview, optionally counting only those within the extents';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.gview_delta(varchar, varchar, varchar) FROM public;
+
+-- Example: 
+--SELECT * FROM qgis_pkg.gview_delta('qgis_giorgio','citydb2');
+--SELECT * FROM qgis_pkg.gview_delta('qgis_giorgio','citydb2',ST_AsEWKT(ST_MakeEnvelope(229234, 476749, 230334, 479932)));
+
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.DROP_GVIEW
+----------------------------------------------------------------
+-- Drops a gview (table, or materialized view created by a previous version) and the view defining it, if any.
+DROP FUNCTION IF EXISTS    qgis_pkg.drop_gview(varchar, varchar) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.drop_gview(
+usr_schema	varchar,
+gv_name		varchar
+)
+RETURNS void
+AS $$
+DECLARE
+gv_relkind	char := NULL;
+
+BEGIN
+SELECT c.relkind INTO gv_relkind
+FROM pg_class AS c
+	INNER JOIN pg_namespace AS n ON (n.oid = c.relnamespace)
+WHERE n.nspname::varchar = usr_schema AND c.relname::varchar = gv_name AND c.relkind IN ('r', 'm');
+
+IF gv_relkind = 'r' THEN
+	EXECUTE format('DROP TABLE %I.%I CASCADE', usr_schema, gv_name);
+ELSIF gv_relkind = 'm' THEN
+	EXECUTE format('DROP MATERIALIZED VIEW %I.%I CASCADE', usr_schema, gv_name);
+END IF;
+EXECUTE format('DROP VIEW IF EXISTS %I.%I CASCADE', usr_schema, concat(gv_name, '_def'));
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.drop_gview(): Error QUERY_CANCELED';
+	WHEN OTHERS THEN
+		RAISE EXCEPTION 'qgis_pkg.drop_gview(%, %): %', usr_schema, gv_name, SQLERRM;
+END;
+$$ LANGUAGE plpgsql;
+COMMENT ON FUNCTION qgis_pkg.drop_gview(varchar, varchar) IS 'Drops a gview and the view defining it';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.drop_gview(varchar, varchar) FROM public;
+
+-- Example: 
+--SELECT qgis_pkg.drop_gview('qgis_giorgio', '_g_citydb_bdg_lod2');
+
+
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.REFRESH_GVIEW
+----------------------------------------------------------------
+-- Refreshes in full a gview: a table populated from the view defining it (<gv_name>_def), or a materialized view
+-- created by a previous version.
+-- If try_concurrently is TRUE, the gview is refreshed without locking out the users reading it (e.g. rendering the layer):
+-- the rows of a table are deleted instead of truncated, while a materialized view is refreshed concurrently only if it is
+-- already populated and has a unique index (on co_id). Otherwise it is refreshed normally.
+DROP FUNCTION IF EXISTS    qgis_pkg.refresh_gview(varchar, varchar, boolean) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.refresh_gview(
+usr_schema		varchar,
+gv_name			varchar,
+try_concurrently	boolean DEFAULT FALSE	-- not "concurrently", which is an SQL keyword and cannot be used as a variable
+)
+RETURNS boolean
+AS $$
+DECLARE
+gv_regclass		CONSTANT regclass := format('%I.%I', usr_schema, gv_name)::regclass;
+is_concurrent	boolean := FALSE;
+
+BEGIN
+IF EXISTS(SELECT 1 FROM pg_class AS c WHERE c.oid = gv_regclass AND c.relkind = 'r') THEN
+	is_concurrent := coalesce(try_concurrently, FALSE);
+	IF is_concurrent IS TRUE THEN
+		EXECUTE format('DELETE FROM %I.%I', usr_schema, gv_name);
+	ELSE
+		EXECUTE format('TRUNCATE %I.%I', usr_schema, gv_name);
+	END IF;
+	EXECUTE format('INSERT INTO %I.%I SELECT * FROM %I.%I', usr_schema, gv_name, usr_schema, concat(gv_name, '_def'));
+	RETURN is_concurrent;
+END IF;
+
+IF try_concurrently IS TRUE THEN
+	is_concurrent := EXISTS(SELECT 1 FROM pg_matviews AS mv WHERE mv.schemaname::varchar = usr_schema AND mv.matviewname::varchar = gv_name AND mv.ispopulated IS TRUE)
+		AND EXISTS(SELECT 1 FROM pg_index AS i WHERE i.indrelid = gv_regclass AND i.indisunique IS TRUE AND i.indpred IS NULL AND i.indexprs IS NULL);
+END IF;
+
+IF is_concurrent IS TRUE THEN
+	EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY %I.%I', usr_schema, gv_name);
+ELSE
+	EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, gv_name);
+END IF;
+
+RETURN is_concurrent;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.refresh_gview(): Error QUERY_CANCELED';
+	WHEN OTHERS THEN
+		RAISE EXCEPTION 'qgis_pkg.refresh_gview(%, %): %', usr_schema, gv_name, SQLERRM;
+END;
+$$ LANGUAGE plpgsql;
+COMMENT ON FUNCTION qgis_pkg.refresh_gview(varchar, varchar, boolean) IS 'Refreshes a gview in full, concurrently if possible and requested. Returns whether it was refreshed concurrently';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.refresh_gview(varchar, varchar, boolean) FROM public;
+
+-- Example: 
+--SELECT qgis_pkg.refresh_gview('qgis_giorgio', '_g_citydb_bdg_lod2', TRUE);
+
+
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.REFRESH_GVIEW_DELTA
+----------------------------------------------------------------
+-- Refreshes only the rows of the given features (co_id) of a gview, as returned by qgis_pkg.gview_delta():
+-- their rows are deleted and inserted again from the view defining the gview (<gv_name>_def), if the features still exist.
+-- The users reading the gview are not locked out. Returns the number of rows inserted.
+DROP FUNCTION IF EXISTS    qgis_pkg.refresh_gview_delta(varchar, varchar, bigint[]) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.refresh_gview_delta(
+usr_schema	varchar,
+gv_name		varchar,
+co_ids		bigint[]
+)
+RETURNS integer
+AS $$
+DECLARE
+gv_regclass	CONSTANT regclass := format('%I.%I', usr_schema, gv_name)::regclass;
+n_rows		integer := 0;
+
+BEGIN
+IF NOT EXISTS(SELECT 1 FROM pg_class AS c WHERE c.oid = gv_regclass AND c.relkind = 'r') THEN
+	RAISE EXCEPTION 'gview % is not a table: it must be refreshed in full', gv_name;
+END IF;
+
+IF cardinality(co_ids) > 0 THEN
+	EXECUTE format('DELETE FROM %I.%I AS g WHERE g.co_id = ANY($1)', usr_schema, gv_name) USING co_ids;
+	-- The condition on co_id is pushed down into the view, also through its GROUP BY
+	EXECUTE format('INSERT INTO %I.%I SELECT d.* FROM %I.%I AS d WHERE d.co_id = ANY($1)',
+		usr_schema, gv_name, usr_schema, concat(gv_name, '_def')) USING co_ids;
+	GET DIAGNOSTICS n_rows = ROW_COUNT;
+END IF;
+
+RETURN n_rows;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.refresh_gview_delta(): Error QUERY_CANCELED';
+	WHEN OTHERS THEN
+		RAISE EXCEPTION 'qgis_pkg.refresh_gview_delta(%, %): %', usr_schema, gv_name, SQLERRM;
+END;
+$$ LANGUAGE plpgsql;
+COMMENT ON FUNCTION qgis_pkg.refresh_gview_delta(varchar, varchar, bigint[]) IS 'Refreshes the rows of the given features of a gview. Returns the number of rows inserted';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.refresh_gview_delta(varchar, varchar, bigint[]) FROM public;
+
+-- Example: 
+--SELECT qgis_pkg.refresh_gview_delta('qgis_giorgio', '_g_citydb_bdg_lod2', ARRAY[1,2,3]::bigint[]);
+
+
 ----------------------------------------------------------------
 -- Create FUNCTION QGIS_PKG.UPSERT_SETTINGS
 ----------------------------------------------------------------
@@ -2649,7 +3450,7 @@ EXCEPTION
 	WHEN OTHERS THEN
 		RAISE EXCEPTION 'util_pkg.compute_schemas_disk_size(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql IMMUTABLE;
+$$ LANGUAGE plpgsql STABLE;
 COMMENT ON FUNCTION qgis_pkg.compute_schemas_disk_size() IS 'Returns the size occupied on disk by schemas of the current database';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.compute_schemas_disk_size() FROM public;
 
@@ -2659,90 +3460,33 @@ REVOKE EXECUTE ON FUNCTION qgis_pkg.compute_schemas_disk_size() FROM public;
 ----------------------------------------------------------------
 -- Create FUNCTION QGIS_PKG.ST_3DAREA_POLY
 ----------------------------------------------------------------
+-- Computes the 3D area of a polygon with Newell's method, in a single pass over its points
 DROP FUNCTION IF EXISTS    qgis_pkg.st_3darea_poly(geometry);
 CREATE OR REPLACE FUNCTION qgis_pkg.st_3darea_poly(
 polygon3d geometry			-- must be a 3D polygon
 )
 RETURNS numeric AS $$
-DECLARE
-ring geometry;
-n_points integer;
-i integer; j integer;
-p1 geometry; p2 geometry;
-x1 numeric; y1 numeric; z1 numeric;
-x2 numeric; y2 numeric; z2 numeric;
-n_interior_rings integer;
-nx_t numeric := 0;
-ny_t numeric := 0;
-nz_t numeric := 0;
-nl_t numeric := 0;
-area numeric := 0;
-
-BEGIN
-
---polygon3d := ST_Force3D(polygon3d);
-ring := ST_RemoveRepeatedPoints(ST_ExteriorRing(polygon3d));
-ring := ST_ExteriorRing(polygon3d);
-n_points := ST_NPoints(ring);
-p1 := ST_PointN(ring,1);
-x1 := ST_X(p1);
-y1 := ST_Y(p1);
-z1 := ST_Z(p1);
-
-FOR i IN 2..n_points LOOP
-	p2 := ST_PointN(ring,i);
-	x2 := ST_X(p2);
-	y2 := ST_Y(p2);
-	z2 := ST_Z(p2);
-	nx_t := nx_t + (y1-y2)*(z1+z2); 
-	ny_t := ny_t + (z1-z2)*(x1+x2);
-	nz_t := nz_t + (x1-x2)*(y1+y2);
-	x1 := x2;
-	y1 := y2;
-	z1 := z2;
-END LOOP;
-
-n_interior_rings := ST_NumInteriorRings(polygon3d);
-IF n_interior_rings > 0 THEN
-	FOR j IN 1..n_interior_rings LOOP
-		ring := ST_RemoveRepeatedPoints(ST_Reverse(ST_InteriorRingN(polygon3d,j)));	
-		n_points := ST_NPoints(ring);
-		p1 := ST_PointN(ring,1);
-		x1 := ST_X(p1);
-		y1 := ST_Y(p1);
-		z1 := ST_Z(p1);
-		FOR i IN 2..n_points LOOP
-			p2 := ST_PointN(ring,i);
-			x2 := ST_X(p2);
-			y2 := ST_Y(p2);
-			z2 := ST_Z(p2);
-			nx_t := nx_t - (y1-y2)*(z1+z2); 
-			ny_t := ny_t - (z1-z2)*(x1+x2);
-			nz_t := nz_t - (x1-x2)*(y1+y2);
-			x1 := x2;
-			y1 := y2;
-			z1 := z2;
-		END LOOP; --loop ring points		
-	END LOOP; -- loop ring
-END IF;
-
-area := sqrt(nx_t^2+ny_t^2+nz_t^2)/2;
-
-RETURN area;
-
-EXCEPTION
-	WHEN QUERY_CANCELED THEN
-		RAISE EXCEPTION 'util_pkg.st_3darea_poly(): Error QUERY_CANCELED';
-	WHEN OTHERS THEN
-		RAISE EXCEPTION 'util_pkg.st_3darea_poly(): %', SQLERRM;
-END;
-$$ LANGUAGE plpgsql IMMUTABLE;
+-- The interior rings are oriented opposite to the exterior one, so their contribution
+-- to the normal vector is subtracted simply by summing the edges of all rings
+SELECT
+	sqrt(sum(n.nx)^2 + sum(n.ny)^2 + sum(n.nz)^2)::numeric / 2
+FROM (
+	SELECT
+		(lag(ST_Y(d.geom)) OVER w - ST_Y(d.geom)) * (lag(ST_Z(d.geom)) OVER w + ST_Z(d.geom)) AS nx,
+		(lag(ST_Z(d.geom)) OVER w - ST_Z(d.geom)) * (lag(ST_X(d.geom)) OVER w + ST_X(d.geom)) AS ny,
+		(lag(ST_X(d.geom)) OVER w - ST_X(d.geom)) * (lag(ST_Y(d.geom)) OVER w + ST_Y(d.geom)) AS nz
+	FROM ST_DumpPoints(polygon3d) AS d
+	WINDOW w AS (PARTITION BY d.path[1] ORDER BY d.path[2])
+) AS n;
+$$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
 COMMENT ON FUNCTION qgis_pkg.st_3darea_poly(geometry) IS 'Returns the 3D area of a 3D polygon';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.st_3darea_poly(geometry) FROM public;
 
 ----------------------------------------------------------------
 -- Create FUNCTION QGIS_PKG.ST_SNAP_POLY_TO_GRID
 ----------------------------------------------------------------
+-- Snaps the polygon to the grid with a single ST_SnapToGrid, then rebuilds all its rings
+-- (rounding the coordinates) and computes its 3D area in the same pass over the points
 DROP FUNCTION IF EXISTS    qgis_pkg.st_snap_poly_to_grid(geometry, integer, integer, numeric) CASCADE;
 CREATE OR REPLACE FUNCTION qgis_pkg.st_snap_poly_to_grid(
 polygon 			geometry,
@@ -2753,16 +3497,7 @@ area_min			numeric DEFAULT 0.0001 		-- minimum acceptable area of a polygon
 RETURNS geometry AS $$
 DECLARE
 dec_prec 		numeric;
-srid_id 		integer;
-snapped_poly 	geometry(PolygonZ);
-num_geoms		integer;
-is_empty_geom 	boolean;
-ring 			geometry(LinestringZ);
-o_ring 			geometry(LinestringZ);
-i_ring			geometry(LinestringZ);
-i_rings 		geometry(LinestringZ)[];
-n_int_rings		integer;
-i integer; r RECORD;
+snapped_poly 	geometry;
 area_poly 		numeric;
 new_polygon 	geometry(PolygonZ);
 
@@ -2773,74 +3508,62 @@ CASE
 		RETURN polygon;
 	WHEN perform_snapping = 1 THEN
 		dec_prec := 10^(-digits);
-		srid_id := ST_SRID(polygon);
 		snapped_poly := ST_SnapToGrid(polygon, ST_GeomFromText('Point(0 0 0)'), dec_prec, dec_prec, dec_prec, 0);
-		is_empty_geom := ST_IsEmpty(snapped_poly);
 
-		IF is_empty_geom IS TRUE THEN
+		-- Nothing left after the snap to grid process (or not a polygon). ST_SnapToGrid drops the collapsed rings,
+		-- so all remaining rings have at least 4 points and can be rebuilt below.
+		IF snapped_poly IS NULL OR ST_IsEmpty(snapped_poly) OR ST_GeometryType(snapped_poly) <> 'ST_Polygon' THEN
 			RETURN NULL;
-		ELSE -- there is a geometry from the resulting snap to grid process
-			num_geoms := ST_NumGeometries(snapped_poly);
-			IF num_geoms > 1 THEN
-				RAISE NOTICE 'Number of geometries resulting from the snapped polygon is %', num_geoms;
-			END IF;
-
-			ring := ST_ExteriorRing(snapped_poly);
-			o_ring := ring;
-			FOR r IN SELECT
-				foo.path[1]-1 AS zero_based_index,
-				round(ST_x(foo.geom)::numeric,digits)::double precision AS px,
-				round(ST_y(foo.geom)::numeric,digits)::double precision AS py,
-				round(ST_z(foo.geom)::numeric,digits)::double precision AS pz
-			FROM ST_DumpPoints(ring) AS foo
-			LOOP
-				o_ring := ST_SetPoint(o_ring, r.zero_based_index, ST_MakePoint(r.px, r.py, r.pz));
-			END LOOP;
-			o_ring := ST_SetSRID(o_ring, srid_id);
-
-			n_int_rings	:= ST_NumInteriorRings(snapped_poly);
-			IF n_int_rings > 0 THEN
-				FOR i IN 1..n_int_rings LOOP
-					ring := ST_InteriorRingN(snapped_poly, i);
-					i_ring := ring;
-					FOR r IN SELECT
-						foo.path[1]-1 AS zero_based_index,
-						round(ST_x(foo.geom)::numeric,digits)::double precision AS px,
-						round(ST_y(foo.geom)::numeric,digits)::double precision AS py,
-						round(ST_z(foo.geom)::numeric,digits)::double precision AS pz
-					FROM ST_DumpPoints(ring) AS foo
-					LOOP
-						i_ring := ST_SetPoint(i_ring, r.zero_based_index, ST_MakePoint(r.px, r.py, r.pz));
-					END LOOP;			
-					i_rings := array_append(i_rings, i_ring);
-				END LOOP;
-			END IF;
 		END IF;
+
+		WITH p AS (
+			SELECT
+				d.path[1] AS ring_idx,
+				d.path[2] AS point_idx,
+				round(ST_X(d.geom)::numeric, digits) AS x,
+				round(ST_Y(d.geom)::numeric, digits) AS y,
+				round(ST_Z(d.geom)::numeric, digits) AS z
+			FROM ST_DumpPoints(snapped_poly) AS d
+		), e AS (
+			SELECT
+				p.ring_idx, p.point_idx, p.x, p.y, p.z,
+				(lag(p.y) OVER w - p.y) * (lag(p.z) OVER w + p.z) AS nx,
+				(lag(p.z) OVER w - p.z) * (lag(p.x) OVER w + p.x) AS ny,
+				(lag(p.x) OVER w - p.x) * (lag(p.y) OVER w + p.y) AS nz
+			FROM p
+			WINDOW w AS (PARTITION BY p.ring_idx ORDER BY p.point_idx)
+		), r AS (
+			SELECT
+				e.ring_idx,
+				ST_MakeLine(ST_MakePoint(e.x::double precision, e.y::double precision, e.z::double precision) ORDER BY e.point_idx) AS ring,
+				sum(e.nx) AS nx, sum(e.ny) AS ny, sum(e.nz) AS nz
+			FROM e
+			GROUP BY e.ring_idx
+		)
+		SELECT
+			CASE WHEN count(*) = 1
+				THEN ST_MakePolygon(min(r.ring))
+				ELSE ST_MakePolygon((array_agg(r.ring ORDER BY r.ring_idx))[1], (array_agg(r.ring ORDER BY r.ring_idx))[2:])
+			END,
+			sqrt(sum(r.nx)^2 + sum(r.ny)^2 + sum(r.nz)^2) / 2
+		INTO new_polygon, area_poly
+		FROM r;
+
+		new_polygon := ST_SetSRID(new_polygon, ST_SRID(polygon));
 ELSE
 	RAISE EXCEPTION 'Value of "perform_snapping" input parameter is invalid. It must be either 0 or 1'; 
 END CASE;
 
-IF n_int_rings = 0 THEN
-	new_polygon := ST_MakePolygon(o_ring);
-ELSE
-	new_polygon := ST_MakePolygon(o_ring, i_rings);
-END IF;
-
-area_poly := qgis_pkg.ST_3DArea_poly(new_polygon);
-
 IF (area_poly IS NULL) OR (area_poly <= area_min) THEN
 	RETURN NULL;
 ELSE
 	RETURN new_polygon;
 END IF;
 
-EXCEPTION
-	WHEN QUERY_CANCELED THEN
-		RAISE EXCEPTION 'qgis_pkg.st_snap_poly_to_grid(): Error QUERY_CANCELED';
-	WHEN OTHERS THEN
-		RAISE EXCEPTION 'qgis_pkg.st_snap_poly_to_grid(): %', SQLERRM;
+-- No EXCEPTION block: it would start a subtransaction for each call, which is not allowed
+-- in the parallel plans of the gviews (PostgreSQL 16 and earlier). Invalid input is ruled out by the checks above.
 END;
-$$ LANGUAGE plpgsql IMMUTABLE;
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
 COMMENT ON FUNCTION qgis_pkg.st_snap_poly_to_grid(geometry, integer, integer, numeric) IS 'Snaps 3D polygon to grid and drops it if it is smaller than the minimum area threshold';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.st_snap_poly_to_grid(geometry, integer, integer, numeric) FROM public;
 
@@ -2852,6 +3575,8 @@ REVOKE EXECUTE ON FUNCTION qgis_pkg.st_snap_poly_to_grid(geometry, integer, inte
 ----------------------------------------------------------------
 -- Create FUNCTION QGIS_PKG.GENERATE_SQL_MATVIEW_HEADER
 ----------------------------------------------------------------
+-- The gview is a table, populated (in full or by feature) from the view defining it (<gv_name>_def),
+-- so that only the features changed since the last refresh can be replaced (see qgis_pkg.refresh_gview_delta()).
 DROP FUNCTION IF EXISTS    qgis_pkg.generate_sql_matview_header(varchar,varchar) CASCADE;
 CREATE OR REPLACE FUNCTION qgis_pkg.generate_sql_matview_header(
 qi_usr_schema	varchar,
@@ -2860,16 +3585,19 @@ qi_gv_name	varchar
 RETURNS text
 AS $$
 DECLARE
+usr_schema CONSTANT varchar := trim(both '"' from qi_usr_schema);
+gv_name CONSTANT varchar := trim(both '"' from qi_gv_name);
+qi_gv_def_name CONSTANT varchar := quote_ident(concat(gv_name,'_def'));
 sql_statement text;
 
 BEGIN
 
 sql_statement := concat('
 -----------------------------------------------------------------
--- MATERIALIZED VIEW ',upper(qi_usr_schema),'.',upper(qi_gv_name),'
+-- TABLE ',upper(qi_usr_schema),'.',upper(qi_gv_name),' -- populated from VIEW ',upper(qi_usr_schema),'.',upper(qi_gv_def_name),'
 -----------------------------------------------------------------
-DROP MATERIALIZED VIEW IF EXISTS ',qi_usr_schema,'.',qi_gv_name,' CASCADE;
-CREATE MATERIALIZED VIEW         ',qi_usr_schema,'.',qi_gv_name,' AS');
+SELECT qgis_pkg.drop_gview(',quote_literal(usr_schema),', ',quote_literal(gv_name),');
+CREATE VIEW ',qi_usr_schema,'.',qi_gv_def_name,' AS');
 
 RETURN sql_statement;
 
@@ -2879,34 +3607,41 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.generate_sql_matview_header(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql IMMUTABLE;
 REVOKE EXECUTE ON FUNCTION qgis_pkg.generate_sql_matview_header(varchar,varchar) FROM public;
 
 ----------------------------------------------------------------
 -- Create FUNCTION QGIS_PKG.GENERATE_SQL_MATVIEW_FOOTER
 ----------------------------------------------------------------
-DROP FUNCTION IF EXISTS    qgis_pkg.generate_sql_matview_footer(varchar,varchar,varchar,varchar) CASCADE;
+-- Creates the (empty) table of the gview from the view defining it, with its indices.
+-- Set is_unique to FALSE if a feature may have several rows (e.g. addresses).
+DROP FUNCTION IF EXISTS    qgis_pkg.generate_sql_matview_footer(varchar,varchar,varchar,varchar,boolean) CASCADE;
 CREATE OR REPLACE FUNCTION qgis_pkg.generate_sql_matview_footer(
 qi_usr_name   varchar,
 qi_usr_schema varchar,
 ql_l_name	  varchar,
-qi_gv_name	  varchar
+qi_gv_name	  varchar,
+is_unique	  boolean DEFAULT TRUE
 )
 RETURNS text
 AS $$
 DECLARE
+usr_schema CONSTANT varchar := trim(both '"' from qi_usr_schema);
 gv_name CONSTANT varchar := trim(both '"' from qi_gv_name);
+qi_gv_def_name CONSTANT varchar := quote_ident(concat(gv_name,'_def'));
 gv_idx_name CONSTANT varchar := quote_ident(concat(gv_name,'_id_idx'));
 gv_spx_name CONSTANT varchar := quote_ident(concat(gv_name,'_geom_spx'));
 sql_statement text;
 
 BEGIN
 sql_statement := concat('
-CREATE INDEX ',gv_idx_name,' ON ',qi_usr_schema,'.',qi_gv_name,' (co_id);
+ALTER TABLE ',qi_usr_schema,'.',qi_gv_def_name,' OWNER TO ',qi_usr_name,';
+CREATE TABLE ',qi_usr_schema,'.',qi_gv_name,' AS SELECT * FROM ',qi_usr_schema,'.',qi_gv_def_name,' WITH NO DATA;
+CREATE ',CASE WHEN is_unique IS TRUE THEN 'UNIQUE ' END,'INDEX ',gv_idx_name,' ON ',qi_usr_schema,'.',qi_gv_name,' (co_id); -- The rows of the changed features are replaced by co_id
 CREATE INDEX ',gv_spx_name,' ON ',qi_usr_schema,'.',qi_gv_name,' USING gist (geom);
 ALTER TABLE ',qi_usr_schema,'.',qi_gv_name,' OWNER TO ',qi_usr_name,';
 --DELETE FROM ',qi_usr_schema,'.layer_metadata AS lm WHERE lm.layer_name = ',ql_l_name,';
---REFRESH MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,';
+--SELECT qgis_pkg.refresh_gview(',quote_literal(usr_schema),', ',quote_literal(gv_name),');
 ');
 
 RETURN sql_statement;
@@ -2917,8 +3652,8 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.generate_sql_matview_footer(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
-REVOKE EXECUTE ON FUNCTION qgis_pkg.generate_sql_matview_footer(varchar,varchar,varchar,varchar) FROM public;
+$$ LANGUAGE plpgsql IMMUTABLE;
+REVOKE EXECUTE ON FUNCTION qgis_pkg.generate_sql_matview_footer(varchar,varchar,varchar,varchar,boolean) FROM public;
 
 ----------------------------------------------------------------
 -- Create FUNCTION QGIS_PKG.GENERATE_SQL_VIEW_HEADER
@@ -2949,7 +3684,7 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.generate_sql_view_header(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql IMMUTABLE;
 REVOKE EXECUTE ON FUNCTION qgis_pkg.generate_sql_view_header(varchar,varchar) FROM public;
 
 ----------------------------------------------------------------
@@ -2966,12 +3701,14 @@ qi_gv_name    varchar
 RETURNS text
 AS $$
 DECLARE
+usr_schema CONSTANT varchar := trim(both '"' from qi_usr_schema);
+gv_name CONSTANT varchar := trim(both '"' from qi_gv_name);
 sql_statement text;
 
 BEGIN
 sql_statement := concat('
--- This drops the materialized view AND the associated view
-DROP MATERIALIZED VIEW IF EXISTS ',qi_usr_schema,'.',qi_gv_name,' CASCADE;
+-- This drops the gview AND the associated view
+SELECT qgis_pkg.drop_gview(',quote_literal(usr_schema),', ',quote_literal(gv_name),');
 DELETE FROM ',qi_usr_schema,'.layer_metadata AS lm WHERE lm.cdb_schema = ',ql_cdb_schema,' AND lm.layer_type = ',ql_l_type,' AND lm.layer_name = ', ql_l_name,';
 ');
 
@@ -2983,9 +3720,108 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.generate_sql_matview_else(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql IMMUTABLE;
 REVOKE EXECUTE ON FUNCTION qgis_pkg.generate_sql_matview_else(varchar,varchar,varchar,varchar,varchar) FROM public;
 
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.GENERATE_SQL_ROOT_GEOM_CACHE
+----------------------------------------------------------------
+-- Generates the SQL to create the table caching the (snapped and) collected geometries
+-- of each surface_geometry root owned by the objects of the given tables (e.g. of a module),
+-- populated (in full or by owner) from the view defining it (<rg_name>_def), like the gviews.
+-- The gviews of the module select from it, instead of collecting the same surface_geometry trees each.
+-- If a bbox is set, the gviews apply it to the feature itself or to its parent (or top-level) feature,
+-- while the owner of a root (e.g. a thematic surface) may lie outside of it or have no envelope.
+-- The cache hence keeps the roots owned by the objects of the given tables intersecting the bbox
+-- and by all their child objects, walking down the hierarchy links (child table, child id, parent id).
+DROP FUNCTION IF EXISTS    qgis_pkg.generate_sql_root_geom_cache(varchar, varchar, varchar, varchar, varchar[], varchar[], text, integer, integer, numeric, integer) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.generate_sql_root_geom_cache(
+qi_usr_name      varchar,
+qi_usr_schema    varchar,
+qi_cdb_schema    varchar,
+qi_rg_name       varchar,
+tables           varchar[],  -- Tables (as in table objectclass) of the objects owning the geometries
+links            varchar[],  -- Hierarchy links between them, as ARRAY[[child table, child id column, parent id column], ...]
+sql_where        text,       -- The bbox filter of the gviews, on cityobject "co" (NULL if no bbox)
+perform_snapping integer,
+digits           integer,
+area_poly_min    numeric,
+srid             integer
+)
+RETURNS text
+AS $$
+DECLARE
+usr_schema CONSTANT varchar := trim(both '"' from qi_usr_schema);
+rg_name CONSTANT varchar := trim(both '"' from qi_rg_name);
+qi_rg_def_name CONSTANT varchar := quote_ident(concat(rg_name,'_def'));
+rg_idx_name CONSTANT varchar := quote_ident(concat(rg_name,'_root_id_co_id_idx'));
+rg_co_idx_name CONSTANT varchar := quote_ident(concat(rg_name,'_co_id_idx'));
+sql_tables CONSTANT text := array_to_string(ARRAY(SELECT quote_literal(t) FROM unnest(tables) AS t), ',');
+sql_links text;
+sql_with text := NULL;
+sql_in text := NULL;
+i integer;
+sql_statement text;
+
+BEGIN
+IF sql_where IS NOT NULL THEN
+	-- The links are listed with a single query, to walk down the hierarchy of the objects in the bbox
+	FOR i IN array_lower(links, 1)..array_upper(links, 1) LOOP
+		sql_links := concat_ws(' UNION ALL ', sql_links, concat('SELECT ',quote_ident(links[i][2]),', ',quote_ident(links[i][3]),' FROM ',qi_cdb_schema,'.',quote_ident(links[i][1])));
+	END LOOP;
+	sql_with := concat('
+	WITH RECURSIVE h(id) AS (
+		SELECT co.id
+		FROM
+			',qi_cdb_schema,'.cityobject AS co
+			INNER JOIN ',qi_cdb_schema,'.objectclass AS oc ON (oc.id = co.objectclass_id AND oc.tablename IN (',sql_tables,'))
+		WHERE TRUE ',sql_where,'
+	UNION
+		SELECT l.child_id
+		FROM
+			(',sql_links,') AS l(child_id, parent_id)
+			INNER JOIN h ON (h.id = l.parent_id)
+	)');
+	sql_in := '
+		AND sg.cityobject_id IN (SELECT h.id FROM h)';
+END IF;
+
+sql_statement := concat('
+-----------------------------------------------------------------
+-- TABLE ',upper(qi_usr_schema),'.',upper(qi_rg_name),' -- collected geometries of each root, shared by the gviews
+-----------------------------------------------------------------
+SELECT qgis_pkg.drop_gview(',quote_literal(usr_schema),', ',quote_literal(rg_name),');
+CREATE VIEW ',qi_usr_schema,'.',qi_rg_def_name,' AS',sql_with,'
+	SELECT
+		sg.root_id::bigint AS root_id,
+		sg.cityobject_id::bigint AS co_id,
+		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+	FROM
+		',qi_cdb_schema,'.surface_geometry AS sg
+		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = sg.cityobject_id)
+		INNER JOIN ',qi_cdb_schema,'.objectclass AS oc ON (oc.id = co.objectclass_id AND oc.tablename IN (',sql_tables,'))
+	WHERE
+		sg.geometry IS NOT NULL',sql_in,'
+	GROUP BY sg.root_id, sg.cityobject_id;
+ALTER TABLE ',qi_usr_schema,'.',qi_rg_def_name,' OWNER TO ',qi_usr_name,';
+CREATE TABLE ',qi_usr_schema,'.',qi_rg_name,' AS SELECT * FROM ',qi_usr_schema,'.',qi_rg_def_name,' WITH NO DATA;
+COMMENT ON TABLE ',qi_usr_schema,'.',qi_rg_name,' IS ''Collected geometries of each root in schema ',qi_cdb_schema,''';
+CREATE UNIQUE INDEX ',rg_idx_name,' ON ',qi_usr_schema,'.',qi_rg_name,' (root_id, co_id);
+CREATE INDEX ',rg_co_idx_name,' ON ',qi_usr_schema,'.',qi_rg_name,' (co_id); -- The rows of the changed owners are replaced by co_id
+ALTER TABLE ',qi_usr_schema,'.',qi_rg_name,' OWNER TO ',qi_usr_name,';
+');
+
+RETURN sql_statement;
+
+EXCEPTION
+	WHEN QUERY_CANCELED THEN
+		RAISE EXCEPTION 'qgis_pkg.generate_sql_root_geom_cache(): Error QUERY_CANCELED';
+  WHEN OTHERS THEN 
+		RAISE EXCEPTION 'qgis_pkg.generate_sql_root_geom_cache(): %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+REVOKE EXECUTE ON FUNCTION qgis_pkg.generate_sql_root_geom_cache(varchar, varchar, varchar, varchar, varchar[], varchar[], text, integer, integer, numeric, integer) FROM public;
+
 ----------------------------------------------------------------
 -- Create FUNCTION QGIS_PKG.GENERATE_SQL_TRIGGERS
 ----------------------------------------------------------------
@@ -3041,7 +3877,7 @@ EXCEPTION
   WHEN OTHERS THEN 
 		RAISE EXCEPTION 'qgis_pkg.generate_sql_triggers(): %', SQLERRM;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql IMMUTABLE;
 REVOKE EXECUTE ON FUNCTION qgis_pkg.generate_sql_triggers(varchar, varchar, varchar) FROM public;
 
 /* --- TEMPLATE FOR ADDITIONAL FUNCTIONS
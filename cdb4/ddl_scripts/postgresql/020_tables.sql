@@ -59,6 +59,8 @@ bbox_type		varchar,
 label			varchar,
 creation_date	timestamptz(3),
 envelope		geometry(Polygon,',srid,'),
+cdb_signature	varchar,	-- Only for bbox_type db_schema: signature of table cityobject when the extents were computed
+cdb_max_id		bigint,		-- Only for bbox_type db_schema: max id of table cityobject when the extents were computed
 CONSTRAINT		extents_bbox_type_check CHECK (bbox_type IN (''db_schema'', ''m_view'', ''qgis'')),
 CONSTRAINT		extents_schema_bbox_key UNIQUE (cdb_schema, bbox_type)
 );
@@ -93,7 +95,8 @@ qml_symb		varchar, -- name of the qml file containing QGIS 2D symbology configur
 qml_3d			varchar,  -- name of the qml file containing QGIS 3D symbology configuration
 -- possibly other columns with other qml files
 enum_cols		varchar[][], -- array containing the class and column names that are linked to enumerations in the GUI form
-codelist_cols	varchar[][]  -- array containing class and column names that may be linked to codelists in the GUI form
+codelist_cols	varchar[][], -- array containing class and column names that may be linked to codelists in the GUI form
+gv_state		varchar      -- state of the background population of the gview: NULL (none), 'queued', 'populating', 'populated', 'failed'
 );
 COMMENT ON TABLE qgis_pkg.layer_metadata_template IS 'List of layers and their metadata';
 
@@ -108,6 +111,7 @@ CREATE INDEX lmeta_l_name_idx     ON qgis_pkg.layer_metadata_template (layer_nam
 CREATE INDEX lmeta_gv_name_idx    ON qgis_pkg.layer_metadata_template (gv_name);
 CREATE INDEX lmeta_nf_idx         ON qgis_pkg.layer_metadata_template (n_features);
 CREATE INDEX lmeta_rd_idx         ON qgis_pkg.layer_metadata_template (refresh_date);
+CREATE INDEX lmeta_gv_state_idx   ON qgis_pkg.layer_metadata_template (gv_state);
 
 
 ------------------------------------------------------------------
@@ -58,7 +58,7 @@ IF obj.gmlid IS NULL THEN
 	obj.gmlid := concat('Address_UUID_', uuid_generate_v4());
 END IF;
 IF obj.multi_point IS NOT NULL THEN
-	EXECUTE format('SELECT t.srid FROM %I.database_srs AS t LIMIT 1', cdb_schema) INTO srid;
+	srid := qgis_pkg.get_cdb_schema_srid(cdb_schema);
 	IF (ST_SRID(obj.multi_point) IS NULL) OR (ST_SRID(obj.multi_point) <> srid) THEN
 		RAISE EXCEPTION 'srid of (multi)point geometry % is not defined or wrong)', ST_AsEWKT(obj.multi_point);
 	END IF;
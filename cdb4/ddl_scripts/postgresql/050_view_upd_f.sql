@@ -857,6 +857,175 @@ $$ LANGUAGE plpgsql;
 COMMENT ON FUNCTION qgis_pkg.upd_waterboundary_surface_watersurface_atts(qgis_pkg.obj_cityobject, qgis_pkg.obj_waterboundary_surface, varchar) IS 'Update attributes of table WATERBOUNDARY_SURFACE (for class WaterSurface) (and parent ones)';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.upd_waterboundary_surface_watersurface_atts(qgis_pkg.obj_cityobject, qgis_pkg.obj_waterboundary_surface, varchar) FROM public;
 
+----------------------------------------------------------------
+-- Create FUNCTION QGIS_PKG.UPD_ATTS_BULK
+----------------------------------------------------------------
+-- Updates the attributes of many features of the same class at once, instead of one trigger call per feature.
+-- The changes are passed as a json array of objects, each one with the id of the feature and only the changed attributes,
+-- e.g. [{"id": 1, "name": "a"}, {"id": 2, "year_of_construction": 1990}].
+-- Only the attributes updated by qgis_pkg.upd_t_cityobject(...) and qgis_pkg.upd_t_<table of the class>(...) are accepted
+-- (other attributes raise an exception, and the caller must use the triggers instead), and the same checks are applied.
+-- Each table is updated with a single UPDATE ... FROM statement. Array values must be already joined with '--/\--'.
+DROP FUNCTION IF EXISTS    qgis_pkg.upd_atts_bulk(varchar, varchar, jsonb) CASCADE;
+CREATE OR REPLACE FUNCTION qgis_pkg.upd_atts_bulk(
+cdb_schema varchar,
+class_name varchar,
+changes    jsonb
+)
+RETURNS SETOF bigint AS $$
+DECLARE
+  rel_2_ter_enum varchar[] := ARRAY['entirelyAboveTerrain', 'entirelyBelowTerrain', 'substantiallyAboveAndBelowTerrain', 'substantiallyAboveTerrain','substantiallyBelowTerrain'];
+  rel_2_wat_enum varchar[] := ARRAY['entirelyAboveWaterSurface', 'entirelyBelowWaterSurface', 'substantiallyAboveAndBelowWaterSurface', 'substantiallyAboveWaterSurface', 'substantiallyBelowWaterSurface', 'temporarilyAboveAndBelowWaterSurface'];
+  table_name  varchar;
+  t_name      varchar;
+  att_names   varchar[];
+  col_names   varchar[];
+  upd_names   varchar[];
+  upd_ids     bigint[];
+  sql_set     text;
+  wrong_value varchar;
+  wrong_id    bigint;
+  chk         RECORD;
+BEGIN
+IF changes IS NULL OR jsonb_typeof(changes) <> 'array' OR jsonb_array_length(changes) = 0 THEN
+  RETURN;
+END IF;
+
+EXECUTE format('SELECT o.tablename FROM %I.objectclass AS o WHERE o.classname = %L AND o.ade_id IS NULL', cdb_schema, class_name) INTO table_name;
+IF table_name IS NULL THEN
+  RAISE EXCEPTION 'class_name value "%" is invalid', class_name;
+END IF;
+
+-- checks (same as in qgis_pkg.upd_t_cityobject(...))
+SELECT e.value->>'relative_to_terrain' INTO wrong_value FROM jsonb_array_elements(changes) AS e
+WHERE e.value->>'relative_to_terrain' IS NOT NULL AND NOT (e.value->>'relative_to_terrain' = ANY(rel_2_ter_enum)) LIMIT 1;
+IF wrong_value IS NOT NULL THEN
+  RAISE EXCEPTION 'relative_to_terrain value "%" must be either NULL or one of %', wrong_value, rel_2_ter_enum;
+END IF;
+SELECT e.value->>'relative_to_water' INTO wrong_value FROM jsonb_array_elements(changes) AS e
+WHERE e.value->>'relative_to_water' IS NOT NULL AND NOT (e.value->>'relative_to_water' = ANY(rel_2_wat_enum)) LIMIT 1;
+IF wrong_value IS NOT NULL THEN
+  RAISE EXCEPTION 'relative_to_water value "%" must be either NULL or one of %', wrong_value, rel_2_wat_enum;
+END IF;
+
+-- All changed attributes, in any of the features
+SELECT array_agg(DISTINCT k.key) INTO att_names FROM jsonb_array_elements(changes) AS e, jsonb_object_keys(e.value) AS k(key) WHERE k.key <> 'id';
+
+-- The attributes that can be updated: the same columns as in qgis_pkg.upd_t_cityobject(...) and qgis_pkg.upd_t_<table>(...)
+-- (no PK, FK and geometry columns). Keep in sync with those functions.
+SELECT array_agg(DISTINCT u.col::varchar) INTO upd_names
+FROM (VALUES
+  ('cityobject',               ARRAY['gmlid', 'gmlid_codespace', 'name', 'name_codespace', 'description', 'creation_date', 'termination_date', 'relative_to_terrain', 'relative_to_water', 'last_modification_date', 'updating_person', 'reason_for_update', 'lineage']),
+  ('bridge',                   ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace', 'year_of_construction', 'year_of_demolition', 'is_movable']),
+  ('bridge_constr_element',    ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('bridge_furniture',         ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('bridge_installation',      ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('bridge_room',              ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('building',                 ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace', 'year_of_construction', 'year_of_demolition', 'roof_type', 'roof_type_codespace', 'measured_height', 'measured_height_unit', 'storeys_above_ground', 'storeys_below_ground', 'storey_heights_above_ground', 'storey_heights_ag_unit', 'storey_heights_below_ground', 'storey_heights_bg_unit']),
+  ('building_furniture',       ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('building_installation',    ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('city_furniture',           ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('cityobjectgroup',          ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('generic_cityobject',       ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('land_use',                 ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('plant_cover',              ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace', 'height', 'height_unit']),
+  ('raster_relief',            ARRAY['raster_uri']),
+  ('relief_component',         ARRAY['lod']),
+  ('relief_feature',           ARRAY['lod']),
+  ('room',                     ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('solitary_vegetat_object',  ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace', 'species', 'species_codespace', 'height', 'height_unit', 'trunk_diameter', 'trunk_diameter_unit', 'crown_diameter', 'crown_diameter_unit']),
+  ('tin_relief',               ARRAY['max_length', 'max_length_unit']),
+  ('traffic_area',             ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace', 'surface_material', 'surface_material_codespace']),
+  ('transportation_complex',   ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('tunnel',                   ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace', 'year_of_construction', 'year_of_demolition']),
+  ('tunnel_furniture',         ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('tunnel_hollow_space',      ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('tunnel_installation',      ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('waterbody',                ARRAY['class', 'class_codespace', 'function', 'function_codespace', 'usage', 'usage_codespace']),
+  ('waterboundary_surface',    ARRAY['water_level', 'water_level_codespace'])
+) AS v(tab, cols), unnest(v.cols) AS u(col)
+WHERE v.tab IN ('cityobject', table_name);
+
+-- Other attributes cannot be updated here (the caller must use the triggers instead)
+SELECT k INTO wrong_value FROM unnest(att_names) AS k WHERE NOT (k = ANY(upd_names)) LIMIT 1;
+IF wrong_value IS NOT NULL THEN
+  RAISE EXCEPTION 'attribute "%" cannot be updated in bulk in table cityobject or in table %', wrong_value, table_name;
+END IF;
+
+FOREACH t_name IN ARRAY (CASE WHEN table_name = 'cityobject' THEN ARRAY['cityobject'] ELSE ARRAY['cityobject', table_name] END)::varchar[] LOOP
+  SELECT array_agg(c.column_name::varchar ORDER BY c.ordinal_position) INTO col_names
+  FROM information_schema.columns AS c
+  WHERE c.table_schema = cdb_schema AND c.table_name = t_name AND c.column_name::varchar = ANY(att_names) AND c.column_name <> 'id';
+
+  IF t_name = 'cityobject' THEN
+    -- As in qgis_pkg.upd_t_cityobject(...), the features are marked as modified (also if only the attributes of the class table changed).
+    SELECT string_agg(format('%I = CASE WHEN s.j ? %L THEN (s.r).%I ELSE t.%I END', c, c, c, c), ', ') INTO sql_set
+    FROM unnest(col_names) AS c
+    WHERE c NOT IN ('last_modification_date', 'updating_person');
+    sql_set := concat_ws(', ', sql_set,
+      'last_modification_date = coalesce(CASE WHEN s.j ? ''last_modification_date'' THEN (s.r).last_modification_date ELSE t.last_modification_date END, clock_timestamp())',
+      'updating_person = coalesce(CASE WHEN s.j ? ''updating_person'' THEN (s.r).updating_person ELSE t.updating_person END, current_user)');
+  ELSIF col_names IS NULL THEN
+    CONTINUE;
+  ELSE
+    SELECT string_agg(format('%I = CASE WHEN s.j ? %L THEN (s.r).%I ELSE t.%I END', c, c, c, c), ', ') INTO sql_set
+    FROM unnest(col_names) AS c;
+  END IF;
+
+  IF t_name = 'cityobject' THEN
+    RETURN QUERY EXECUTE format('
+    UPDATE %I.%I AS t SET %s
+    FROM (SELECT e.value AS j, jsonb_populate_record(NULL::%I.%I, e.value) AS r FROM jsonb_array_elements($1) AS e) AS s
+    WHERE t.id = (s.r).id RETURNING t.id', cdb_schema, t_name, sql_set, cdb_schema, t_name) USING changes;
+  ELSE
+    EXECUTE format('
+    WITH u AS (
+      UPDATE %I.%I AS t SET %s
+      FROM (SELECT e.value AS j, jsonb_populate_record(NULL::%I.%I, e.value) AS r FROM jsonb_array_elements($1) AS e) AS s
+      WHERE t.id = (s.r).id RETURNING t.id)
+    SELECT array_agg(u.id) FROM u', cdb_schema, t_name, sql_set, cdb_schema, t_name) INTO upd_ids USING changes;
+
+    -- checks (same as in qgis_pkg.upd_t_<table>(...)), on the updated rows: if any fails, the whole update is rolled back
+    FOR chk IN
+      SELECT v.cond, v.val, v.msg FROM (VALUES
+        ('building', '(t.storeys_above_ground < 0) OR (t.storeys_below_ground < 0)', 'NULL', 'Number of storeys above (or below) ground must be an integer value >= 0'),
+        ('building', '(t.measured_height IS NULL) <> (t.measured_height_unit IS NULL)', 'NULL', 'Measure values (measured_height) must contain both number AND unit of measure'),
+        ('building', '(t.storey_heights_above_ground IS NULL) <> (t.storey_heights_ag_unit IS NULL)', 'NULL', 'Measure values (storey_heights_above_ground) must contain both number AND unit of measure'),
+        ('building', '(t.storey_heights_below_ground IS NULL) <> (t.storey_heights_bg_unit IS NULL)', 'NULL', 'Measure values (storey_heights_below_ground) must contain both number AND unit of measure'),
+        ('bridge', '(t.is_movable IS NOT NULL) AND (t.is_movable NOT IN (0,1))', 't.is_movable', 'is_movable value "%s" must be either NULL, 0, or 1'),
+        ('plant_cover', '(t.height IS NULL) <> (t.height_unit IS NULL)', 'NULL', 'Measure values (average_height) must contain both number AND unit of measure'),
+        ('solitary_vegetat_object', '(t.height IS NULL) <> (t.height_unit IS NULL)', 'NULL', 'Measure values (height) must contain both number AND unit of measure'),
+        ('solitary_vegetat_object', '(t.trunk_diameter IS NULL) <> (t.trunk_diameter_unit IS NULL)', 'NULL', 'Measure values (trunk_diameter) must contain both number AND unit of measure'),
+        ('solitary_vegetat_object', '(t.crown_diameter IS NULL) <> (t.crown_diameter_unit IS NULL)', 'NULL', 'Measure values (crown_diameter) must contain both number AND unit of measure'),
+        ('relief_component', '(t.lod IS NULL) OR NOT (t.lod = ANY(ARRAY[0,1,2,3,4]::numeric[]))', 't.lod', 'Lod value %s must be in interval [0..4]'),
+        ('relief_feature', '(t.lod IS NULL) OR NOT (t.lod = ANY(ARRAY[0,1,2,3,4]::numeric[]))', 't.lod', 'Lod value %s must be in interval [0..4]'),
+        ('tin_relief', '(t.max_length IS NULL) <> (t.max_length_unit IS NULL)', 'NULL', 'Measure values (max_length) must contain both number AND unit of measure')
+      ) AS v(tab, cond, val, msg)
+      WHERE v.tab = t_name
+    LOOP
+      wrong_id := NULL;
+      EXECUTE format('SELECT t.id, (%s)::varchar FROM %I.%I AS t WHERE t.id = ANY($1) AND (%s) LIMIT 1', chk.val, cdb_schema, t_name, chk.cond)
+        INTO wrong_id, wrong_value USING upd_ids;
+      IF wrong_id IS NOT NULL THEN
+        RAISE EXCEPTION '% (id: %)', format(chk.msg, wrong_value), wrong_id;
+      END IF;
+    END LOOP;
+  END IF;
+END LOOP;
+
+EXCEPTION
+  WHEN QUERY_CANCELED THEN
+    RAISE EXCEPTION 'qgis_pkg.upd_atts_bulk(): Error QUERY_CANCELED';
+  WHEN OTHERS THEN
+    RAISE EXCEPTION 'qgis_pkg.upd_atts_bulk(): %', SQLERRM;
+END;
+$$ LANGUAGE plpgsql;
+COMMENT ON FUNCTION qgis_pkg.upd_atts_bulk(varchar, varchar, jsonb) IS 'Update attributes of many features of the same class (tables CITYOBJECT and of the class) with set-based statements';
+REVOKE EXECUTE ON FUNCTION qgis_pkg.upd_atts_bulk(varchar, varchar, jsonb) FROM public;
+
+-- Example:
+--SELECT count(*) FROM qgis_pkg.upd_atts_bulk('citydb', 'Building', '[{"id": 1, "name": "a"}, {"id": 2, "year_of_construction": 1990}]'::jsonb);
+
 --**************************
 DO $MAINBODY$
 BEGIN
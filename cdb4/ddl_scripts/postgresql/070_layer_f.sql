@@ -124,20 +124,26 @@ IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
 END IF;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
---      AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string	
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+--      AND substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string	
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
     usr_schema, r.mv_name));
 
 END LOOP;
 
+-- Drop the shared root geometries (if any), after the gviews selecting from it
+IF sql_statement IS NOT NULL THEN
+    sql_statement := concat(sql_statement, format('
+SELECT qgis_pkg.drop_gview(%L, %L);',
+    usr_schema, concat('_rg_', cdb_schema, '_bri')));
+END IF;
+
 -- Delete entries from table layer_metadata and reset sequence (if possible)
 IF sql_statement IS NOT NULL THEN
     sql_statement := concat(sql_statement, format('
@@ -229,23 +235,35 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing "Bridge" materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing "Bridge" gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 
+-- Refresh the shared root geometries (if any) first, as the gviews select from it
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string
-    ORDER BY mv.matviewname ASC
+        mv.gv_name = concat('_rg_', cdb_schema, '_bri')
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
+    stop_timestamp := clock_timestamp();
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+END LOOP;
+
+FOR r IN 
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
+    WHERE
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string
+    ORDER BY mv.gv_name ASC
+LOOP
+    start_timestamp := clock_timestamp();
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh of the root geometries started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;',
-        usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Refreshed materialized view "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        usr_schema, mv_n_features, f_start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
@@ -343,20 +361,26 @@ IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
 END IF;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
---      AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string	
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+--      AND substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string	
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
     usr_schema, r.mv_name));
 
 END LOOP;
 
+-- Drop the shared root geometries (if any), after the gviews selecting from it
+IF sql_statement IS NOT NULL THEN
+    sql_statement := concat(sql_statement, format('
+SELECT qgis_pkg.drop_gview(%L, %L);',
+    usr_schema, concat('_rg_', cdb_schema, '_bdg')));
+END IF;
+
 -- Delete entries from table layer_metadata and reset sequence (if possible)
 IF sql_statement IS NOT NULL THEN
     sql_statement := concat(sql_statement, format('
@@ -448,23 +472,35 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing "Building" materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing "Building" gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+
+-- Refresh the shared root geometries (if any) first, as the gviews select from it
+FOR r IN 
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
+    WHERE
+        mv.gv_name = concat('_rg_', cdb_schema, '_bdg')
+LOOP
+    start_timestamp := clock_timestamp();
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
+    stop_timestamp := clock_timestamp();
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+END LOOP;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string
+    ORDER BY mv.gv_name ASC
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh of the root geometries started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;',
-        usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Refreshed materialized view "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        usr_schema, mv_n_features, f_start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
@@ -562,16 +598,15 @@ IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
 END IF;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
---      AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string	
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+--      AND substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string	
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
     usr_schema, r.mv_name));
 
 END LOOP;
@@ -667,23 +702,23 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing "CityFurniture" materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing "CityFurniture" gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string
+    ORDER BY mv.gv_name ASC
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;',
-        usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Refreshed materialized view "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        usr_schema, mv_n_features, start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
@@ -781,16 +816,15 @@ IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
 END IF;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
---      AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string	
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+--      AND substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string	
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
     usr_schema, r.mv_name));
 
 END LOOP;
@@ -886,23 +920,23 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing "Generics" materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing "Generics" gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string
+    ORDER BY mv.gv_name ASC
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;',
-        usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Refreshed materialized view "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        usr_schema, mv_n_features, start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
@@ -1000,16 +1034,15 @@ IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
 END IF;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
---      AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string	
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+--      AND substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string	
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
     usr_schema, r.mv_name));
 
 END LOOP;
@@ -1105,23 +1138,23 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing "LandUse" materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing "LandUse" gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string
+    ORDER BY mv.gv_name ASC
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;',
-        usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Refreshed materialized view "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        usr_schema, mv_n_features, start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
@@ -1219,16 +1252,15 @@ IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
 END IF;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
---      AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string	
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+--      AND substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string	
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
     usr_schema, r.mv_name));
 
 END LOOP;
@@ -1324,23 +1356,23 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing "Relief" materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing "Relief" gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string
+    ORDER BY mv.gv_name ASC
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;',
-        usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Refreshed materialized view "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        usr_schema, mv_n_features, start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
@@ -1438,16 +1470,15 @@ IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
 END IF;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
---      AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string	
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+--      AND substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string	
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
     usr_schema, r.mv_name));
 
 END LOOP;
@@ -1543,23 +1574,23 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing "Transportation" materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing "Transportation" gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string
+    ORDER BY mv.gv_name ASC
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;',
-        usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Refreshed materialized view "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        usr_schema, mv_n_features, start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
@@ -1657,20 +1688,26 @@ IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
 END IF;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
---      AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string	
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+--      AND substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string	
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
     usr_schema, r.mv_name));
 
 END LOOP;
 
+-- Drop the shared root geometries (if any), after the gviews selecting from it
+IF sql_statement IS NOT NULL THEN
+    sql_statement := concat(sql_statement, format('
+SELECT qgis_pkg.drop_gview(%L, %L);',
+    usr_schema, concat('_rg_', cdb_schema, '_tun')));
+END IF;
+
 -- Delete entries from table layer_metadata and reset sequence (if possible)
 IF sql_statement IS NOT NULL THEN
     sql_statement := concat(sql_statement, format('
@@ -1762,23 +1799,35 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing "Tunnel" materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing "Tunnel" gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 
+-- Refresh the shared root geometries (if any) first, as the gviews select from it
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string
-    ORDER BY mv.matviewname ASC
+        mv.gv_name = concat('_rg_', cdb_schema, '_tun')
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
+    stop_timestamp := clock_timestamp();
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+END LOOP;
+
+FOR r IN 
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
+    WHERE
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string
+    ORDER BY mv.gv_name ASC
+LOOP
+    start_timestamp := clock_timestamp();
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh of the root geometries started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;',
-        usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Refreshed materialized view "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        usr_schema, mv_n_features, f_start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
@@ -1876,16 +1925,15 @@ IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
 END IF;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
---      AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string	
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+--      AND substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string	
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
     usr_schema, r.mv_name));
 
 END LOOP;
@@ -1981,23 +2029,23 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing "Vegetation" materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing "Vegetation" gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string
+    ORDER BY mv.gv_name ASC
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;',
-        usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Refreshed materialized view "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        usr_schema, mv_n_features, start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
@@ -2095,16 +2143,15 @@ IF cdb_schema IS NULL OR (NOT cdb_schema = ANY(cdb_schemas_array)) THEN
 END IF;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
---      AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string	
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+--      AND substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string	
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
     usr_schema, r.mv_name));
 
 END LOOP;
@@ -2200,23 +2247,23 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing "WaterBody" materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing "WaterBody" gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-        AND substring(mv.matviewname, gv_feat_type_pos) ~ regexp_string
-    ORDER BY mv.matviewname ASC
+        mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%')
+        AND substring(mv.gv_name, gv_feat_type_pos) ~ regexp_string
+    ORDER BY mv.gv_name ASC
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;',
-        usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Refreshed materialized view "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        usr_schema, mv_n_features, start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Refreshed gview "%"."%" in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
@@ -2425,6 +2472,7 @@ RETURNS void AS $$
 DECLARE
 gv_prefix         CONSTANT varchar := '_g_';
 gv_cdb_schema_pos CONSTANT integer := length(gv_prefix) + 1;
+rg_prefix         CONSTANT varchar := '_rg_';
 usr_schemas_array CONSTANT varchar[] := (SELECT array_agg(s.usr_schema) FROM qgis_pkg.list_usr_schemas() AS s);
 cdb_schemas_array CONSTANT varchar[] := (SELECT array_agg(d.cdb_schema) FROM qgis_pkg.list_cdb_schemas() AS d);
 start_timestamp   timestamptz(3);
@@ -2446,25 +2494,25 @@ END IF;
 
 f_start_timestamp := clock_timestamp();
 
-RAISE NOTICE 'Refreshing ALL materialized views in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
+RAISE NOTICE 'Refreshing ALL gviews in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
     WHERE 
-        mv.schemaname::varchar = usr_schema
-        AND mv.matviewname LIKE concat(gv_prefix, cdb_schema, '%')
-    ORDER BY mv.matviewname ASC
+        (mv.gv_name LIKE concat(gv_prefix, cdb_schema, '%') OR mv.gv_name LIKE concat(rg_prefix, cdb_schema, '%'))
+    ORDER BY (mv.gv_name LIKE concat(rg_prefix, cdb_schema, '%')) DESC, mv.gv_name ASC -- The shared root geometries first
 LOOP
     start_timestamp := clock_timestamp();
-    EXECUTE format('REFRESH MATERIALIZED VIEW %I.%I;', usr_schema, r.mv_name);
+    PERFORM qgis_pkg.refresh_gview(usr_schema, r.mv_name);
     stop_timestamp := clock_timestamp();
     EXECUTE format('SELECT count(co_id) FROM %I.%I;', usr_schema, r.mv_name) INTO mv_n_features;
+    -- The refresh date is when the refresh of the root geometries started: later changes may be missing from the view
     EXECUTE format('UPDATE %I.layer_metadata AS lm SET n_features = %L, refresh_date = %L WHERE lm.cdb_schema = %L AND lm.gv_name = %L;'
-        ,usr_schema, mv_n_features, stop_timestamp, cdb_schema, r.mv_name);
-    RAISE NOTICE 'Materialized view "%"."%" refreshed in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
+        ,usr_schema, mv_n_features, f_start_timestamp, cdb_schema, r.mv_name);
+    RAISE NOTICE 'Gview "%"."%" refreshed in %', usr_schema, r.mv_name, stop_timestamp-start_timestamp; 
 END LOOP;
 
 f_stop_timestamp := clock_timestamp();
-RAISE NOTICE 'ALL materialized views in usr_schema "%" associated to cdb_schema "%" refreshed in %', usr_schema, cdb_schema, f_stop_timestamp-f_start_timestamp;
+RAISE NOTICE 'ALL gviews in usr_schema "%" associated to cdb_schema "%" refreshed in %', usr_schema, cdb_schema, f_stop_timestamp-f_start_timestamp;
 
 EXCEPTION
     WHEN QUERY_CANCELED THEN
@@ -2473,7 +2521,7 @@ EXCEPTION
         RAISE NOTICE 'qgis_pkg.refresh_layers(): %', SQLERRM;
 END;
 $$ LANGUAGE plpgsql;
-COMMENT ON FUNCTION qgis_pkg.refresh_layers(varchar, varchar) IS 'Refresh materialized views in usr_schema';
+COMMENT ON FUNCTION qgis_pkg.refresh_layers(varchar, varchar) IS 'Refresh gviews in usr_schema';
 REVOKE EXECUTE ON FUNCTION qgis_pkg.refresh_layers(varchar, varchar) FROM public;
 
 ----------------------------------------------------------------
@@ -2490,6 +2538,7 @@ AS $$
 DECLARE
 gv_prefix         CONSTANT varchar := '_g_';
 gv_cdb_schema_pos CONSTANT integer := length(gv_prefix) + 1;
+rg_prefix         CONSTANT varchar := '_rg_';
 usr_schemas_array CONSTANT varchar[] := (SELECT array_agg(s.usr_schema) FROM qgis_pkg.list_usr_schemas() AS s);
 cdb_schemas_array CONSTANT varchar[] := (SELECT array_agg(d.cdb_schema) FROM qgis_pkg.list_cdb_schemas() AS d);
 sql_statement     text := NULL;
@@ -2507,13 +2556,13 @@ END IF;
 
 --RAISE NOTICE 'Dropping all layers in usr_schema "%" associated to cdb_schema "%"', usr_schema, cdb_schema;
 FOR r IN 
-    SELECT mv.matviewname AS mv_name FROM pg_matviews AS mv
-    WHERE mv.schemaname::varchar = usr_schema
-        AND substring(mv.matviewname, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%')	
-    ORDER BY mv.matviewname ASC
+    SELECT mv.gv_name AS mv_name FROM qgis_pkg.list_gviews(usr_schema) AS mv
+    WHERE
+        (substring(mv.gv_name, gv_cdb_schema_pos) LIKE concat(cdb_schema, '%') OR mv.gv_name LIKE concat(rg_prefix, cdb_schema, '%'))
+    ORDER BY mv.gv_name ASC
 LOOP
     sql_statement := concat(sql_statement, format('
-DROP MATERIALIZED VIEW %I.%I CASCADE;',
+SELECT qgis_pkg.drop_gview(%L, %L);',
 usr_schema, r.mv_name));
 END LOOP;
 
@@ -65,12 +65,14 @@ qi_usr_schema varchar; ql_usr_schema varchar;
 qi_usr_name varchar; ql_usr_name varchar;
 l_name varchar; ql_l_name varchar; qi_l_name varchar;
 gv_name varchar; qi_gv_name varchar; ql_gv_name varchar;
+rg_name varchar; qi_rg_name varchar;
 qml_form_name 	varchar := NULL;
 qml_symb_name 	varchar := NULL;
 qml_3d_name 	varchar := NULL;
 trig_f_suffix   varchar := NULL;
 r RECORD; s RECORD; t RECORD; u RECORD;
 sql_feat_count	text := NULL;
+col_stats		jsonb := NULL;
 sql_where 		text := NULL;
 sql_upd			text := NULL;
 sql_ins			text := NULL;
@@ -130,9 +132,13 @@ qi_usr_name   := quote_ident(usr_name);
 ql_usr_name   := quote_literal(usr_name);
 qi_usr_schema := quote_ident(usr_schema);
 ql_usr_schema := quote_literal(usr_schema);
+-- Materialized view of the collected geometries of each root, shared by the gviews of the module
+rg_name       := concat('_rg_',cdb_schema,'_bri');
+qi_rg_name    := quote_ident(rg_name);
 
 -- Prepare fixed part of SQL statements
 sql_upd := concat('
+SELECT pg_advisory_xact_lock(''',qi_usr_schema,'.layer_metadata''::regclass::oid::bigint); -- Serialize metadata writes of layers created concurrently
 DELETE FROM ',qi_usr_schema,'.layer_metadata AS l WHERE l.cdb_schema = ',ql_cdb_schema,' AND l.layer_type = ',ql_l_type,' AND l.feature_type = ',ql_feature_type,';
 INSERT INTO ',qi_usr_schema,'.layer_metadata 
 (cdb_schema, layer_type, feature_type, root_class, class, lod, layer_name, gv_name, n_features, creation_date, qml_form, qml_symb, qml_3d, enum_cols, codelist_cols)
@@ -148,6 +154,10 @@ ELSE
 	sql_where := concat('AND ST_MakeEnvelope(',ST_XMin(mview_bbox),',',ST_YMin(mview_bbox),',',ST_XMax(mview_bbox),',',ST_YMax(mview_bbox),',',srid,') && co.envelope');
 END IF;
 
+-- Statistics pre-pass: count the non-empty geometry columns of all involved tables, one scan per table.
+-- They are used to skip the feature count of the layers that would be empty anyway.
+col_stats := qgis_pkg.geometry_column_counter(cdb_schema, ARRAY['address', 'bridge', 'bridge_thematic_surface', 'bridge_installation', 'bridge_constr_element', 'bridge_opening', 'bridge_room', 'bridge_furniture'], mview_bbox);
+
 RAISE NOTICE 'For module "%" and user "%": creating layers in usr_schema "%" for cdb_schema "%"', feature_type, qi_usr_name, qi_usr_schema, qi_cdb_schema;
 
 sql_layer := NULL; sql_ins := NULL; sql_trig := NULL;
@@ -189,7 +199,11 @@ sql_feat_count := concat('
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.bridge_id AND co.objectclass_id = ',r.class_id,' ',sql_where,')
 	WHERE o.multi_point IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'address', ARRAY['multi_point']) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -218,14 +232,8 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 	FROM 
 		',qi_cdb_schema,'.address AS o
 		INNER JOIN ',qi_cdb_schema,'.address_to_bridge AS o2 ON (o2.address_id = o.id)
-		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.bridge_id AND co.objectclass_id = ',r.class_id,' ',sql_where,')
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' in schema ',qi_cdb_schema,''';
-CREATE INDEX ',quote_ident(concat(gv_name,'_id_idx')),' ON ',qi_usr_schema,'.',qi_gv_name,' (co_id);
-CREATE INDEX ', quote_ident(concat(gv_name,'_geom_spx')),' ON ',qi_usr_schema,'.',qi_gv_name,' USING gist (geom);
-ALTER TABLE ',qi_usr_schema,'.',qi_gv_name,' OWNER TO ',qi_usr_name,';
---DELETE FROM ',qi_usr_schema,'.layer_metadata AS lm WHERE lm.layer_name = ',ql_l_name,';
---REFRESH MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,';
+		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.bridge_id AND co.objectclass_id = ',r.class_id,' ',sql_where,');
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name, FALSE),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' in schema ',qi_cdb_schema,''';
 ');
 
 -------
@@ -290,7 +298,11 @@ sql_feat_count := concat('
 	WHERE
 		o.',t.lodx_label,'_terrain_intersection IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge', ARRAY[concat(t.lodx_label,'_terrain_intersection')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % (tic)', num_features, r.class_name, t.lodx_name;
 
@@ -319,10 +331,9 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		',qi_cdb_schema,'.bridge AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',r.class_id,' ',sql_where,')	
 	WHERE
-		o.',t.lodx_label,'_terrain_intersection IS NOT NULL
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		o.',t.lodx_label,'_terrain_intersection IS NOT NULL;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -387,7 +398,11 @@ FROM (
 		o.',t.lodx_label,'_multi_curve IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge', ARRAY[concat(t.lodx_label,'_multi_curve')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % (multi_curve)', num_features, r.class_name, t.lodx_name;
 
@@ -416,10 +431,9 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		',qi_cdb_schema,'.bridge AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',r.class_id,' ',sql_where,')	
 	WHERE
-		o.',t.lodx_label,'_multi_curve IS NOT NULL
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		o.',t.lodx_label,'_multi_curve IS NOT NULL;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -478,7 +492,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL OR o.',t.lodx_label,'_solid_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_solid_id')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % %', num_features, r.class_name, t.lodx_name;
 
@@ -501,8 +519,8 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM (
 		SELECT
 			o.id AS co_id, 	
@@ -516,11 +534,10 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		WHERE			
 			o.',t.lodx_label,'_solid_id IS NOT NULL OR o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 		) AS foo
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo.sg_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo.sg_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -592,7 +609,12 @@ FROM (
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_solid_id')], r.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'bridge_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')]) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % %', num_features, r.class_name, t.lodx_name;
 
@@ -616,7 +638,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
 		foo2.co_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM (
 		SELECT
 			foo.co_id,
@@ -644,11 +666,10 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 					) AS ts_t ON (ts_t.co_id = o.id)
 			) AS foo
 		) AS foo2
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
-	GROUP BY foo2.co_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
+	GROUP BY foo2.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -712,7 +733,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % %', num_features, r.class_name, t.lodx_name, u.class_name;
 
@@ -735,17 +760,16 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.bridge_thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,')		
 		INNER JOIN ',qi_cdb_schema,'.bridge AS b ON (o.bridge_id = b.id AND b.objectclass_id = ',r.class_id,')
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -820,7 +844,12 @@ FROM (
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_installation', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'bridge_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')]) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -844,7 +873,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT 
 		foo2.co_id AS co_id,
-		st_collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM ( 
 			SELECT 
 				foo.co_id,
@@ -876,7 +905,7 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 						o.',t.lodx_label,'_implicit_rep_id IS NULL
 				) AS foo
 	   ) AS foo2
-	INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
+	INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
 	GROUP BY foo2.co_id
 	UNION');
 -- the need to split is due to max 100 arguments allowed in the concat function.
@@ -912,10 +941,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -972,7 +1000,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_name;
 
@@ -995,18 +1027,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ,',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.bridge_thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,') 
 		INNER JOIN ',qi_cdb_schema,'.bridge_installation AS bi ON (o.bridge_installation_id = bi.id AND bi.objectclass_id = ',s.class_id,')
 		INNER JOIN ',qi_cdb_schema,'.bridge AS b ON (o.bridge_id = b.id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1073,7 +1104,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_terrain_intersection IS NOT NULL
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_constr_element', ARRAY[concat(t.lodx_label,'_terrain_intersection')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % (tic)', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1102,10 +1137,9 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		',qi_cdb_schema,'.bridge_constr_element AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',r.class_id,' ',sql_where,')	
 	WHERE
-		o.',t.lodx_label,'_terrain_intersection IS NOT NULL
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		o.',t.lodx_label,'_terrain_intersection IS NOT NULL;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1158,7 +1192,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_brep_id IS NOT NULL OR o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_constr_element', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1181,16 +1219,16 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom	
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom	
 	FROM
 		',qi_cdb_schema,'.bridge_constr_element AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o.id AND o.objectclass_id = ',s.class_id,' ',sql_where,')
 		INNER JOIN ',qi_cdb_schema,'.bridge AS b ON (b.id = o.bridge_id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_label,'_brep_id AND sg.geometry IS NOT NULL)
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_label,'_brep_id)
 	WHERE
 		o.',t.lodx_label,'_implicit_rep_id IS NULL AND o.',t.lodx_label,'_brep_id IS NOT NULL 
-	GROUP BY sg.cityobject_id
+	GROUP BY sg.co_id
 	UNION');
 sql_layer := concat(sql_layer,'	
 	SELECT
@@ -1224,10 +1262,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1296,7 +1333,12 @@ FROM (
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_constr_element', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'bridge_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')]) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1320,7 +1362,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT 
 		foo2.co_id AS co_id,
-		st_collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM ( 
 			SELECT 
 				foo.co_id,
@@ -1352,7 +1394,7 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 						o.',t.lodx_label,'_implicit_rep_id IS NULL
 				) AS foo
 	   ) AS foo2
-	INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
+	INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
 	GROUP BY foo2.co_id
 	UNION');
 sql_layer := concat(sql_layer,'	
@@ -1388,8 +1430,8 @@ sql_layer := concat(sql_layer,'
 	WHERE
 		o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
 	GROUP BY o.id;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1446,7 +1488,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_name;
 
@@ -1469,18 +1515,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ,',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.bridge_thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o.id AND o.objectclass_id = ',u.class_id,' ',sql_where,') 
 		INNER JOIN ',qi_cdb_schema,'.bridge_constr_element AS bc ON (bc.id = o.bridge_installation_id AND bc.objectclass_id = ',s.class_id,')
 		INNER JOIN ',qi_cdb_schema,'.bridge AS b ON (b.id = bc.bridge_id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1550,7 +1595,11 @@ sql_feat_count := concat('
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.id AND co.objectclass_id = ',s.class_id,' ',sql_where,')
 	WHERE o.multi_point IS NOT NULL;;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'address', ARRAY['multi_point']) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_name;
 
@@ -1579,14 +1628,8 @@ SELECT
 FROM 
 	',qi_cdb_schema,'.address AS o
 	INNER JOIN ',qi_cdb_schema,'.bridge_opening AS o2 ON (o2.address_id = o.id AND o2.objectclass_id = ',s.class_id,')
-	INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.id AND co.objectclass_id = ',s.class_id,' ',sql_where,')
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-CREATE INDEX ',quote_ident(concat(gv_name,'_id_idx')),' ON ',qi_usr_schema,'.',qi_gv_name,' (co_id);
-CREATE INDEX ', quote_ident(concat(gv_name,'_geom_spx')),' ON ',qi_usr_schema,'.',qi_gv_name,' USING gist (geom);
-ALTER TABLE ',qi_usr_schema,'.',qi_gv_name,' OWNER TO ',qi_usr_name,';
---DELETE FROM ',qi_usr_schema,'.layer_metadata AS lm WHERE lm.layer_name = ',ql_l_name,';
---REFRESH MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,';
+	INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.id AND co.objectclass_id = ',s.class_id,' ',sql_where,');
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name, FALSE),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
 ');
 
 -------
@@ -1655,7 +1698,11 @@ sql_feat_count := concat('
 	WHERE
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL OR o.',t.lodx_label,'_implicit_rep_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_opening', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1685,18 +1732,18 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ,',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.bridge_opening AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',s.class_id,' ',sql_where,')
 		INNER JOIN ',qi_cdb_schema,'.bridge_open_to_them_srf AS ots ON (ots.bridge_opening_id = o.id)
 		INNER JOIN ',qi_cdb_schema,'.bridge_thematic_surface AS ts ON (ts.id = ots.bridge_thematic_surface_id)
 		INNER JOIN ',qi_cdb_schema,'.bridge AS b ON (b.id = ts.bridge_id AND b.objectclass_id = ',r.class_id,')
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry sg ON sg.root_id = o.',t.lodx_name,'_multi_surface_id  AND sg.geometry IS NOT NULL
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
 	WHERE
 		o.',t.lodx_name,'_implicit_rep_id IS NULL
-	GROUP BY sg.cityobject_id
+	GROUP BY sg.co_id
 	UNION');
 -- the need to split is due to max 100 arguments allowed in the concat function.
 sql_layer := concat(sql_layer,'
@@ -1733,10 +1780,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_name,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1798,7 +1844,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL OR o.',t.lodx_label,'_solid_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_room', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_solid_id')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1822,7 +1872,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
 		foo2.co_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom	
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom	
 	FROM (
 		SELECT
 			foo.co_id,
@@ -1850,11 +1900,10 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 					) AS ts_t ON (ts_t.co_id = o.id)
 			) AS foo
 		) AS foo2
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
-	GROUP BY foo2.co_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
+	GROUP BY foo2.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1908,7 +1957,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_label;
 
@@ -1931,18 +1984,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.bridge_thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,') 
 		INNER JOIN ',qi_cdb_schema,'.bridge_room AS r ON (r.id = o.bridge_room_id AND r.objectclass_id = ',s.class_id,')
 		INNER JOIN ',qi_cdb_schema,'.bridge AS b ON (b.id = r.bridge_id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id  AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -2017,7 +2069,12 @@ FROM (
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_installation', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'bridge_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')]) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -2041,7 +2098,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT 
 		foo2.co_id AS co_id,
-		st_collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM ( 
 			SELECT 
 				foo.co_id,
@@ -2073,7 +2130,7 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 						o.',t.lodx_label,'_implicit_rep_id IS NULL
 				) AS foo
 	   ) AS foo2
-	INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
+	INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
 	GROUP BY foo2.co_id
 	UNION');
 sql_layer := concat(sql_layer,'	
@@ -2108,10 +2165,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -2171,7 +2227,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_name;
 
@@ -2194,18 +2254,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ,',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.bridge_thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,') 
 		INNER JOIN ',qi_cdb_schema,'.bridge_installation AS bi ON (o.bridge_installation_id = bi.id AND bi.objectclass_id = ',s.class_id,')
 		INNER JOIN ',qi_cdb_schema,'.bridge AS b ON (o.bridge_id = b.id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id  AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -2267,7 +2326,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_brep_id IS NOT NULL OR o.',t.lodx_label,'_implicit_rep_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'bridge_furniture', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -2290,17 +2353,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT 
-		sg.cityobject_id::bigint AS co_id,
-		st_collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.bridge_furniture AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o.id AND o.objectclass_id = ',s.class_id,' ',sql_where,')
 		INNER JOIN ',qi_cdb_schema,'.bridge_room AS r ON (r.id = o.bridge_room_id)
 		INNER JOIN ',qi_cdb_schema,'.bridge AS b ON (b.id = r.bridge_id AND b.objectclass_id = ',r.class_id,')
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_label,'_brep_id AND sg.geometry IS NOT NULL)
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_label,'_brep_id)
 	WHERE
 		o.',t.lodx_label,'_brep_id IS NOT NULL
-	GROUP BY sg.cityobject_id
+	GROUP BY sg.co_id
 	UNION');
 sql_layer := concat(sql_layer,'	
 	SELECT
@@ -2335,10 +2398,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_brep_id IS NULL AND o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -2378,6 +2440,27 @@ END LOOP;  -- bridge
 IF sql_ins IS NOT NULL THEN
 	sql_ins := concat(sql_upd, substr(sql_ins,1, length(sql_ins)-1), ';');
 END IF;
+-- Create the shared mat view of the root geometries first, only if any gview selects from it
+IF position(concat(qi_usr_schema,'.',qi_rg_name) IN sql_layer) > 0 THEN
+	sql_layer := concat(qgis_pkg.generate_sql_root_geom_cache(qi_usr_name, qi_usr_schema, qi_cdb_schema, qi_rg_name,
+		ARRAY['bridge', 'bridge_thematic_surface', 'bridge_installation', 'bridge_constr_element', 'bridge_opening', 'bridge_room', 'bridge_furniture'],
+		ARRAY[['bridge', 'id', 'bridge_parent_id'],
+		      ['bridge_room', 'id', 'bridge_id'],
+		      ['bridge_installation', 'id', 'bridge_id'],
+		      ['bridge_installation', 'id', 'bridge_room_id'],
+		      ['bridge_constr_element', 'id', 'bridge_id'],
+		      ['bridge_furniture', 'id', 'bridge_room_id'],
+		      ['bridge_thematic_surface', 'id', 'bridge_id'],
+		      ['bridge_thematic_surface', 'id', 'bridge_room_id'],
+		      ['bridge_thematic_surface', 'id', 'bridge_installation_id'],
+		      ['bridge_thematic_surface', 'id', 'bridge_constr_element_id'],
+		      ['bridge_open_to_them_srf', 'bridge_opening_id', 'bridge_thematic_surface_id']],
+		sql_where,
+		perform_snapping, digits, area_poly_min, srid), sql_layer);
+ELSE
+	sql_layer := concat('
+SELECT qgis_pkg.drop_gview(',quote_literal(usr_schema),', ',quote_literal(rg_name),');', sql_layer);
+END IF;
 -- create the final sql statement
 sql_statement := concat(sql_layer, sql_trig, sql_ins);
 
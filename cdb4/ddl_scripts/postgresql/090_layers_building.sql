@@ -66,12 +66,14 @@ qi_usr_name varchar; ql_usr_name varchar;
 l_name varchar; ql_l_name varchar; qi_l_name varchar;
 --av_name varchar; ql_av_name varchar; qi_av_name varchar;
 gv_name varchar; qi_gv_name varchar; ql_gv_name varchar;
+rg_name varchar; qi_rg_name varchar;
 qml_form_name 	varchar := NULL;
 qml_symb_name 	varchar := NULL;
 qml_3d_name 	varchar := NULL;
 trig_f_suffix   varchar := NULL;
 r RECORD; s RECORD; t RECORD; u RECORD;
 sql_feat_count	text := NULL;
+col_stats		jsonb := NULL;
 sql_where 		text := NULL;
 sql_upd			text := NULL;
 sql_ins			text := NULL;
@@ -131,9 +133,13 @@ qi_usr_name   := quote_ident(usr_name);
 ql_usr_name   := quote_literal(usr_name);
 qi_usr_schema := quote_ident(usr_schema);
 ql_usr_schema := quote_literal(usr_schema);
+-- Materialized view of the collected geometries of each root, shared by the gviews of the module
+rg_name       := concat('_rg_',cdb_schema,'_bdg');
+qi_rg_name    := quote_ident(rg_name);
 
 -- Prepare fixed part of SQL statements
 sql_upd := concat('
+SELECT pg_advisory_xact_lock(''',qi_usr_schema,'.layer_metadata''::regclass::oid::bigint); -- Serialize metadata writes of layers created concurrently
 DELETE FROM ',qi_usr_schema,'.layer_metadata AS l WHERE l.cdb_schema = ',ql_cdb_schema,' AND l.layer_type = ',ql_l_type,' AND l.feature_type = ',ql_feature_type,';
 INSERT INTO ',qi_usr_schema,'.layer_metadata 
 (cdb_schema, layer_type, feature_type, root_class, class, lod, layer_name, gv_name, n_features, creation_date, qml_form, qml_symb, qml_3d, enum_cols, codelist_cols)
@@ -149,6 +155,10 @@ ELSE
 	sql_where := concat('AND ST_MakeEnvelope(',ST_XMin(mview_bbox),',',ST_YMin(mview_bbox),',',ST_XMax(mview_bbox),',',ST_YMax(mview_bbox),',',srid,') && co.envelope');
 END IF;
 
+-- Statistics pre-pass: count the non-empty geometry columns of all involved tables, one scan per table.
+-- They are used to skip the feature count of the layers that would be empty anyway.
+col_stats := qgis_pkg.geometry_column_counter(cdb_schema, ARRAY['address', 'building', 'thematic_surface', 'building_installation', 'opening', 'room', 'building_furniture'], mview_bbox);
+
 RAISE NOTICE 'For module "%" and user "%": creating layers in usr_schema "%" for cdb_schema "%"', feature_type, qi_usr_name, qi_usr_schema, qi_cdb_schema;
 
 sql_layer := NULL; sql_ins := NULL; sql_trig := NULL;
@@ -189,7 +199,11 @@ sql_feat_count := concat('
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.building_id AND co.objectclass_id = ',r.class_id,' ',sql_where,')
 	WHERE o.multi_point IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'address', ARRAY['multi_point']) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -218,14 +232,8 @@ SELECT
 FROM 
 	',qi_cdb_schema,'.address AS o
 	INNER JOIN ',qi_cdb_schema,'.address_to_building AS o2 ON (o2.address_id = o.id)
-	INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.building_id AND co.objectclass_id = ',r.class_id,' ',sql_where,')
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' in schema ',qi_cdb_schema,''';
-CREATE INDEX ',quote_ident(concat(gv_name,'_id_idx')),' ON ',qi_usr_schema,'.',qi_gv_name,' (co_id);
-CREATE INDEX ', quote_ident(concat(gv_name,'_geom_spx')),' ON ',qi_usr_schema,'.',qi_gv_name,' USING gist (geom);
-ALTER TABLE ',qi_usr_schema,'.',qi_gv_name,' OWNER TO ',qi_usr_name,';
---DELETE FROM ',qi_usr_schema,'.layer_metadata AS lm WHERE lm.layer_name = ',ql_l_name,';
---REFRESH MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,';
+	INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.building_id AND co.objectclass_id = ',r.class_id,' ',sql_where,');
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name, FALSE),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' in schema ',qi_cdb_schema,''';
 ');
 
 
@@ -291,7 +299,11 @@ sql_feat_count := concat('
 	WHERE
 		o.',t.lodx_label,'_terrain_intersection IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'building', ARRAY[concat(t.lodx_label,'_terrain_intersection')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % (tic)', num_features, r.class_name, t.lodx_name;
 
@@ -320,10 +332,9 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		',qi_cdb_schema,'.building AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',r.class_id,' ',sql_where,')	
 	WHERE
-		o.',t.lodx_label,'_terrain_intersection IS NOT NULL
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		o.',t.lodx_label,'_terrain_intersection IS NOT NULL;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -393,7 +404,11 @@ sql_feat_count := concat('
 	WHERE
 		o.',t.lodx_label,'_multi_curve IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'building', ARRAY[concat(t.lodx_label,'_multi_curve')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % (multi_curve)', num_features, r.class_name, t.lodx_name;
 
@@ -422,10 +437,9 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		',qi_cdb_schema,'.building AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',r.class_id,' ',sql_where,')	
 	WHERE
-		o.',t.lodx_label,'_multi_curve IS NOT NULL
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		o.',t.lodx_label,'_multi_curve IS NOT NULL;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -497,7 +511,11 @@ FROM (
 		o.',t.lodx_label,'_footprint_id IS NOT NULL OR o.',t.lodx_label,'_roofprint_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'building', ARRAY[concat(t.lodx_label,'_footprint_id'), concat(t.lodx_label,'_roofprint_id')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % %', num_features, r.class_name, t.lodx_name;
 
@@ -520,8 +538,8 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM (
 		SELECT
 			b1.',t.lodx_label,'_footprint_id AS sg_id
@@ -535,11 +553,10 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 			',qi_cdb_schema,'.building AS b2
 			INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = b2.id AND b2.objectclass_id = ',r.class_id,' ',sql_where,')
 		) AS b
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = b.sg_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = b.sg_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -606,7 +623,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_',u.themsurf_label,'_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'building', ARRAY[concat(t.lodx_label,'_',u.themsurf_label,'_id')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % %', num_features, r.class_name, t.lodx_name, u.themsurf_name;
 
@@ -629,16 +650,15 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.building AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',r.class_id,' ',sql_where,') 
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_label,'_',u.themsurf_label,'_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',t.lodx_name,' ',u.themsurf_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_label,'_',u.themsurf_label,'_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',t.lodx_name,' ',u.themsurf_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -707,7 +727,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL OR o.',t.lodx_label,'_solid_id IS NOT NULL
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'building', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_solid_id')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % %', num_features, r.class_name, t.lodx_name;
 
@@ -730,8 +754,8 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM (
 		SELECT
 			o.id AS co_id, 	
@@ -745,11 +769,10 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		WHERE			
 			o.',t.lodx_label,'_solid_id IS NOT NULL OR o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 		) AS foo
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo.sg_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo.sg_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -831,7 +854,12 @@ FROM (
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'building', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_solid_id')], r.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')]) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % %', num_features, r.class_name, t.lodx_name;
 
@@ -855,7 +883,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
 		foo2.co_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM (
 		SELECT
 			foo.co_id,
@@ -881,11 +909,10 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 					) AS ts_t ON (ts_t.co_id = o.id)
 			) AS foo
 		) AS foo2
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
-	GROUP BY foo2.co_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
+	GROUP BY foo2.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -957,7 +984,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % %', num_features, r.class_name, t.lodx_name, u.class_name;
 
@@ -980,17 +1011,16 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,')		
 		INNER JOIN ',qi_cdb_schema,'.building AS b ON (o.building_id = b.id AND b.objectclass_id = ',r.class_id,')
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1063,7 +1093,12 @@ FROM (
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'building_installation', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')]) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1087,7 +1122,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT 
 		foo2.co_id AS co_id,
-		st_collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM ( 
 			SELECT 
 				foo.co_id,
@@ -1119,7 +1154,7 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 						o.',t.lodx_label,'_implicit_rep_id IS NULL
 				) AS foo
 	   ) AS foo2
-	INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
+	INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
 	GROUP BY foo2.co_id
 	UNION');
 sql_layer := concat(sql_layer,'	
@@ -1154,10 +1189,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1214,7 +1248,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_name;
 
@@ -1237,18 +1275,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ,',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,') 
 		INNER JOIN ',qi_cdb_schema,'.building_installation AS bi ON (o.building_installation_id = bi.id AND bi.objectclass_id = ',s.class_id,')
 		INNER JOIN ',qi_cdb_schema,'.building AS b ON (o.building_id = b.id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id  AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1318,7 +1355,11 @@ sql_feat_count := concat('
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.id AND co.objectclass_id = ',s.class_id,' ',sql_where,')
 	WHERE o.multi_point IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'address', ARRAY['multi_point']) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_name;
 
@@ -1347,14 +1388,8 @@ SELECT
 FROM 
 	',qi_cdb_schema,'.address AS o
 	INNER JOIN ',qi_cdb_schema,'.opening AS o2 ON (o2.address_id = o.id AND o2.objectclass_id = ',s.class_id,')
-	INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.id AND co.objectclass_id = ',s.class_id,' ',sql_where,')
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-CREATE INDEX ',quote_ident(concat(gv_name,'_id_idx')),' ON ',qi_usr_schema,'.',qi_gv_name,' (co_id);
-CREATE INDEX ', quote_ident(concat(gv_name,'_geom_spx')),' ON ',qi_usr_schema,'.',qi_gv_name,' USING gist (geom);
-ALTER TABLE ',qi_usr_schema,'.',qi_gv_name,' OWNER TO ',qi_usr_name,';
---DELETE FROM ',qi_usr_schema,'.layer_metadata AS lm WHERE lm.layer_name = ',ql_l_name,';
---REFRESH MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,';
+	INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o2.id AND co.objectclass_id = ',s.class_id,' ',sql_where,');
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name, FALSE),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
 ');
 
 
@@ -1424,7 +1459,11 @@ sql_feat_count := concat('
 	WHERE
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL OR o.',t.lodx_label,'_implicit_rep_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'opening', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1456,18 +1495,18 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ,',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.opening AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',s.class_id,' ',sql_where,')
 		INNER JOIN ',qi_cdb_schema,'.opening_to_them_surface AS ots ON (ots.opening_id = o.id)
 		INNER JOIN ',qi_cdb_schema,'.thematic_surface AS ts ON (ts.id = ots.thematic_surface_id)
 		INNER JOIN ',qi_cdb_schema,'.building AS b ON (b.id = ts.building_id AND b.objectclass_id = ',r.class_id,')
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry sg ON sg.root_id = o.',t.lodx_name,'_multi_surface_id  AND sg.geometry IS NOT NULL
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
 	WHERE
 		o.',t.lodx_name,'_implicit_rep_id IS NULL
-	GROUP BY sg.cityobject_id
+	GROUP BY sg.co_id
 	UNION');
 sql_layer := concat(sql_layer,'
 	SELECT
@@ -1503,10 +1542,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_name,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1568,7 +1606,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL OR o.',t.lodx_label,'_solid_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'room', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_solid_id')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1592,7 +1634,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
 		foo2.co_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom	
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom	
 	FROM (
 		SELECT
 			foo.co_id,
@@ -1620,11 +1662,10 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 					) AS ts_t ON (ts_t.co_id = o.id)
 			) AS foo
 		) AS foo2
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
-	GROUP BY foo2.co_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
+	GROUP BY foo2.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1678,7 +1719,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_label;
 
@@ -1701,18 +1746,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,') 
 		INNER JOIN ',qi_cdb_schema,'.room AS r ON (r.id = o.room_id AND r.objectclass_id = ',s.class_id,')
 		INNER JOIN ',qi_cdb_schema,'.building AS b ON (b.id = r.building_id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id  AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1786,7 +1830,12 @@ FROM (
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'building_installation', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')]) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1810,7 +1859,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT 
 		foo2.co_id AS co_id,
-		st_collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM ( 
 			SELECT 
 				foo.co_id,
@@ -1842,7 +1891,7 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 						o.',t.lodx_label,'_implicit_rep_id IS NULL
 				) AS foo
 	   ) AS foo2
-	INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
+	INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
 	GROUP BY foo2.co_id
 	UNION');
 sql_layer := concat(sql_layer,'	
@@ -1877,10 +1926,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1940,7 +1988,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_name;
 
@@ -1963,18 +2015,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ,',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,') 
 		INNER JOIN ',qi_cdb_schema,'.building_installation AS bi ON (o.building_installation_id = bi.id AND bi.objectclass_id = ',s.class_id,')
 		INNER JOIN ',qi_cdb_schema,'.building AS b ON (o.building_id = b.id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id  AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -2035,7 +2086,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_brep_id IS NOT NULL OR o.',t.lodx_label,'_implicit_rep_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'building_furniture', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -2058,17 +2113,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT 
-		sg.cityobject_id::bigint AS co_id,
-		st_collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.building_furniture AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o.id AND o.objectclass_id = ',s.class_id,' ',sql_where,')
 		INNER JOIN ',qi_cdb_schema,'.room AS r ON (r.id = o.room_id)
 		INNER JOIN ',qi_cdb_schema,'.building AS b ON (b.id = r.building_id AND b.objectclass_id = ',r.class_id,')
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_label,'_brep_id AND sg.geometry IS NOT NULL)
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_label,'_brep_id)
 	WHERE
 		o.',t.lodx_label,'_brep_id IS NOT NULL
-	GROUP BY sg.cityobject_id
+	GROUP BY sg.co_id
 	UNION');
 sql_layer := concat(sql_layer,'	
 	SELECT
@@ -2103,10 +2158,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_brep_id IS NULL AND o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -2146,6 +2200,25 @@ END LOOP;  -- building
 IF sql_ins IS NOT NULL THEN
 	sql_ins := concat(sql_upd, substr(sql_ins,1, length(sql_ins)-1), ';');
 END IF;
+-- Create the shared mat view of the root geometries first, only if any gview selects from it
+IF position(concat(qi_usr_schema,'.',qi_rg_name) IN sql_layer) > 0 THEN
+	sql_layer := concat(qgis_pkg.generate_sql_root_geom_cache(qi_usr_name, qi_usr_schema, qi_cdb_schema, qi_rg_name,
+		ARRAY['building', 'thematic_surface', 'building_installation', 'opening', 'room', 'building_furniture'],
+		ARRAY[['building', 'id', 'building_parent_id'],
+		      ['room', 'id', 'building_id'],
+		      ['building_installation', 'id', 'building_id'],
+		      ['building_installation', 'id', 'room_id'],
+		      ['building_furniture', 'id', 'room_id'],
+		      ['thematic_surface', 'id', 'building_id'],
+		      ['thematic_surface', 'id', 'room_id'],
+		      ['thematic_surface', 'id', 'building_installation_id'],
+		      ['opening_to_them_surface', 'opening_id', 'thematic_surface_id']],
+		sql_where,
+		perform_snapping, digits, area_poly_min, srid), sql_layer);
+ELSE
+	sql_layer := concat('
+SELECT qgis_pkg.drop_gview(',quote_literal(usr_schema),', ',quote_literal(rg_name),');', sql_layer);
+END IF;
 -- create the final sql statement
 sql_statement := concat(sql_layer, sql_trig, sql_ins);
 
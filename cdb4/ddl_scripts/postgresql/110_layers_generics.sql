@@ -72,6 +72,7 @@ qml_3d_name 	varchar := NULL;
 trig_f_suffix   varchar := NULL;
 r RECORD; s RECORD; t RECORD; u RECORD;
 sql_feat_count	text := NULL;
+col_stats		jsonb := NULL;
 sql_where 		text := NULL;
 sql_upd			text := NULL;
 sql_ins			text := NULL;
@@ -139,6 +140,7 @@ ql_usr_schema := quote_literal(usr_schema);
 --(cdb_schema, layer_type, feature_type, root_class, class, lod, layer_name, av_name, gv_name, n_features, creation_date, qml_form, qml_symb, qml_3d)
 --VALUES');
 sql_upd := concat('
+SELECT pg_advisory_xact_lock(''',qi_usr_schema,'.layer_metadata''::regclass::oid::bigint); -- Serialize metadata writes of layers created concurrently
 DELETE FROM ',qi_usr_schema,'.layer_metadata AS l WHERE l.cdb_schema = ',ql_cdb_schema,' AND l.layer_type = ',ql_l_type,' AND l.feature_type = ',ql_feature_type,';
 INSERT INTO ',qi_usr_schema,'.layer_metadata 
 (cdb_schema, layer_type, feature_type, root_class, class, lod, layer_name, gv_name, n_features, creation_date, qml_form, qml_symb, qml_3d, enum_cols, codelist_cols)
@@ -154,6 +156,10 @@ ELSE
 	sql_where := concat('AND ST_MakeEnvelope(',ST_XMin(mview_bbox),',',ST_YMin(mview_bbox),',',ST_XMax(mview_bbox),',',ST_YMax(mview_bbox),',',srid,') && co.envelope');
 END IF;
 
+-- Statistics pre-pass: count the non-empty geometry columns of all involved tables, one scan per table.
+-- They are used to skip the feature count of the layers that would be empty anyway.
+col_stats := qgis_pkg.geometry_column_counter(cdb_schema, ARRAY['generic_cityobject'], mview_bbox);
+
 RAISE NOTICE 'For module "%" and user "%": creating layers in usr_schema "%" for cdb_schema "%"', feature_type, qi_usr_name, qi_usr_schema, qi_cdb_schema;
 
 sql_layer := NULL; sql_ins := NULL; sql_trig := NULL;
@@ -190,7 +196,11 @@ sql_feat_count := concat('
 	WHERE
 		o.',t.lodx_label,'_terrain_intersection IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'generic_cityobject', ARRAY[concat(t.lodx_label,'_terrain_intersection')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % (tic)', num_features, r.class_name, t.lodx_name;
 
@@ -219,10 +229,9 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		',qi_cdb_schema,'.generic_cityobject AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',r.class_id,' ',sql_where,')	
 	WHERE
-		o.',t.lodx_label,'_terrain_intersection IS NOT NULL
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		o.',t.lodx_label,'_terrain_intersection IS NOT NULL;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -284,7 +293,12 @@ FROM (
 		o.',t.lodx_label,'_implicit_rep_id IS NOT NULL AND o.',t.lodx_label,'_brep_id IS NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'generic_cityobject', ARRAY[concat(t.lodx_label,'_brep_id')], r.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'generic_cityobject', ARRAY[concat(t.lodx_label,'_implicit_rep_id')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % %', num_features, r.class_name, t.lodx_name;
 
@@ -348,10 +362,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_implicit_rep_id IS NOT NULL AND o.',t.lodx_label,'_brep_id IS NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
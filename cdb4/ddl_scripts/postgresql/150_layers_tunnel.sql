@@ -66,12 +66,14 @@ qi_usr_name varchar; ql_usr_name varchar;
 l_name varchar; ql_l_name varchar; qi_l_name varchar;
 --av_name varchar; ql_av_name varchar; qi_av_name varchar;
 gv_name varchar; qi_gv_name varchar; ql_gv_name varchar;
+rg_name varchar; qi_rg_name varchar;
 qml_form_name 	varchar := NULL;
 qml_symb_name 	varchar := NULL;
 qml_3d_name 	varchar := NULL;
 trig_f_suffix   varchar := NULL;
 r RECORD; s RECORD; t RECORD; u RECORD;
 sql_feat_count	text := NULL;
+col_stats		jsonb := NULL;
 sql_where 		text := NULL;
 sql_upd			text := NULL;
 sql_ins			text := NULL;
@@ -131,9 +133,13 @@ qi_usr_name   := quote_ident(usr_name);
 ql_usr_name   := quote_literal(usr_name);
 qi_usr_schema := quote_ident(usr_schema);
 ql_usr_schema := quote_literal(usr_schema);
+-- Materialized view of the collected geometries of each root, shared by the gviews of the module
+rg_name       := concat('_rg_',cdb_schema,'_tun');
+qi_rg_name    := quote_ident(rg_name);
 
 -- Prepare fixed part of SQL statements
 sql_upd := concat('
+SELECT pg_advisory_xact_lock(''',qi_usr_schema,'.layer_metadata''::regclass::oid::bigint); -- Serialize metadata writes of layers created concurrently
 DELETE FROM ',qi_usr_schema,'.layer_metadata AS l WHERE l.cdb_schema = ',ql_cdb_schema,' AND l.layer_type = ',ql_l_type,' AND l.feature_type = ',ql_feature_type,';
 INSERT INTO ',qi_usr_schema,'.layer_metadata 
 (cdb_schema, layer_type, feature_type, root_class, class, lod, layer_name, gv_name, n_features, creation_date, qml_form, qml_symb, qml_3d, enum_cols, codelist_cols)
@@ -149,6 +155,10 @@ ELSE
 	sql_where := concat('AND ST_MakeEnvelope(',ST_XMin(mview_bbox),',',ST_YMin(mview_bbox),',',ST_XMax(mview_bbox),',',ST_YMax(mview_bbox),',',srid,') && co.envelope');
 END IF;
 
+-- Statistics pre-pass: count the non-empty geometry columns of all involved tables, one scan per table.
+-- They are used to skip the feature count of the layers that would be empty anyway.
+col_stats := qgis_pkg.geometry_column_counter(cdb_schema, ARRAY['tunnel', 'tunnel_thematic_surface', 'tunnel_installation', 'tunnel_opening', 'tunnel_hollow_space', 'tunnel_furniture'], mview_bbox);
+
 RAISE NOTICE 'For module "%" and user "%": creating layers in usr_schema "%" for cdb_schema "%"', feature_type, qi_usr_name, qi_usr_schema, qi_cdb_schema;
 
 sql_layer := NULL; sql_ins := NULL; sql_trig := NULL;
@@ -187,7 +197,11 @@ sql_feat_count := concat('
 	WHERE
 		o.',t.lodx_label,'_terrain_intersection IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel', ARRAY[concat(t.lodx_label,'_terrain_intersection')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % (tic)', num_features, r.class_name, t.lodx_name;
 
@@ -216,10 +230,9 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		',qi_cdb_schema,'.tunnel AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',r.class_id,' ',sql_where,')	
 	WHERE
-		o.',t.lodx_label,'_terrain_intersection IS NOT NULL
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		o.',t.lodx_label,'_terrain_intersection IS NOT NULL;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -279,7 +292,11 @@ sql_feat_count := concat('
 	WHERE
 		o.',t.lodx_label,'_multi_curve IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel', ARRAY[concat(t.lodx_label,'_multi_curve')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % (multi_curve)', num_features, r.class_name, t.lodx_name;
 
@@ -308,10 +325,9 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		',qi_cdb_schema,'.tunnel AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',r.class_id,' ',sql_where,')	
 	WHERE
-		o.',t.lodx_label,'_multi_curve IS NOT NULL
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		o.',t.lodx_label,'_multi_curve IS NOT NULL;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -369,7 +385,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL OR o.',t.lodx_label,'_solid_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_solid_id')], r.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % %', num_features, r.class_name, t.lodx_name;
 
@@ -393,8 +413,8 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM (
 		SELECT
 			o.id AS co_id, 	
@@ -408,11 +428,10 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 		WHERE			
 			o.',t.lodx_label,'_solid_id IS NOT NULL OR o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 		) AS foo
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo.sg_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo.sg_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -483,7 +502,12 @@ FROM (
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_solid_id')], r.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'tunnel_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')]) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % %', num_features, r.class_name, t.lodx_name;
 
@@ -507,7 +531,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
 		foo2.co_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM (
 		SELECT
 			foo.co_id,
@@ -535,11 +559,10 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 					) AS ts_t ON (ts_t.co_id = o.id)
 			) AS foo
 		) AS foo2
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
-	GROUP BY foo2.co_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
+	GROUP BY foo2.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of ',r.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -600,7 +623,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for % % %', num_features, r.class_name, t.lodx_name, u.class_name;
 
@@ -623,17 +650,16 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.tunnel_thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,')		
 		INNER JOIN ',qi_cdb_schema,'.tunnel AS b ON (o.tunnel_id = b.id AND b.objectclass_id = ',r.class_id,')
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -705,7 +731,12 @@ FROM (
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel_installation', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'tunnel_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')]) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -729,7 +760,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT 
 		foo2.co_id AS co_id,
-		st_collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM ( 
 			SELECT 
 				foo.co_id,
@@ -761,7 +792,7 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 						o.',t.lodx_label,'_implicit_rep_id IS NULL
 				) AS foo
 	   ) AS foo2
-	INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
+	INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
 	GROUP BY foo2.co_id
 	UNION');
 -- the need to split is due to max 100 arguments allowed in the concat function.
@@ -797,10 +828,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -857,7 +887,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_name;
 
@@ -880,18 +914,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ,',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.tunnel_thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,') 
 		INNER JOIN ',qi_cdb_schema,'.tunnel_installation AS bi ON (o.tunnel_installation_id = bi.id AND bi.objectclass_id = ',s.class_id,')
 		INNER JOIN ',qi_cdb_schema,'.tunnel AS b ON (o.tunnel_id = b.id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -954,7 +987,11 @@ sql_feat_count := concat('
 	WHERE
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL OR o.',t.lodx_label,'_implicit_rep_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel_opening', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -982,18 +1019,18 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ,',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.tunnel_opening AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',s.class_id,' ',sql_where,')
 		INNER JOIN ',qi_cdb_schema,'.tunnel_open_to_them_srf AS ots ON (ots.tunnel_opening_id = o.id)
 		INNER JOIN ',qi_cdb_schema,'.tunnel_thematic_surface AS ts ON (ts.id = ots.tunnel_thematic_surface_id)
 		INNER JOIN ',qi_cdb_schema,'.tunnel AS b ON (b.id = ts.tunnel_id AND b.objectclass_id = ',r.class_id,')
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry sg ON sg.root_id = o.',t.lodx_name,'_multi_surface_id  AND sg.geometry IS NOT NULL
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
 	WHERE
 		o.',t.lodx_name,'_implicit_rep_id IS NULL
-	GROUP BY sg.cityobject_id
+	GROUP BY sg.co_id
 	UNION');
 -- the need to split is due to max 100 arguments allowed in the concat function.
 sql_layer := concat(sql_layer,'
@@ -1030,10 +1067,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_name,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1093,7 +1129,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL OR o.',t.lodx_label,'_solid_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel_hollow_space', ARRAY[concat(t.lodx_label,'_multi_surface_id'), concat(t.lodx_label,'_solid_id')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1117,7 +1157,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
 		foo2.co_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom	
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom	
 	FROM (
 		SELECT
 			foo.co_id,
@@ -1145,11 +1185,10 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 					) AS ts_t ON (ts_t.co_id = o.id)
 			) AS foo
 		) AS foo2
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
-	GROUP BY foo2.co_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
+	GROUP BY foo2.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1203,7 +1242,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_label;
 
@@ -1226,18 +1269,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.tunnel_thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,') 
 		INNER JOIN ',qi_cdb_schema,'.tunnel_hollow_space AS r ON (r.id = o.tunnel_hollow_space_id AND r.objectclass_id = ',s.class_id,')
 		INNER JOIN ',qi_cdb_schema,'.tunnel AS b ON (b.id = r.tunnel_id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id  AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1310,7 +1352,12 @@ FROM (
 		o.',t.lodx_label,'_multi_surface_id IS NOT NULL
 ) AS foo;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel_installation', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id)
+	OR qgis_pkg.geometry_column_checker(col_stats, 'tunnel_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')]) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1334,7 +1381,7 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT 
 		foo2.co_id AS co_id,
-		st_collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM ( 
 			SELECT 
 				foo.co_id,
@@ -1366,7 +1413,7 @@ sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schem
 						o.',t.lodx_label,'_implicit_rep_id IS NULL
 				) AS foo
 	   ) AS foo2
-	INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = foo2.sg_id AND sg.geometry IS NOT NULL)
+	INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = foo2.sg_id)
 	GROUP BY foo2.co_id
 	UNION');
 -- the need to split is due to max 100 arguments allowed in the concat function.
@@ -1402,10 +1449,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1465,7 +1511,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_multi_surface_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel_thematic_surface', ARRAY[concat(t.lodx_label,'_multi_surface_id')], u.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % % %', num_features, r.class_name, s.class_name, t.lodx_name, u.class_name;
 
@@ -1488,18 +1538,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT
-		sg.cityobject_id::bigint AS co_id,
-		ST_Collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ,',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.tunnel_thematic_surface AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (o.id = co.id AND o.objectclass_id = ',u.class_id,' ',sql_where,') 
 		INNER JOIN ',qi_cdb_schema,'.tunnel_installation AS bi ON (o.tunnel_installation_id = bi.id AND bi.objectclass_id = ',s.class_id,')
 		INNER JOIN ',qi_cdb_schema,'.tunnel AS b ON (o.tunnel_id = b.id AND b.objectclass_id = ',r.class_id,')		
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id  AND sg.geometry IS NOT NULL)
-	GROUP BY sg.cityobject_id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_name,'_multi_surface_id)
+	GROUP BY sg.co_id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' ',u.class_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1559,7 +1608,11 @@ FROM
 WHERE
 	o.',t.lodx_label,'_brep_id IS NOT NULL OR o.',t.lodx_label,'_implicit_rep_id IS NOT NULL;
 ');
-EXECUTE sql_feat_count INTO num_features;
+IF qgis_pkg.geometry_column_checker(col_stats, 'tunnel_furniture', ARRAY[concat(t.lodx_label,'_brep_id'), concat(t.lodx_label,'_implicit_rep_id')], s.class_id) THEN
+	EXECUTE sql_feat_count INTO num_features;
+ELSE
+	num_features := 0; -- No candidate geometries according to the statistics pre-pass
+END IF;
 
 RAISE NOTICE 'Found % features for (%) % %', num_features, r.class_name, s.class_name, t.lodx_name;
 
@@ -1582,17 +1635,17 @@ IF (num_features > 0) OR (force_layer_creation IS TRUE) THEN
 --------------------
 sql_layer := concat(sql_layer, qgis_pkg.generate_sql_matview_header(qi_usr_schema,qi_gv_name),'
 	SELECT 
-		sg.cityobject_id::bigint AS co_id,
-		st_collect(qgis_pkg.ST_snap_poly_to_grid(sg.geometry,',perform_snapping,',',digits,',',area_poly_min,'))::geometry(MultiPolygonZ, ',srid,') AS geom
+		sg.co_id AS co_id,
+		ST_CollectionExtract(ST_Collect(sg.geom), 3)::geometry(MultiPolygonZ, ',srid,') AS geom
 	FROM
 		',qi_cdb_schema,'.tunnel_furniture AS o
 		INNER JOIN ',qi_cdb_schema,'.cityobject AS co ON (co.id = o.id AND o.objectclass_id = ',s.class_id,' ',sql_where,')
 		INNER JOIN ',qi_cdb_schema,'.tunnel_hollow_space AS r ON (r.id = o.tunnel_hollow_space_id)
 		INNER JOIN ',qi_cdb_schema,'.tunnel AS b ON (b.id = r.tunnel_id AND b.objectclass_id = ',r.class_id,')
-		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = o.',t.lodx_label,'_brep_id AND sg.geometry IS NOT NULL)
+		INNER JOIN ',qi_usr_schema,'.',qi_rg_name,' AS sg ON (sg.root_id = o.',t.lodx_label,'_brep_id)
 	WHERE
 		o.',t.lodx_label,'_brep_id IS NOT NULL
-	GROUP BY sg.cityobject_id
+	GROUP BY sg.co_id
 	UNION');
 -- the need to split is due to max 100 arguments allowed in the concat function.
 sql_layer := concat(sql_layer,'	
@@ -1628,10 +1681,9 @@ sql_layer := concat(sql_layer,'
 		INNER JOIN ',qi_cdb_schema,'.surface_geometry AS sg ON (sg.root_id = ig.relative_brep_id AND sg.implicit_geometry IS NOT NULL)
 	WHERE
 		o.',t.lodx_label,'_brep_id IS NULL AND o.',t.lodx_label,'_implicit_rep_id IS NOT NULL
-	GROUP BY o.id
-WITH NO DATA;
-COMMENT ON MATERIALIZED VIEW ',qi_usr_schema,'.',qi_gv_name,' IS ''Mat. view of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
-',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name));
+	GROUP BY o.id;
+',qgis_pkg.generate_sql_matview_footer(qi_usr_name, qi_usr_schema, ql_l_name, qi_gv_name),'COMMENT ON TABLE ',qi_usr_schema,'.',qi_gv_name,' IS ''Gview of (',r.class_name,') ',s.class_name,' ',t.lodx_name,' in schema ',qi_cdb_schema,''';
+');
 
 -------
 --  VIEW (for atts + geom)
@@ -1671,6 +1723,25 @@ END LOOP;  -- tunnel
 IF sql_ins IS NOT NULL THEN
 	sql_ins := concat(sql_upd, substr(sql_ins,1, length(sql_ins)-1), ';');
 END IF;
+-- Create the shared mat view of the root geometries first, only if any gview selects from it
+IF position(concat(qi_usr_schema,'.',qi_rg_name) IN sql_layer) > 0 THEN
+	sql_layer := concat(qgis_pkg.generate_sql_root_geom_cache(qi_usr_name, qi_usr_schema, qi_cdb_schema, qi_rg_name,
+		ARRAY['tunnel', 'tunnel_thematic_surface', 'tunnel_installation', 'tunnel_opening', 'tunnel_hollow_space', 'tunnel_furniture'],
+		ARRAY[['tunnel', 'id', 'tunnel_parent_id'],
+		      ['tunnel_hollow_space', 'id', 'tunnel_id'],
+		      ['tunnel_installation', 'id', 'tunnel_id'],
+		      ['tunnel_installation', 'id', 'tunnel_hollow_space_id'],
+		      ['tunnel_furniture', 'id', 'tunnel_hollow_space_id'],
+		      ['tunnel_thematic_surface', 'id', 'tunnel_id'],
+		      ['tunnel_thematic_surface', 'id', 'tunnel_hollow_space_id'],
+		      ['tunnel_thematic_surface', 'id', 'tunnel_installation_id'],
+		      ['tunnel_open_to_them_srf', 'tunnel_opening_id', 'tunnel_thematic_surface_id']],
+		sql_where,
+		perform_snapping, digits, area_poly_min, srid), sql_layer);
+ELSE
+	sql_layer := concat('
+SELECT qgis_pkg.drop_gview(',quote_literal(usr_schema),', ',quote_literal(rg_name),');', sql_layer);
+END IF;
 -- create the final sql statement
 sql_statement := concat(sql_layer, sql_trig, sql_ins);
 
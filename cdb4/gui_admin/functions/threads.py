@@ -177,9 +177,10 @@ class QgisPackageInstallWorker(QObject):
 
         curr_step: int = 0
 
+        temp_conn = None
         try:
             # Open new temp session, reserved for installation.
-            temp_conn = conn_f.open_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(QGIS Package Installation)"]))
+            temp_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(QGIS Package Installation)"]))
             with temp_conn:
 
                 # Start measuring time
@@ -310,8 +311,8 @@ class QgisPackageInstallWorker(QObject):
             self.sig_success.emit()
 
         self.sig_finished.emit()
-        # Close connection
-        temp_conn.close()
+        # Give connection back to the pool
+        conn_f.release_db_connection(conn=temp_conn)
         return None
 
 #--EVENTS  (start)  ##############################################################
@@ -561,8 +562,9 @@ class QgisPackageUninstallWorker(QObject):
 
         curr_step: int = 0
 
+        temp_conn = None
         try:
-            temp_conn = conn_f.open_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(QGIS Package Uninstallation)"]))
+            temp_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(QGIS Package Uninstallation)"]))
             with temp_conn:
 
                 # 1) revoke privileges: for all users
@@ -711,7 +713,7 @@ class QgisPackageUninstallWorker(QObject):
 
         self.sig_finished.emit()
         # Close temp connection
-        temp_conn.close()
+        conn_f.release_db_connection(conn=temp_conn)
         return None
 
 
@@ -786,9 +788,10 @@ class QgisPackageUninstallWorker(QObject):
 
         curr_step: int = 0
 
+        temp_conn = None
         try:
             # Open new temp session, reserved for installation.
-            temp_conn = conn_f.open_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(QGIS Package Uninstallation)"]))
+            temp_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(QGIS Package Uninstallation)"]))
             with temp_conn:
 
                 # 1) revoke privileges: for all normal users
@@ -1001,7 +1004,7 @@ class QgisPackageUninstallWorker(QObject):
 
         self.sig_finished.emit()
         # Close temp connection
-        temp_conn.close()
+        conn_f.release_db_connection(conn=temp_conn)
         return None
 
 
@@ -1107,10 +1110,10 @@ class QgisPackageUninstallWorker(QObject):
 
         curr_step: int = 0
 
-        temp_conn: pyconn
+        temp_conn: pyconn = None
         try:
             # Open new temp session, reserved for installation.
-            temp_conn = conn_f.open_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(QGIS Package Uninstallation)"]))
+            temp_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(QGIS Package Uninstallation)"]))
             with temp_conn:
                 # Start measuring time
                 time_start = time.time()
@@ -1400,7 +1403,7 @@ class QgisPackageUninstallWorker(QObject):
 
         self.sig_finished.emit()
         # Close temp connection
-        temp_conn.close()
+        conn_f.release_db_connection(conn=temp_conn)
         return None
 
 
@@ -1586,9 +1589,10 @@ class DropUsrSchemaWorker(QObject):
 
         curr_step: int = 0
 
+        temp_conn = None
         try:
             # Open new temp session, reserved for usr_schema installation.
-            temp_conn = conn_f.open_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(User schema Uninstallation)"]))
+            temp_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(User schema Uninstallation)"]))
             with temp_conn:
 
                 # Start measuring time
@@ -1752,7 +1756,7 @@ class DropUsrSchemaWorker(QObject):
 
         self.sig_finished.emit()
         # Close temp connection
-        temp_conn.close()
+        conn_f.release_db_connection(conn=temp_conn)
         return None
 
 #--EVENTS  (start)  ##############################################################
@@ -14,7 +14,7 @@ from qgis.PyQt.QtWidgets import QMessageBox, QPushButton
 
 from .... import cdb_tools_main_constants as main_c
 from ...shared.functions import general_functions as gen_f
-from ..other_classes import DBConnectionInfo
+from ..other_classes import DBConnectionInfo, DBConnectionPool
 
 FILE_LOCATION = gen_f.get_file_relative_path(file=__file__)
 
@@ -51,6 +51,41 @@ def open_db_connection(db_connection: DBConnectionInfo, app_name: str = main_c.P
             error=error)
 
 
+# Plugin-wide pool of database connections used by the workers
+CONN_POOL = DBConnectionPool(connect=open_db_connection)
+
+
+def borrow_db_connection(db_connection: DBConnectionInfo, app_name: str = main_c.PLUGIN_NAME_LABEL) -> pyconn:
+    """Borrows a connection from the plugin-wide pool (a new one is opened if none is available).
+    The connection must be given back using release_db_connection() instead of being closed.
+
+    *   :param db_connection: The connection custom object
+        :rtype: DBConnectionInfo
+ 
+    *   :param app_name: A name for the session
+        :rtype: str
+
+    *   :returns: The connection psycopg2 object (opened), or None if it could not be opened
+        :rtype: psycopg2.extensions.connection
+    """
+    return CONN_POOL.borrow(db_connection=db_connection, app_name=app_name)
+
+
+def release_db_connection(conn: pyconn) -> None:
+    """Gives a connection borrowed with borrow_db_connection() back to the plugin-wide pool.
+    """
+    CONN_POOL.release(conn=conn)
+    return None
+
+
+def close_db_connection_pool() -> None:
+    """Closes all idle connections of the plugin-wide pool (e.g. when the plugin is unloaded).
+    The pool is reset, not disabled: connections can be borrowed again afterwards (e.g. after a plugin reload).
+    """
+    CONN_POOL.shut_down()
+    return None
+
+
 def get_posgresql_server_version(dlg: Union[CDB4LoaderDialog, CDB4DeleterDialog, CDB4AdminDialog]) -> str:
     """SQL query that reads and retrieves the server version.
 
@@ -1,3 +1,13 @@
+from __future__ import annotations
+from typing import Callable, Optional
+
+import time
+import threading
+import psycopg2
+from psycopg2.extensions import connection as pyconn
+
+from ... import cdb_tools_main_constants as main_c
+
 class DBConnectionInfo:
     """Class to store connection information.
     """
@@ -36,3 +46,111 @@ class DBConnectionInfo:
             f"db_toc_node_label: {self.db_toc_node_label}\n" + \
             f"Store credentials?: {self.store_creds}\n"
         return return_str
+
+
+class DBConnectionPool:
+    """Class to store the plugin-wide pool of database connections.
+    Workers borrow connections from it, instead of opening (and closing) a new connection each time.
+
+    Idle connections are pooled per database (host, port, database name, username).
+    Before a connection is lent again, its application name is set, which also checks that it is still alive.
+    Returned connections are reset (rollback, DISCARD ALL), and closed if the pool is full or if they were
+    borrowed before the pool was shut down. Connections are only opened on demand: min_idle and max_idle
+    bound the number of idle connections that are kept, not the number of open ones.
+    """
+    def __init__(self,
+                connect: Callable[[DBConnectionInfo, str], Optional[pyconn]],
+                min_idle: int = main_c.CONN_POOL_MIN_IDLE,
+                max_idle: int = main_c.CONN_POOL_MAX_IDLE,
+                max_idle_time: int = main_c.CONN_POOL_MAX_IDLE_TIME):
+        self.connect = connect # Function opening a new connection
+        self.min_idle = min_idle
+        self.max_idle = max_idle
+        self.max_idle_time = max_idle_time
+        self.lock = threading.Lock()
+        self.idle_conns: dict[tuple, list[tuple[pyconn, float]]] = {} # key -> [(connection, time it was returned)]
+        self.borrowed_conns: dict[int, tuple] = {} # id(connection) -> key
+
+    @staticmethod
+    def make_key(db_connection: DBConnectionInfo) -> tuple:
+        return (db_connection.host, str(db_connection.port), db_connection.database_name, db_connection.username)
+
+    def borrow(self, db_connection: DBConnectionInfo, app_name: str) -> Optional[pyconn]:
+        """Returns an idle connection to the database, or a new one if none is available (None if it fails).
+        """
+        key = self.make_key(db_connection)
+        while True:
+            with self.lock:
+                idle_list = self.idle_conns.get(key)
+                conn = idle_list.pop()[0] if idle_list else None
+            if conn is None:
+                conn = self.connect(db_connection, app_name)
+                break
+            try:
+                # Tag the session, which is also a health check
+                with conn.cursor() as cur:
+                    cur.execute("SET application_name TO %s;", (app_name,))
+                conn.commit()
+                break
+            except (Exception, psycopg2.Error):
+                conn.close() # Dead connection: discard it, and try the next one
+
+        if conn:
+            with self.lock:
+                self.borrowed_conns[id(conn)] = key
+        return conn
+
+    def release(self, conn: Optional[pyconn]) -> None:
+        """Gives a borrowed connection back to the pool.
+        """
+        if conn is None:
+            return None
+        with self.lock:
+            key = self.borrowed_conns.pop(id(conn), None)
+
+        if conn.closed == 0:
+            try:
+                conn.rollback()
+                # Discard the whole session state (parameters, WITH HOLD cursors, temp tables, prepared statements,
+                # advisory locks, ...), which rollback() and RESET ALL alone would leave to the next borrower.
+                # DISCARD ALL cannot run inside a transaction block.
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute("DISCARD ALL;")
+                conn.autocommit = False
+            except (Exception, psycopg2.Error):
+                conn.close()
+
+        now = time.monotonic()
+        to_close: list[pyconn] = []
+        with self.lock:
+            if key is None or conn.closed != 0:
+                to_close.append(conn)
+            else:
+                idle_list = self.idle_conns.setdefault(key, [])
+                if len(idle_list) < self.max_idle:
+                    idle_list.append((conn, now))
+                else:
+                    to_close.append(conn)
+            # Close the connections that have been idle for too long, but keep the most recent min_idle ones
+            for idle_list in self.idle_conns.values():
+                while len(idle_list) > self.min_idle and now - idle_list[0][1] > self.max_idle_time:
+                    to_close.append(idle_list.pop(0)[0])
+
+        for c in to_close:
+            if c.closed == 0:
+                c.close()
+        return None
+
+    def shut_down(self) -> None:
+        """Closes all idle connections. Connections borrowed at this time will be closed when released.
+        The pool is left empty but usable, e.g. by the plugin when it is loaded again in the same QGIS session.
+        """
+        with self.lock:
+            self.borrowed_conns.clear() # Their key is not found when they are released, so they are closed
+            to_close = [c for idle_list in self.idle_conns.values() for c, _ in idle_list]
+            self.idle_conns.clear()
+        for c in to_close:
+            if c.closed == 0:
+                c.close()
+        return None
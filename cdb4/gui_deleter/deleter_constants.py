@@ -7,7 +7,7 @@ from qgis.PyQt.QtCore import Qt
 # QGIS Package minimum version
 QGIS_PKG_MIN_VERSION_MAJOR: int = 0
 QGIS_PKG_MIN_VERSION_MINOR: int = 10
-QGIS_PKG_MIN_VERSION_MINOR_REV: int = 4
+QGIS_PKG_MIN_VERSION_MINOR_REV: int = 5
 QGIS_PKG_MIN_VERSION_TXT: str = ".".join([str(QGIS_PKG_MIN_VERSION_MAJOR), str(QGIS_PKG_MIN_VERSION_MINOR), str(QGIS_PKG_MIN_VERSION_MINOR_REV)])
 
 # Check more here: https://doc.qt.io/qt-5/qt.html#GlobalColor-enum
@@ -36,6 +36,57 @@ SCHEMA_LAYER_MSG: str = "Layers for schema '{sch}' already exist"
 TRUNC_SUCC_MSG: str = "Clean-up of schema {sch} successful"
 TRUNC_FAIL_MSG: str = "Error while cleaning up schema {sch}"
 
+# Bounds of the number of features deleted at a time by the bulk delete (adapted to the duration of each batch)
+DEL_BATCH_SIZE_MIN: int = 10
+DEL_BATCH_SIZE_MAX: int = 100000
+# Top-level features whose delete functions may touch the same dependent rows (the addresses of buildings,
+# bridges and tunnels; the implicit geometries and surface data shared by their installations, the city furniture,
+# the generic city objects and the solitary vegetation objects): they are never deleted at the same time.
+DEL_SHARED_ROWS_TLFS: tuple = ("Building", "Bridge", "Tunnel", "CityFurniture", "GenericCityObject", "SolitaryVegetationObject")
+# Number of times a batch is retried, if it was aborted by a deadlock with another worker
+DEL_DEADLOCK_RETRIES: int = 3
+# Number of top-level features per class whose hierarchy is measured to estimate the share of the schema to delete
+DEL_ESTIMATE_SAMPLE_SIZE: int = 100
+# Max duration (in milliseconds) of the estimate, which runs before the confirmation dialog: if exceeded, no fast purge
+DEL_ESTIMATE_TIMEOUT: int = 2000
+# Links from the child features to their parent feature (table, child id column, parent id column),
+# used to walk down the hierarchy of the deleted top-level features (their parts, thematic surfaces, openings, etc.)
+DEL_HIERARCHY_LINKS: tuple = (
+    ("building"                , "id"                       , "building_parent_id"),
+    ("room"                    , "id"                       , "building_id"),
+    ("building_installation"   , "id"                       , "building_id"),
+    ("building_installation"   , "id"                       , "room_id"),
+    ("building_furniture"      , "id"                       , "room_id"),
+    ("thematic_surface"        , "id"                       , "building_id"),
+    ("thematic_surface"        , "id"                       , "room_id"),
+    ("thematic_surface"        , "id"                       , "building_installation_id"),
+    ("opening_to_them_surface" , "opening_id"               , "thematic_surface_id"),
+    ("bridge"                  , "id"                       , "bridge_parent_id"),
+    ("bridge_room"             , "id"                       , "bridge_id"),
+    ("bridge_installation"     , "id"                       , "bridge_id"),
+    ("bridge_installation"     , "id"                       , "bridge_room_id"),
+    ("bridge_constr_element"   , "id"                       , "bridge_id"),
+    ("bridge_furniture"        , "id"                       , "bridge_room_id"),
+    ("bridge_thematic_surface" , "id"                       , "bridge_id"),
+    ("bridge_thematic_surface" , "id"                       , "bridge_room_id"),
+    ("bridge_thematic_surface" , "id"                       , "bridge_installation_id"),
+    ("bridge_thematic_surface" , "id"                       , "bridge_constr_element_id"),
+    ("bridge_open_to_them_srf" , "bridge_opening_id"        , "bridge_thematic_surface_id"),
+    ("tunnel"                  , "id"                       , "tunnel_parent_id"),
+    ("tunnel_hollow_space"     , "id"                       , "tunnel_id"),
+    ("tunnel_installation"     , "id"                       , "tunnel_id"),
+    ("tunnel_installation"     , "id"                       , "tunnel_hollow_space_id"),
+    ("tunnel_furniture"        , "id"                       , "tunnel_hollow_space_id"),
+    ("tunnel_thematic_surface" , "id"                       , "tunnel_id"),
+    ("tunnel_thematic_surface" , "id"                       , "tunnel_hollow_space_id"),
+    ("tunnel_thematic_surface" , "id"                       , "tunnel_installation_id"),
+    ("tunnel_open_to_them_srf" , "tunnel_opening_id"        , "tunnel_thematic_surface_id"),
+    ("traffic_area"            , "id"                       , "transportation_complex_id"),
+    ("auxiliary_traffic_area"  , "id"                       , "transportation_complex_id"),
+    ("waterbod_to_waterbnd_srf", "waterboundary_surface_id" , "waterbody_id"),
+    ("relief_feat_to_rel_comp" , "relief_component_id"      , "relief_feature_id")
+    )
+
 BULK_DEL_SUCC_MSG: str = "Bulk delete operation in schema {sch} successful"
 BULK_DEL_FAIL_MSG: str = "Error while bulk deleting from schema {sch}"
 
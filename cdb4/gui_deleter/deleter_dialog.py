@@ -30,7 +30,7 @@
  ***************************************************************************/
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 if TYPE_CHECKING:
      from ...cdb_tools_main import CDBToolsMain
      from ..gui_db_connector.other_classes import DBConnectionInfo
@@ -38,7 +38,8 @@ if TYPE_CHECKING:
 import os
 from psycopg2.extensions import connection as pyconn
 
-from qgis.core import Qgis, QgsMessageLog, QgsRectangle, QgsGeometry, QgsWkbTypes, QgsCoordinateReferenceSystem
+from qgis.core import (Qgis, QgsMessageLog, QgsRectangle, QgsGeometry, QgsWkbTypes, QgsCoordinateReferenceSystem,
+                        QgsVectorLayer, QgsDataSourceUri, QgsFeatureRequest)
 from qgis.gui import QgsRubberBand, QgsMapCanvas, QgsMessageBar
 
 from qgis.PyQt import uic
@@ -211,6 +212,7 @@ class CDB4DeleterDialog(QDialog, FORM_CLASS):
         self.ckbTopLevelClassAll.toggled.connect(self.evt_ckbTopLevelClassAll_toggled)
 
         self.btnDelSelFeatures.clicked.connect(self.evt_btnDelSelFeatures_clicked)
+        self.btnDelLayerSel.clicked.connect(lambda: self.evt_btnDelLayerSel_clicked(cdbMain))
 
         # 'Close connection' group box signals  
         self.btnCloseConn.clicked.connect(self.evt_btnCloseConn_clicked)
@@ -841,6 +843,8 @@ class CDB4DeleterDialog(QDialog, FORM_CLASS):
 
             # Enable the Delete Selected features button
             self.btnDelSelFeatures.setDisabled(False)
+            # Enable the Delete features selected in the active layer button
+            self.btnDelLayerSel.setDisabled(False)
 
         else: # when unchecked, it disables itself automatically
             tc_wf.gbxFeatSel_reset(dlg=self) # it disables itself, I need to reenable it
@@ -1027,7 +1031,26 @@ class CDB4DeleterDialog(QDialog, FORM_CLASS):
             # This case should not happen.
             return None # Exit
 
-        msg1: str = f"Data will be deleted from citydb schema '{self.CDB_SCHEMA}'.<br><br>Do you really want to proceed?"
+        # Estimate in advance whether the fast purge (drop indexes, delete, rebuild indexes) is expected to be faster.
+        # Not needed if the fast purge is disabled (threshold 100%, the default).
+        del_perc: Optional[float] = None
+        if self.sbxFastPurge.value() < 100:
+            if delete_mode == "del_FeatureTypes":
+                sel_fts: list[str] = [k for k, ft in self.FeatureTypesRegistry.items() if ft.is_selected]
+                del_tlfs: list[TopLevelFeature] = [tlf for tlf in self.TopLevelFeaturesRegistry.values() if tlf.feature_type in sel_fts]
+            else:
+                del_tlfs: list[TopLevelFeature] = [tlf for tlf in self.TopLevelFeaturesRegistry.values() if tlf.is_selected]
+            del_perc = sql.get_delete_percentage(dlg=self, tlfs=del_tlfs)
+        is_fast_purge: bool = del_perc is not None and del_perc > self.sbxFastPurge.value()
+
+        if del_perc is None:
+            msg_purge: str = ""
+        elif is_fast_purge:
+            msg_purge: str = f"About {round(del_perc)}% of the schema will be deleted: the fast purge (indexes dropped and rebuilt at the end) is expected to be faster.<br><br>"
+        else:
+            msg_purge: str = f"About {round(del_perc)}% of the schema will be deleted: the row-by-row delete is expected to be faster.<br><br>"
+
+        msg1: str = f"Data will be deleted from citydb schema '{self.CDB_SCHEMA}'.<br><br>{msg_purge}Do you really want to proceed?"
         msg2: str = f"Data will be deleted from citydb schema '{self.CDB_SCHEMA}'.<br><br>Do you REALLY want to proceed?"
         msg3: str = f"Data will be deleted from citydb schema '{self.CDB_SCHEMA}'.<br><br>Do you REALLY REALLY want to proceed?<br><br>If you'll lose data, don't tell we didn't warn you..."
         res = QMessageBox.question(self, "Clean up citydb schema", msg1)
@@ -1039,7 +1062,60 @@ class CDB4DeleterDialog(QDialog, FORM_CLASS):
                     # This thread will also take care of checking what happens after deletion,
                     # e.g. in case that the database is completely emptied.
                     # The user will be eventually informed
-                    thr.run_bulk_delete_thread(dlg=self, delete_mode=delete_mode)
+                    thr.run_bulk_delete_thread(dlg=self, delete_mode=delete_mode, is_fast_purge=is_fast_purge)
+
+        return None
+
+
+    def evt_btnDelLayerSel_clicked(self, cdbMain: CDBToolsMain) -> None:
+        """Event that is called when the 'Delete features selected in the active layer' button (btnDelLayerSel) is pressed.
+        The selected features are deleted with a few calls of the citydb delete functions (one per batch of ids),
+        instead of one trigger call per feature as when deleting them from the layer in QGIS.
+        """
+        layer = cdbMain.iface.activeLayer()
+
+        # Check that the active layer is a layer of the current cdb_schema, as loaded by the Layer Loader
+        is_cdb_layer: bool = False
+        if isinstance(layer, QgsVectorLayer) and layer.providerType() == "postgres":
+            uri = QgsDataSourceUri(layer.source())
+            is_cdb_layer = all((uri.host() == self.DB.host,
+                                uri.port() == str(self.DB.port),
+                                uri.database() == self.DB.database_name,
+                                uri.schema() == self.USR_SCHEMA,
+                                uri.table().startswith("_".join([self.CDB_SCHEMA, ""])),
+                                layer.fields().indexOf("id") != -1))
+        if is_cdb_layer:
+            # The ids of the Address layers are not cityobject ids
+            curr_class: str = sql.get_layer_curr_class(dlg=self, layer_name=uri.table())
+            is_cdb_layer = curr_class is not None and curr_class != "Address"
+
+        if not is_cdb_layer:
+            msg: str = f"The active layer must be a layer of citydb objects of schema '{self.CDB_SCHEMA}', loaded with the Layer Loader."
+            res = QMessageBox.warning(self, "Missing selection", msg)
+            return None # Exit
+
+        if layer.isEditable() and layer.isModified():
+            msg: str = f"Layer '{layer.name()}' has unsaved changes: save or discard them first."
+            res = QMessageBox.warning(self, "Unsaved changes", msg)
+            return None # Exit
+
+        if layer.selectedFeatureCount() == 0:
+            msg: str = f"You must select at least a feature in layer '{layer.name()}'."
+            res = QMessageBox.warning(self, "Missing selection", msg)
+            return None # Exit
+
+        # Collect the ids of the selected features (no need of their geometries or of the other attributes)
+        id_idx: int = layer.fields().indexOf("id")
+        request = QgsFeatureRequest().setFlags(QgsFeatureRequest.Flag.NoGeometry).setSubsetOfAttributes([id_idx])
+        co_ids: list[int] = sorted(set(feat.attribute(id_idx) for feat in layer.getSelectedFeatures(request)))
+
+        msg1: str = f"{len(co_ids)} features selected in layer '{layer.name()}' will be deleted from citydb schema '{self.CDB_SCHEMA}'.<br><br>Do you really want to proceed?"
+        msg2: str = f"{len(co_ids)} features selected in layer '{layer.name()}' will be deleted from citydb schema '{self.CDB_SCHEMA}'.<br><br>Do you REALLY want to proceed?"
+        res = QMessageBox.question(self, "Delete selected features", msg1)
+        if res == QMessageBox.Yes:
+            res = QMessageBox.question(self, "Delete selected features", msg2)
+            if res == QMessageBox.Yes:
+                thr.run_bulk_delete_thread(dlg=self, delete_mode="del_LayerSelection", co_ids=co_ids, sel_layer=layer)
 
         return None
 
@@ -1074,8 +1150,16 @@ class CDB4DeleterDialog(QDialog, FORM_CLASS):
         """Event that is called when the button 'Save settings' is clicked
         """
         delArraySize = self.sbxArraySize.value()
+        delBatchTime = self.sbxBatchTime.value()
+        delJobs = self.sbxDelJobs.value()
+        cleanGlob = self.cbxCleanupGlobal.checkState()
+        fastPurge = self.sbxFastPurge.value()
 
         if all((delArraySize == self.settings.max_del_array_length_default,
+                delBatchTime == self.settings.del_batch_time_default,
+                delJobs == self.settings.del_jobs_default,
+                cleanGlob == self.settings.cleanup_global_appearances_default,
+                fastPurge == self.settings.fast_purge_threshold_default,
             )):
             # No need to store the settings, they are unchanged. Inform the user
             msg: str = "No need to store the settings, they coincide with the default values."
@@ -1091,6 +1175,10 @@ class CDB4DeleterDialog(QDialog, FORM_CLASS):
         settings_list: list[dict] = []
         settings_list = [
             {'name': 'delArraySize' , 'data_type': 2, 'data_value': delArraySize , 'label': self.settings.max_del_array_length_label},
+            {'name': 'delBatchTime' , 'data_type': 2, 'data_value': delBatchTime , 'label': self.settings.del_batch_time_label},
+            {'name': 'delJobs'      , 'data_type': 2, 'data_value': delJobs      , 'label': self.settings.del_jobs_label},
+            {'name': 'cleanGlob'    , 'data_type': 4, 'data_value': int(cleanGlob), 'label': self.settings.cleanup_global_appearances_label},
+            {'name': 'fastPurge'    , 'data_type': 2, 'data_value': fastPurge    , 'label': self.settings.fast_purge_threshold_label},
         ]
         # print(settings_list)
 
@@ -1127,6 +1215,14 @@ class CDB4DeleterDialog(QDialog, FORM_CLASS):
             n = s['name']
             if n == "delArraySize":
                 self.sbxArraySize.setValue(s["data_value"])
+            elif n == "delBatchTime":
+                self.sbxBatchTime.setValue(s["data_value"])
+            elif n == "delJobs":
+                self.sbxDelJobs.setValue(s["data_value"])
+            elif n == "cleanGlob":
+                self.cbxCleanupGlobal.setChecked(s["data_value"])
+            elif n == "fastPurge":
+                self.sbxFastPurge.setValue(s["data_value"])
             else:
                 pass
 
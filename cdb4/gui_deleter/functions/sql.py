@@ -8,12 +8,15 @@ from typing import TYPE_CHECKING, Literal, Optional #, Union
 if TYPE_CHECKING:       
     from ...gui_deleter.deleter_dialog import CDB4DeleterDialog
     from ...shared.dataTypes import CDBSchemaPrivs, TopLevelFeatureCounter
+    from ..other_classes import TopLevelFeature
 
 import psycopg2, psycopg2.sql as pysql
+from psycopg2.errors import QueryCanceled
 from psycopg2.extras import NamedTupleCursor
 
 from ...shared.dataTypes import BBoxType
 from ...shared.functions import general_functions as gen_f
+from .. import deleter_constants as c
 
 FILE_LOCATION = gen_f.get_file_relative_path(file=__file__)
 
@@ -168,17 +171,19 @@ def get_cdb_schema_srid(dlg: CDB4DeleterDialog) -> int:
 
 def compute_cdb_schema_extents(dlg: CDB4DeleterDialog) -> tuple[bool, float, float, float, float, int]:
     """Calls the qgis_pkg function that computes the cdb_schema extents.
+    The extents cached in the usr_schema are reused, unless table cityobject was changed in the meantime.
 
     *   :returns: is_geom_null, x_min, y_min, x_max, y_max, srid
         :rtype: tuple[bool, float, float, float, float, int]
     """
     # Prepare query to execute server function to compute the schema's extents
     query = pysql.SQL("""
-        SELECT * FROM {_qgis_pkg_schema}.compute_cdb_schema_extents({_cdb_schema},{_is_geographic});
+        SELECT * FROM {_qgis_pkg_schema}.compute_cdb_schema_extents({_cdb_schema},{_is_geographic},{_usr_schema});
         """).format(
         _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
         _cdb_schema = pysql.Literal(dlg.CDB_SCHEMA),
-        _is_geographic = pysql.Literal(dlg.CRS_is_geographic)
+        _is_geographic = pysql.Literal(dlg.CRS_is_geographic),
+        _usr_schema = pysql.Literal(dlg.USR_SCHEMA)
         )
 
     try:
@@ -290,3 +295,140 @@ def list_top_level_features(dlg: CDB4DeleterDialog, extents_wkt_2d: Optional[str
             location=FILE_LOCATION,
             header="Retrieving list and quantity of available top-level features in selected area",
             error=error)      
+
+
+def get_hierarchy_links_query(cdb_schema: str) -> pysql.Composed:
+    """Returns the query listing the (child_id, parent_id) links between the features of the cdb_schema
+    and their child features (parts, thematic surfaces, openings, etc., see c.DEL_HIERARCHY_LINKS).
+    It is used to walk down the hierarchy of top-level features with a recursive query.
+    """
+    return pysql.SQL(" UNION ALL ").join([pysql.SQL("SELECT {_child}, {_parent} FROM {_cdb_schema}.{_table}").format(
+        _child = pysql.Identifier(child_col),
+        _parent = pysql.Identifier(parent_col),
+        _cdb_schema = pysql.Identifier(cdb_schema),
+        _table = pysql.Identifier(table)
+        ) for table, child_col, parent_col in c.DEL_HIERARCHY_LINKS])
+
+
+def get_delete_percentage(dlg: CDB4DeleterDialog, tlfs: list[TopLevelFeature]) -> Optional[float]:
+    """SQL query that estimates which share of the schema is going to be deleted, as the percentage
+    of the cityobject rows of the whole cdb_schema (top-level features and their child features) to delete.
+    Each top-level feature counts with the average size of its hierarchy, measured on a sample of
+    (at most c.DEL_ESTIMATE_SAMPLE_SIZE) features, so that e.g. a building weighs more than a city furniture.
+    The number of rows of the cityobject table is taken from its statistics.
+    It is used to choose between the row-by-row delete and the fast purge (see setting 'fast_purge_threshold').
+    As it runs before the confirmation dialog, all classes are sampled by a single statement,
+    which is given at most c.DEL_ESTIMATE_TIMEOUT milliseconds (None is returned if it takes longer).
+
+    *   :returns: Percentage of the cityobject rows to delete (None if it cannot be estimated)
+        :rtype: float
+    """
+    cdb_schema = dlg.CDB_SCHEMA
+
+    sql_where: str
+    if dlg.DELETE_EXTENTS == dlg.CDB_SCHEMA_EXTENTS:
+        sql_where = "" # Empty string
+    else:
+        sql_where = "AND (co.envelope && ST_MakeEnvelope({}, {}, {}, {}, {}))".format(
+            dlg.DELETE_EXTENTS.xMinimum(), dlg.DELETE_EXTENTS.yMinimum(),
+            dlg.DELETE_EXTENTS.xMaximum(), dlg.DELETE_EXTENTS.yMaximum(),
+            dlg.CRS.postgisSrid())
+
+    sample_query = pysql.SQL("""
+        (WITH RECURSIVE s AS (
+            SELECT co.id FROM {_cdb_schema}.cityobject AS co
+            WHERE co.objectclass_id = {_objectclass_id} {_sql_where}
+            LIMIT {_sample_size}
+        ), h(id) AS (
+            SELECT s.id FROM s
+            UNION
+            SELECT l.child_id FROM h INNER JOIN ({_links}) AS l(child_id, parent_id) ON (l.parent_id = h.id)
+        )
+        SELECT {_tlf_idx}, (SELECT count(*) FROM s), (SELECT count(*) FROM h))
+        """)
+
+    total_query = pysql.SQL("""
+        SELECT c.reltuples FROM pg_class AS c WHERE c.oid = (quote_ident({_cdb_schema}) || '.cityobject')::regclass;
+        """).format(
+        _cdb_schema = pysql.Literal(cdb_schema)
+        )
+
+    try:
+        n_rows: float = 0
+        sel_tlfs: list[TopLevelFeature] = [tlf for tlf in tlfs if tlf.n_features]
+        with dlg.conn.cursor() as cur:
+            if sel_tlfs:
+                cur.execute("SET LOCAL statement_timeout TO %s;", (c.DEL_ESTIMATE_TIMEOUT,))
+                cur.execute(pysql.SQL(" UNION ALL ").join([sample_query.format(
+                    _cdb_schema = pysql.Identifier(cdb_schema),
+                    _objectclass_id = pysql.Literal(tlf.objectclass_id),
+                    _sql_where = pysql.SQL(" ".join(["", sql_where])),
+                    _sample_size = pysql.Literal(c.DEL_ESTIMATE_SAMPLE_SIZE),
+                    _links = get_hierarchy_links_query(cdb_schema),
+                    _tlf_idx = pysql.Literal(i)
+                    ) for i, tlf in enumerate(sel_tlfs)]))
+                for tlf_idx, n_sampled, n_sampled_rows in cur.fetchall():
+                    if n_sampled:
+                        n_rows += sel_tlfs[tlf_idx].n_features * n_sampled_rows / n_sampled
+
+            cur.execute(total_query)
+            res = cur.fetchone()
+            n_total: float = res[0] if res else 0
+            if n_total <= 0:
+                # The table has never been analyzed
+                cur.execute(pysql.SQL("SELECT count(*) FROM {_cdb_schema}.cityobject;").format(_cdb_schema = pysql.Identifier(cdb_schema)))
+                n_total = cur.fetchone()[0]
+        dlg.conn.commit()
+
+        if not n_total:
+            return None
+        return min(100.0, n_rows * 100 / n_total)
+
+    except QueryCanceled:
+        # Too slow to be worth it: the row-by-row delete is used
+        dlg.conn.rollback()
+        return None
+
+    except (Exception, psycopg2.Error) as error:
+        dlg.conn.rollback()
+        gen_f.critical_log(
+            func=get_delete_percentage,
+            location=FILE_LOCATION,
+            header=f"Estimating the share of schema {dlg.CDB_SCHEMA} to delete",
+            error=error)
+
+
+def get_layer_curr_class(dlg: CDB4DeleterDialog, layer_name: str) -> Optional[str]:
+    """SQL query that retrieves the class of the features of a layer of the current cdb_schema,
+    as registered by the Layer Loader in table layer_metadata of the usr_schema.
+
+    *   :returns: The class name (None if the layer is not registered)
+        :rtype: str
+    """
+    query = pysql.SQL("""
+        SELECT curr_class FROM {_usr_schema}.layer_metadata
+        WHERE cdb_schema = {_cdb_schema} AND layer_name = {_layer_name}
+        LIMIT 1;
+        """).format(
+        _usr_schema = pysql.Identifier(dlg.USR_SCHEMA),
+        _cdb_schema = pysql.Literal(dlg.CDB_SCHEMA),
+        _layer_name = pysql.Literal(layer_name)
+        )
+
+    try:
+        with dlg.conn.cursor() as cur:
+            cur.execute(query)
+            res = cur.fetchone()
+        dlg.conn.commit()
+
+        if not res:
+            return None
+        return res[0]
+
+    except (Exception, psycopg2.Error) as error:
+        dlg.conn.rollback()
+        gen_f.critical_log(
+            func=get_layer_curr_class,
+            location=FILE_LOCATION,
+            header=f"Retrieving the class of layer {layer_name} from table {dlg.USR_SCHEMA}.layer_metadata",
+            error=error)
@@ -170,6 +170,7 @@ def gbxFeatSel_reset(dlg: CDB4DeleterDialog) -> None:
     dlg.gbxFeatSel.setDisabled(True)
 
     dlg.btnDelSelFeatures.setDisabled(True)
+    dlg.btnDelLayerSel.setDisabled(True)
 
     # dlg.ckbAddSpatialFilter.setChecked(False)
 
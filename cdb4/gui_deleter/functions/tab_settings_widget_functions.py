@@ -31,5 +31,9 @@ def gbxMiscSettings_reset(dlg: CDB4DeleterDialog) -> None:
     """Function to reset the groupbox 'gbxMiscSettings' tab
     """
     dlg.sbxArraySize.setValue(dlg.settings.max_del_array_length_default)
+    dlg.sbxBatchTime.setValue(dlg.settings.del_batch_time_default)
+    dlg.sbxDelJobs.setValue(dlg.settings.del_jobs_default)
+    dlg.cbxCleanupGlobal.setChecked(dlg.settings.cleanup_global_appearances_default)
+    dlg.sbxFastPurge.setValue(dlg.settings.fast_purge_threshold_default)
 
     return None
\ No newline at end of file
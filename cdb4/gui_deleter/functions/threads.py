@@ -21,17 +21,23 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:       
     from ...gui_deleter.deleter_dialog import CDB4DeleterDialog
-    from ..other_classes import TopLevelFeature
+    from qgis.core import QgsVectorLayer
 
-import math, time
+import time
+import queue
+import threading
+import concurrent.futures
 from qgis.PyQt.QtCore import QObject, QThread, pyqtSignal
 from qgis.core import Qgis, QgsMessageLog
 import psycopg2, psycopg2.sql as pysql
+from psycopg2.errors import DeadlockDetected
 
 from ...gui_db_connector.functions import conn_functions as conn_f
 from ...shared.functions import general_functions as gen_f
+from ..other_classes import TopLevelFeature
 from .. import deleter_constants as c
 from . import tab_conn_functions as tc_f
+from . import sql
 
 FILE_LOCATION = gen_f.get_file_relative_path(file=__file__)
 
@@ -121,86 +127,28 @@ class CleanUpSchemaWorker(QObject):
         # Flag to help us break from a failing installation.
         fail_flag: bool = False
 
-        # Strictly speaking, all these extra TRUNCATE statements to the tables are not necessary,
-        # as one single run of the cleanup_schema function would suffice.
-        # This strategy however allows for some action in the progress bar, otherwise the user would have no cue of
-        # what is going on.
-
-        table_names: tuple[str] = (
-            "address_to_bridge",
-            "address_to_building",
-            "appear_to_surface_data",
-            "group_to_cityobject",
-            "generalization",
-            "opening_to_them_surface",
-            "relief_feat_to_rel_comp",
-            "textureparam",
-            "appearance", 
-            "address", 
-            "external_reference",
-            "surface_data", 
-            "surface_geometry", 
-            "cityobject_genericattrib",
-            "building",
-            "bridge",
-            "tunnel",
-            "solitary_vegetat_object",
-            "plant_cover",
-            "tin_relief",
-            "waterbody",
-            "land_use",
-            "generic_cityobject",
-            "cityobjectgroup",
-            "cityobject"
+        # The clean-up runs in phases, each one driving the progress bar:
+        # 1) truncate all tables and reset all sequences, each in a single statement (qgis_pkg.cleanup_schema)
+        # 2) update the statistics of the (now empty) tables, so that the planner does not rely on the old ones
+        phases: tuple[str] = (
+            f"Truncating all tables of schema {cdb_schema}",
+            f"Analyzing the tables of schema {cdb_schema}"
             )
 
         # Set progress bar goal:
-        steps_tot: int = len(table_names) + 1
+        steps_tot: int = len(phases)
         dlg.bar.setMaximum(steps_tot)
         curr_step: int = 0
-        
+
+        temp_conn = None
         try:
             # Open new temp session, reserved for installation.
-            temp_conn = conn_f.open_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(Clean up schema (TRUNCATE)"]))
+            temp_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(Clean up schema (TRUNCATE)"]))
             with temp_conn:
                 # Start measuring time
-                time_start = time.time()                
-
-                for table_name in table_names:
-
-                    query = pysql.SQL("""
-                        TRUNCATE {_cdb_schema}.{_table_name} RESTART IDENTITY CASCADE;
-                    """).format(
-                    _cdb_schema = pysql.Identifier(cdb_schema),
-                    _table_name = pysql.Identifier(table_name)
-                    )
-
-                    # Update progress bar
-                    msg = f"Truncating {cdb_schema}.{table_name}"
-                    curr_step += 1
-                    self.sig_progress.emit(curr_step, msg)
-
-                    try:
-                        with temp_conn.cursor() as cur:
-                            cur.execute(query)
-                        temp_conn.commit()   # Actually redundant, it is autocommitted
-
-                    except (Exception, psycopg2.Error) as error:
-                        temp_conn.rollback()
-                        fail_flag = True
-                        gen_f.critical_log(
-                            func=self.clean_up_schema_thread,
-                            location=FILE_LOCATION,
-                            header=f"Truncating {cdb_schema}.{table_name}",
-                            error=error)
-                        self.sig_fail.emit()
-                        # break # Exit from loop
-
-                # Measure elapsed time
-                time_middle = time.time()
-                print(f"First round of truncating completed in {round((time_middle - time_start), 4)} seconds")
+                time_start = time.time()
 
-                # 2) Eventually, run the generic clean up function, just to be sure...
+                # 1) Truncate all tables at once
                 query = pysql.SQL("""
                     SELECT {_qgis_pkg_schema}.cleanup_schema({_cdb_schema});
                 """).format(
@@ -209,7 +157,7 @@ class CleanUpSchemaWorker(QObject):
                 )
 
                 # Update progress bar
-                msg = "Finalizing the clean-up"
+                msg = phases[curr_step]
                 curr_step += 1
                 self.sig_progress.emit(curr_step, msg)
 
@@ -228,9 +176,42 @@ class CleanUpSchemaWorker(QObject):
                         error=error)
                     self.sig_fail.emit()
 
+                # Measure elapsed time
+                time_middle = time.time()
+                print(f"Running qgis_pkg.cleanup_schema() completed in {round((time_middle - time_start), 4)} seconds")
+
+                # 2) Analyze all tables of the schema
+                # Update progress bar
+                msg = phases[curr_step]
+                curr_step += 1
+                self.sig_progress.emit(curr_step, msg)
+
+                if not fail_flag:
+                    try:
+                        with temp_conn.cursor() as cur:
+                            cur.execute(pysql.SQL("""
+                                SELECT tablename FROM pg_tables WHERE schemaname = {_cdb_schema} ORDER BY tablename;
+                            """).format(
+                            _cdb_schema = pysql.Literal(cdb_schema)
+                            ))
+                            table_names: list = [r[0] for r in cur.fetchall()]
+                            if table_names:
+                                cur.execute(pysql.SQL(" ").join([pysql.SQL("ANALYZE {_cdb_schema}.{_table_name};").format(
+                                    _cdb_schema = pysql.Identifier(cdb_schema),
+                                    _table_name = pysql.Identifier(table_name)
+                                    ) for table_name in table_names]))
+                        temp_conn.commit()
+
+                    except (Exception, psycopg2.Error) as error:
+                        temp_conn.rollback()
+                        fail_flag = True
+                        gen_f.critical_log(
+                            func=self.clean_up_schema_thread,
+                            location=FILE_LOCATION,
+                            header=f"Analyzing the tables of schema {cdb_schema}",
+                            error=error)
+                        self.sig_fail.emit()
 
-            # Measure elapsed time
-            print(f"Running qgis_pkg.cleanup_schema() completed in {round((time.time() - time_middle), 4)} seconds")
             # Measure elapsed time
             print(f"Clean-up process completed in {round((time.time() - time_start), 4)} seconds")
 
@@ -249,7 +230,7 @@ class CleanUpSchemaWorker(QObject):
 
         self.sig_finished.emit()
         # Close temporary connection       
-        temp_conn.close()
+        conn_f.release_db_connection(conn=temp_conn)
         return None
 
 #--EVENTS  (start)  ##############################################################
@@ -305,8 +286,11 @@ def evt_clean_up_schema_fail(dlg: CDB4DeleterDialog) -> None:
 ##### BULK FEATURE DELETER ##########################################################
 #####################################################################################
 
-def run_bulk_delete_thread(dlg: CDB4DeleterDialog, delete_mode: str) -> None:
+def run_bulk_delete_thread(dlg: CDB4DeleterDialog, delete_mode: str, is_fast_purge: bool = False,
+                           co_ids: list[int] = None, sel_layer: QgsVectorLayer = None) -> None:
     """Function that bulk deletes Features from the selected schema.
+    If is_fast_purge, the indexes of the schema are dropped before deleting, and rebuilt afterwards.
+    In delete mode "del_LayerSelection", the co_ids (selected in sel_layer) are deleted.
     """
     # Add a new progress bar to follow the installation procedure.
     for index in range(dlg.vLayoutUserConn.count()):
@@ -321,7 +305,12 @@ def run_bulk_delete_thread(dlg: CDB4DeleterDialog, delete_mode: str) -> None:
     # Create new thread object.
     dlg.thread = QThread()
     # Instantiate worker object for the operation.
-    dlg.worker = BulkDeleteWorker(dlg=dlg, delete_mode=delete_mode)
+    # The settings are read here, as the widgets must not be accessed from the worker thread.
+    dlg.worker = BulkDeleteWorker(dlg=dlg, delete_mode=delete_mode, is_fast_purge=is_fast_purge, co_ids=co_ids,
+        array_size=dlg.sbxArraySize.value(),
+        n_jobs=dlg.sbxDelJobs.value(),
+        is_cleanup_global=dlg.cbxCleanupGlobal.isChecked(),
+        batch_time=dlg.sbxBatchTime.value())
     # Move worker object to the be executed on the new thread.
     dlg.worker.moveToThread(dlg.thread)
 
@@ -356,6 +345,11 @@ def run_bulk_delete_thread(dlg: CDB4DeleterDialog, delete_mode: str) -> None:
     # On installation status
     dlg.worker.sig_success.connect(lambda: evt_bulk_delete_success(dlg))
     dlg.worker.sig_fail.connect(lambda: evt_buld_delete_fail(dlg))
+
+    if sel_layer:
+        # Remove the deleted features from the layer (and from its selection)
+        dlg.thread.finished.connect(lambda: sel_layer.removeSelection())
+        dlg.thread.finished.connect(lambda: sel_layer.reload())
     #-SIGNALS--(end)---################################################################
 
     # Initiate worker thread
@@ -372,10 +366,17 @@ class BulkDeleteWorker(QObject):
     sig_success = pyqtSignal()
     sig_fail = pyqtSignal()
 
-    def __init__(self, dlg: CDB4DeleterDialog, delete_mode: str):
+    def __init__(self, dlg: CDB4DeleterDialog, delete_mode: str, is_fast_purge: bool = False, co_ids: list[int] = None,
+                 array_size: int = c.DEL_BATCH_SIZE_MIN, n_jobs: int = 1, is_cleanup_global: bool = False, batch_time: int = 0):
         super().__init__()
         self.dlg = dlg
         self.delete_mode = delete_mode
+        self.is_fast_purge = is_fast_purge
+        self.co_ids = co_ids
+        self.array_size = array_size
+        self.n_jobs = n_jobs
+        self.is_cleanup_global = is_cleanup_global
+        self.batch_time = batch_time
 
 
     def bulk_delete_thread(self):
@@ -386,7 +387,8 @@ class BulkDeleteWorker(QObject):
         # Flag to help us break from a failing installation.
         fail_flag: bool = False
         cdb_schema = dlg.CDB_SCHEMA
-        co_id_array_length = dlg.settings.max_del_array_length_default
+        # Initial number of features deleted at a time, then adapted to the duration of each batch.
+        co_id_array_length: int = self.array_size
         sel_tlfs: list[TopLevelFeature] = []
 
         sql_where: str
@@ -447,14 +449,6 @@ class BulkDeleteWorker(QObject):
                 sel_tlfs.append(dlg.TopLevelFeaturesRegistry["ReliefFeature"])
                 sel_tlfs.append(dlg.TopLevelFeaturesRegistry["CityObjectGroup"])
 
-            tot_del_iter: int = 0
-
-            # tlf: TopLevelFeature
-            n_iter: int = 0
-            for tlf in sel_tlfs:
-                n_iter = math.ceil(tlf.n_features / co_id_array_length) # approximates to the next integer, so always >= 1
-                tlf.n_del_iter = n_iter
-                tot_del_iter += n_iter
 
         elif self.delete_mode == "del_TopLevelFeatures":
             # 1b) Pick only those top-level features that have been selected (except ReliefFeature and CityObjectGroup, added later) 
@@ -472,132 +466,368 @@ class BulkDeleteWorker(QObject):
             if tlf_cog.is_selected: # for sure it has n_features > 0, bacause it could be selected
                 sel_tlfs.append(tlf_cog)
 
-            # Update the number of delete iterations for each selected top-level feature
-            tot_del_iter: int = 0
-
-            # tlf: TopLevelFeature = None
-            n_iter: int = 0
-            for tlf in sel_tlfs:
-                n_iter = math.ceil(tlf.n_features / co_id_array_length) # approximates to the next integer, so always >= 1
-                tlf.n_del_iter = n_iter
-                tot_del_iter += n_iter
+        elif self.delete_mode == "del_LayerSelection":
+            # 1c) The features selected in a layer (of any class) are deleted as a single group,
+            # with the generic delete function, which dispatches the ids to the delete function of their class.
+            sel_tlfs = [TopLevelFeature(name="Selected features", feature_type=None, objectclass_id=None, del_function="del_cityobject", n_features=len(self.co_ids or []))]
 
         # Set progress bar goal:
-        # drop_iterations: tot_del_iter actions
+        # drop indexes (fast purge only): 1 action
+        # delete features: tot_features actions
         # clean up global appearances: 1 action
+        # rebuild indexes and analyze tables (fast purge only): 1 action
 
         sel_tlfs: list[TopLevelFeature]
 
-        steps_tot = tot_del_iter + 1
+        tot_features: int = sum(tlf.n_features for tlf in sel_tlfs)
+        steps_tot = tot_features + 1 + (2 if self.is_fast_purge else 0)
         dlg.bar.setMaximum(steps_tot)
         curr_step: int = 0
         # print("steps_tot", steps_tot)
 
-        # Open new temp session, reserved for installation.
-        try:
-            temp_conn = conn_f.open_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(Bulk Deleter)"]))
-            with temp_conn:
+        # The top-level features are deleted in stages: the features of a stage do not touch each other's rows,
+        # and can be deleted in parallel, while each stage starts once the previous one is over.
+        # The top-level features sharing dependent rows (see c.DEL_SHARED_ROWS_TLFS) get a stage each,
+        # the first one together with all the others.
+        # The ReliefFeature and the CityObjectGroup depend on all other top-level features, and are deleted last.
+        other_tlfs = [tlf for tlf in sel_tlfs if tlf.name not in ["ReliefFeature", "CityObjectGroup"]]
+        shared_tlfs = [tlf for tlf in other_tlfs if tlf.name in c.DEL_SHARED_ROWS_TLFS]
+        del_stages: list[list[TopLevelFeature]] = [
+            [tlf for tlf in other_tlfs if tlf.name not in c.DEL_SHARED_ROWS_TLFS] + shared_tlfs[:1],
+            *[[tlf] for tlf in shared_tlfs[1:]],
+            [tlf for tlf in sel_tlfs if tlf.name == "ReliefFeature"],
+            [tlf for tlf in sel_tlfs if tlf.name == "CityObjectGroup"]
+            ]
+
+        # Degree of parallelism: never open more connections than top-level features deleted at the same time.
+        n_jobs: int = max(1, min(self.n_jobs, max(len(stage) for stage in del_stages)))
+
+        # Pool of worker connections, each one used by one top-level feature at a time.
+        conn_pool: queue.Queue = queue.Queue()
+        progress_lock = threading.Lock()
+
+        # Unless all global appearances are cleaned up at the end (see setting 'cleanup_global_appearances'),
+        # collect the surface data and appearances possibly left orphan by the deleted features, to check only those.
+        # In a fast purge most of the schema is deleted (and the spatial indexes are dropped): clean up all of them.
+        is_cleanup_global: bool = self.is_cleanup_global or self.is_fast_purge
+        touched_sd_ids: set = set()
+        touched_app_ids: set = set()
+
+        def delete_tlf(tlf: TopLevelFeature) -> bool:
+            nonlocal curr_step
+            # Snapshot the ids of the features to delete once, in a server-side cursor that survives the commits,
+            # and walk them in ascending order instead of searching again for the remaining ones at each batch.
+            if self.delete_mode == "del_LayerSelection":
+                # The given ids (those still existing)
+                ids_query = pysql.SQL("""
+                    SELECT co.id FROM {_cdb_schema}.cityobject AS co
+                    WHERE co.id = ANY({_co_ids}::bigint[])
+                """).format(
+                _cdb_schema = pysql.Identifier(cdb_schema),
+                _co_ids = pysql.Placeholder('co_ids')
+                )
+            else:
+                ids_query = pysql.SQL("""
+                    SELECT co.id FROM {_cdb_schema}.cityobject AS co
+                    WHERE co.objectclass_id = {_objectclass_id} {_sql_where}
+                """).format(
+                _cdb_schema = pysql.Identifier(cdb_schema),
+                _objectclass_id = pysql.Placeholder('oc_id'),
+                _sql_where = pysql.SQL(" ".join(["", sql_where]))
+                )
+            query = pysql.SQL("{_ids_query} ORDER BY co.id;").format(_ids_query = ids_query)
+
+            # This query will return only an id of the whole array, if something was deleted.
+            # It will return null if nothing was deleted
+            del_query = pysql.SQL("""
+                SELECT {_cdb_schema}.{_del_func}({_co_id_array}::bigint[]) LIMIT 1;
+            """).format(
+            _cdb_schema = pysql.Identifier(cdb_schema),
+            _del_func = pysql.Identifier(tlf.del_function),
+            _co_id_array = pysql.Placeholder('co_id_array')
+            )
 
-                # Start measuring time
-                time_start = time.time()
+            # Surface data (and their appearances) textured on the geometries of the features to delete,
+            # or of their child features (parts, thematic surfaces, openings, etc., see c.DEL_HIERARCHY_LINKS).
+            # They are collected once, before the first batch.
+            touched_query = pysql.SQL("""
+                WITH RECURSIVE h(id) AS (
+                    {_ids_query}
+                    UNION
+                    SELECT l.child_id FROM h INNER JOIN ({_links}) AS l(child_id, parent_id) ON (l.parent_id = h.id)
+                )
+                SELECT array_agg(DISTINCT t.surface_data_id), array_agg(DISTINCT asd.appearance_id)
+                FROM h
+                    INNER JOIN {_cdb_schema}.surface_geometry AS sg ON (sg.cityobject_id = h.id)
+                    INNER JOIN {_cdb_schema}.textureparam AS t ON (t.surface_geometry_id = sg.id)
+                    LEFT JOIN {_cdb_schema}.appear_to_surface_data AS asd ON (asd.surface_data_id = t.surface_data_id);
+            """).format(
+            _cdb_schema = pysql.Identifier(cdb_schema),
+            _ids_query = ids_query,
+            _links = sql.get_hierarchy_links_query(cdb_schema)
+            )
 
-                # Start deleting the top-level features that are neither ReliefFeature nor CityObjectGroup
-                # tlf: TopLevelFeature
-                for tlf in sel_tlfs:
-                    for i in range(tlf.n_del_iter):
-
-                        # This query will return only an id of the whole array, if something was deleted.
-                        # It will return null if nothing was deleted
-                        query = pysql.SQL("""
-                            WITH s AS (
-                                SELECT array_agg(foo.id) AS co_id_array
-                                FROM (
-                                    SELECT co.id FROM {_cdb_schema}.cityobject AS co
-                                    WHERE co.objectclass_id = {_objectclass_id} {_sql_where}
-                                    LIMIT {_co_id_array_length} FOR UPDATE) AS foo
-                                )
-                            SELECT {_cdb_schema}.{_del_func}(s.co_id_array) FROM s LIMIT 1;
-                        """).format(
-                        _cdb_schema = pysql.Identifier(cdb_schema),
-                        _objectclass_id = pysql.Placeholder('oc_id'),
-                        _sql_where = pysql.SQL(" ".join(["", sql_where])),
-                        _co_id_array_length = pysql.Placeholder('co_id_arr_len'),
-                        _del_func = pysql.Identifier(tlf.del_function)
-                        )
-
-                        # Update progress bar
-                        msg = f"Deleting '{tlf.name}' objects"
-                        curr_step += 1
-                        self.sig_progress.emit(curr_step, msg)
-
-                        try:
-                            with temp_conn.cursor() as cur:
-                                cur.execute(query, {'oc_id': tlf.objectclass_id, 'co_id_arr_len': co_id_array_length})
-                            temp_conn.commit()   # Actually redundant, it is autocommitted
-
-                        except (Exception, psycopg2.Error) as error:
-                            temp_conn.rollback()
-                            fail_flag = True
-                            gen_f.critical_log(
-                                func=self.bulk_delete_thread,
-                                location=FILE_LOCATION,
-                                header=f"Deleting objects of top-level '{tlf.name}' in schema {cdb_schema}",
-                                error=error)
-                            self.sig_fail.emit()
-                            break # Exit from the loop
-
-                        # print(f"deleted {rcf.name} step {curr_step}/{steps_tot}")
-
-                # 2) Eventually, clean up the global appearances. Same as before, only one value is returned.
+            # Each top-level feature adapts its own batch size.
+            batch_size: int = co_id_array_length
+            n_deleted: int = 0
+            tlf_start = time.time()
+
+            worker_conn = conn_pool.get()
+            try:
+                if not is_cleanup_global:
+                    with worker_conn.cursor() as cur:
+                        cur.execute(touched_query, {'oc_id': tlf.objectclass_id, 'co_ids': self.co_ids})
+                        sd_ids, app_ids = cur.fetchone()
+                    worker_conn.commit()
+                    with progress_lock:
+                        touched_sd_ids.update(i for i in (sd_ids or []) if i is not None)
+                        touched_app_ids.update(i for i in (app_ids or []) if i is not None)
+
+                with worker_conn.cursor(name=f"del_{tlf.objectclass_id}", withhold=True) as id_cur:
+                    id_cur.execute(query, {'oc_id': tlf.objectclass_id, 'co_ids': self.co_ids})
+                    worker_conn.commit()
+
+                    while True:
+                        co_ids = [r[0] for r in id_cur.fetchmany(batch_size)]
+                        if not co_ids:
+                            break
+
+                        batch_start = time.time()
+                        # A deadlock with another worker aborts only this batch: roll it back and try it again.
+                        # The WITH HOLD cursor of the ids was committed, and survives the rollback.
+                        n_retries: int = 0
+                        while True:
+                            try:
+                                with worker_conn.cursor() as cur:
+                                    cur.execute(del_query, {'co_id_array': co_ids})
+                                worker_conn.commit()
+                                break
+                            except DeadlockDetected:
+                                worker_conn.rollback()
+                                n_retries += 1
+                                if n_retries > c.DEL_DEADLOCK_RETRIES:
+                                    raise
+                                time.sleep(0.1 * n_retries)
+                        batch_size = self.adapt_batch_size(batch_size, len(co_ids), time.time() - batch_start)
+                        n_deleted += len(co_ids)
+
+                        with progress_lock:
+                            # Update progress bar, with the throughput of this top-level feature
+                            curr_step = min(curr_step + len(co_ids), tot_features)
+                            msg = f"Deleting '{tlf.name}' objects ({round(n_deleted / max(time.time() - tlf_start, 0.001))} per second)"
+                            self.sig_progress.emit(curr_step, msg)
+
+                is_deleted = True
+
+            except (Exception, psycopg2.Error) as error:
+                worker_conn.rollback()
+                is_deleted = False
+                gen_f.critical_log(
+                    func=self.bulk_delete_thread,
+                    location=FILE_LOCATION,
+                    header=f"Deleting objects of top-level '{tlf.name}' in schema {cdb_schema}",
+                    error=error)
+            finally:
+                # If a batch failed, psycopg2 does not close the WITH HOLD cursor of the ids (the transaction was aborted),
+                # and it would survive the rollback: close it, otherwise the next run fails with "cursor already exists".
+                try:
+                    with worker_conn.cursor() as cur:
+                        cur.execute("CLOSE ALL;")
+                    worker_conn.commit()
+                except (Exception, psycopg2.Error):
+                    worker_conn.rollback()
+                conn_pool.put(worker_conn)
+
+            # print(f"deleted {n_deleted} {tlf.name} in {round((time.time() - tlf_start), 4)} seconds")
+            return is_deleted
+
+        is_purging: bool = False # True once the indexes have been dropped
+        try:
+            # Open new temp sessions, reserved for the bulk delete.
+            for i in range(n_jobs):
+                worker_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, f"(Bulk Deleter {i+1}/{n_jobs})"]))
+                if not worker_conn:
+                    raise psycopg2.OperationalError("Could not open all connections to bulk delete the features")
+                conn_pool.put(worker_conn)
+
+            # Start measuring time
+            time_start = time.time()
+
+            # 0) Fast purge: drop the spatial and normal indexes of the schema (as registered in its index_table),
+            # so that they are not updated for each deleted row. Primary keys and foreign key indexes are kept.
+            if self.is_fast_purge:
                 query = pysql.SQL("""
-                    SELECT {_cdb_schema}.cleanup_appearances() LIMIT 1;
+                    SELECT citydb_pkg.drop_spatial_indexes({_cdb_schema});
+                    SELECT citydb_pkg.drop_normal_indexes({_cdb_schema});
                 """).format(
-                _cdb_schema = pysql.Identifier(cdb_schema),
+                _cdb_schema = pysql.Literal(cdb_schema)
                 )
 
                 # Update progress bar
-                msg = "Cleaning up global appearances"
+                msg = "Dropping indexes (fast purge)"
                 curr_step += 1
                 self.sig_progress.emit(curr_step, msg)
 
+                worker_conn = conn_pool.get()
                 try:
-                    with temp_conn.cursor() as cur:
+                    with worker_conn.cursor() as cur:
                         cur.execute(query)
-                    temp_conn.commit()   # Actually redundant, it is autocommitted
+                    worker_conn.commit()
+                    is_purging = True
 
                 except (Exception, psycopg2.Error) as error:
-                    temp_conn.rollback()
-                    fail_flag = True
+                    # Not fatal: the features are deleted with the indexes in place.
+                    worker_conn.rollback()
                     gen_f.critical_log(
                         func=self.bulk_delete_thread,
                         location=FILE_LOCATION,
-                        header=f"Cleaning up global appearances in schema {cdb_schema}",
+                        header=f"Dropping indexes of schema {cdb_schema} (fast purge)",
                         error=error)
-                    self.sig_fail.emit()
+                finally:
+                    conn_pool.put(worker_conn)
+
+            # 1) Delete the top-level features, stage after stage.
+            # The later stages (e.g. ReliefFeature, CityObjectGroup) are not run once a stage has failed.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                for del_stage in del_stages:
+                    results = list(executor.map(delete_tlf, del_stage))
+                    if not all(results):
+                        fail_flag = True
+                        break
+
+            # 2) Eventually, clean up the global appearances. Same as before, only one value is returned.
+            if is_cleanup_global:
+                query = pysql.SQL("""
+                    SELECT {_cdb_schema}.cleanup_appearances() LIMIT 1;
+                """).format(
+                _cdb_schema = pysql.Identifier(cdb_schema),
+                )
+            else:
+                # Only the surface data and global appearances collected above, if they are no more referenced.
+                query = pysql.SQL("""
+                    SELECT {_cdb_schema}.del_surface_data(array_agg(sd.id))
+                    FROM {_cdb_schema}.surface_data AS sd
+                    WHERE sd.id = ANY({_sd_ids}::bigint[])
+                        AND NOT EXISTS (SELECT 1 FROM {_cdb_schema}.textureparam AS t WHERE t.surface_data_id = sd.id)
+                    HAVING count(sd.id) > 0;
+                    SELECT {_cdb_schema}.del_appearance(array_agg(a.id))
+                    FROM {_cdb_schema}.appearance AS a
+                    WHERE a.id = ANY({_app_ids}::bigint[]) AND a.cityobject_id IS NULL
+                        AND NOT EXISTS (SELECT 1 FROM {_cdb_schema}.appear_to_surface_data AS asd WHERE asd.appearance_id = a.id)
+                    HAVING count(a.id) > 0;
+                """).format(
+                _cdb_schema = pysql.Identifier(cdb_schema),
+                _sd_ids = pysql.Literal(sorted(touched_sd_ids)),
+                _app_ids = pysql.Literal(sorted(touched_app_ids))
+                )
+
+            # Update progress bar
+            msg = "Cleaning up global appearances"
+            curr_step += 1
+            self.sig_progress.emit(curr_step, msg)
+
+            worker_conn = conn_pool.get()
+            try:
+                if is_cleanup_global or touched_sd_ids or touched_app_ids:
+                    with worker_conn.cursor() as cur:
+                        cur.execute(query)
+                    worker_conn.commit()
+
+            except (Exception, psycopg2.Error) as error:
+                worker_conn.rollback()
+                fail_flag = True
+                gen_f.critical_log(
+                    func=self.bulk_delete_thread,
+                    location=FILE_LOCATION,
+                    header=f"Cleaning up global appearances in schema {cdb_schema}",
+                    error=error)
+            finally:
+                conn_pool.put(worker_conn)
 
-                # print(f"cleaned up appearances, step {curr_step}/{steps_tot}")
+            # print(f"cleaned up appearances, step {curr_step}/{steps_tot}")
 
             # Measure elapsed time
-            print(f"Delete process completed in {round((time.time() - time_start), 4)} seconds")
+            print(f"Delete process ({n_jobs} connections) completed in {round((time.time() - time_start), 4)} seconds")
 
         except (Exception, psycopg2.Error) as error:
             fail_flag = True
             gen_f.critical_log(
                 func=self.bulk_delete_thread,
                 location=FILE_LOCATION,
-                header="Establishibng temporary connection",
+                header="Establishing temporary connections",
                 error=error)
-            self.sig_fail.emit()
 
-        # No FAIL = SUCCESS
-        if not fail_flag:
+        finally:
+            # 3) Fast purge: rebuild the dropped indexes, and update the statistics of the tables of the schema.
+            # This runs even if the delete failed or was interrupted by an error, not to leave the schema without indexes.
+            if self.is_fast_purge and not conn_pool.empty():
+                # Update progress bar
+                msg = "Rebuilding indexes and analyzing tables (fast purge)"
+                curr_step += 1
+                self.sig_progress.emit(curr_step, msg)
+
+                worker_conn = conn_pool.get()
+                try:
+                    with worker_conn.cursor() as cur:
+                        if is_purging:
+                            cur.execute(pysql.SQL("""
+                                SELECT citydb_pkg.create_spatial_indexes({_cdb_schema});
+                                SELECT citydb_pkg.create_normal_indexes({_cdb_schema});
+                            """).format(
+                            _cdb_schema = pysql.Literal(cdb_schema)
+                            ))
+                        cur.execute(pysql.SQL("""
+                            SELECT tablename FROM pg_tables WHERE schemaname = {_cdb_schema} ORDER BY tablename;
+                        """).format(
+                        _cdb_schema = pysql.Literal(cdb_schema)
+                        ))
+                        table_names: list = [r[0] for r in cur.fetchall()]
+                        if table_names:
+                            cur.execute(pysql.SQL(" ").join([pysql.SQL("ANALYZE {_cdb_schema}.{_table_name};").format(
+                                _cdb_schema = pysql.Identifier(cdb_schema),
+                                _table_name = pysql.Identifier(table_name)
+                                ) for table_name in table_names]))
+                    worker_conn.commit()
+
+                except (Exception, psycopg2.Error) as error:
+                    worker_conn.rollback()
+                    fail_flag = True
+                    gen_f.critical_log(
+                        func=self.bulk_delete_thread,
+                        location=FILE_LOCATION,
+                        header=f"Rebuilding indexes of schema {cdb_schema} (fast purge)",
+                        error=error)
+                finally:
+                    conn_pool.put(worker_conn)
+
+        # Emit the failure only once, whatever the number of failed steps. No FAIL = SUCCESS
+        if fail_flag:
+            self.sig_fail.emit()
+        else:
             self.sig_success.emit()
 
         self.sig_finished.emit()
-        # Close temp connection
-        temp_conn.close()
+        # Give temp connections back to the pool
+        while not conn_pool.empty():
+            conn_f.release_db_connection(conn=conn_pool.get())
         return None
 
+
+    def adapt_batch_size(self, batch_size: int, n_deleted: int, elapsed: float) -> int:
+        """Returns the number of features to delete in the next batch, scaled so that a batch lasts
+        about the target duration (see setting 'del_batch_time'). The batch size is left unchanged
+        if the target duration is 0, or if the last batch was not full (i.e. it was the last one).
+
+        The size changes by at most a factor 2 per batch, to smooth out the occasional slow batch
+        (e.g. waiting on a lock), and stays within c.DEL_BATCH_SIZE_MIN and c.DEL_BATCH_SIZE_MAX.
+        """
+        target_time: int = self.batch_time
+        if target_time == 0 or n_deleted < batch_size or elapsed <= 0:
+            return batch_size
+
+        factor: float = min(2.0, max(0.5, target_time / elapsed))
+        return min(c.DEL_BATCH_SIZE_MAX, max(c.DEL_BATCH_SIZE_MIN, int(batch_size * factor)))
+
 #--EVENTS  (start)  ##############################################################
 
 def evt_bulk_delete_success(dlg: CDB4DeleterDialog) -> None:
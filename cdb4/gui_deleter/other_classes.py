@@ -23,7 +23,19 @@ class DefaultSettings:
     def __init__(self):
 
         self.max_del_array_length_default: int = 100  # rule of thumb (on my PC: 10 cityobjects per second)
-        self.max_del_array_length_label: str = "Maximum (cumulative) number of features to delete at a time"
+        self.max_del_array_length_label: str = "Initial (cumulative) number of features to delete at a time"
+
+        self.del_batch_time_default: int = 2  # seconds
+        self.del_batch_time_label: str = "Target duration (in seconds) of each delete batch, to adapt the number of features to delete at a time (0: fixed)"
+
+        self.del_jobs_default: int = 1
+        self.del_jobs_label: str = "Number of connections used to delete different top-level features in parallel"
+
+        self.cleanup_global_appearances_default: bool = False
+        self.cleanup_global_appearances_label: str = "Toggles on or off the clean-up of all global appearances of the schema after a bulk delete (slower), instead of only those of the deleted features"
+
+        self.fast_purge_threshold_default: int = 100  # percentage, i.e. never
+        self.fast_purge_threshold_label: str = "Percentage of the city objects of the schema (top-level features and their child features) to delete above which indexes are dropped before the bulk delete, and rebuilt afterwards (100: never)"
 
         self.force_dropping_layers_default: bool = False
         self.force_dropping_layers_label: str = "Forces QGIS Package to drop all layers in the current usr_schema"
@@ -31,6 +43,10 @@ class DefaultSettings:
     def __str__(self):
         return_str: str = \
             f"max_features_to_delete_default (DEFAULT): {self.max_del_array_length_default}\n" + \
+            f"del_batch_time (DEFAULT): {self.del_batch_time_default}\n" + \
+            f"del_jobs (DEFAULT): {self.del_jobs_default}\n" + \
+            f"cleanup_global_appearances (DEFAULT): {self.cleanup_global_appearances_default}\n" + \
+            f"fast_purge_threshold (DEFAULT): {self.fast_purge_threshold_default}\n" + \
             f"force_dropping_layers (DEFAULT): {self.force_dropping_layers_default}\n"
         return return_str
 
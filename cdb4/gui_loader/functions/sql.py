@@ -9,10 +9,12 @@ if TYPE_CHECKING:
     from ...gui_loader.loader_dialog import CDB4LoaderDialog
     from ...shared.dataTypes import CDBSchemaPrivs, DetailViewMetadata, LookupTableConfig
     from ..other_classes import CDBLayer
+    from psycopg2.extensions import connection as pyconn
 
 import psycopg2, psycopg2.sql as pysql
-from psycopg2.extras import NamedTupleCursor
+from psycopg2.extras import NamedTupleCursor, Json
 
+from ...gui_db_connector.functions import conn_functions as conn_f
 from ...shared.dataTypes import BBoxType
 from ...shared.functions import general_functions as gen_f
 
@@ -272,17 +274,19 @@ def list_lookup_tables(dlg: CDB4LoaderDialog) -> Union[tuple[str, ...], tuple[()
 
 def compute_cdb_schema_extents(dlg: CDB4LoaderDialog) -> tuple[bool, float, float, float, float, int]:
     """Calls the qgis_pkg function that computes the cdb_schema extents.
+    The extents cached in the usr_schema are reused, unless table cityobject was changed in the meantime.
 
     *   :returns: is_geom_null, x_min, y_min, x_max, y_max, srid
         :rtype: tuple[bool, float, float, float, float, int]
     """
     # Prepar query to execute server function to compute the schema's extents
     query = pysql.SQL("""
-        SELECT * FROM {_qgis_pkg_schema}.compute_cdb_schema_extents({_cdb_schema},{_is_geographic});
+        SELECT * FROM {_qgis_pkg_schema}.compute_cdb_schema_extents({_cdb_schema},{_is_geographic},{_usr_schema});
         """).format(
         _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
         _cdb_schema = pysql.Literal(dlg.CDB_SCHEMA),
-        _is_geographic = pysql.Literal(dlg.CRS_is_geographic)
+        _is_geographic = pysql.Literal(dlg.CRS_is_geographic),
+        _usr_schema = pysql.Literal(dlg.USR_SCHEMA)
         )
 
     try:
@@ -305,45 +309,221 @@ def compute_cdb_schema_extents(dlg: CDB4LoaderDialog) -> tuple[bool, float, floa
         dlg.conn.rollback()
 
 
-def exec_gview_counter(dlg: CDB4LoaderDialog, layer: CDBLayer) -> int:
-    """Calls the qgis_pkg function that counts the number of geometry objects found within the selected extents.
+def exec_gview_counter_bulk(dlg: CDB4LoaderDialog, layers: list[CDBLayer]) -> bool:
+    """Calls the qgis_pkg function that counts the number of geometry objects found within the selected extents,
+    for all the given layers at once. The results are stored in layer.n_selected.
 
-    *   :returns: Number of objects.
-        :rtype: int
+    *   :returns: Whether the layers were counted successfully.
+        :rtype: bool
     """
     # Convert QgsRectanlce into WKT polygon format
     extents = dlg.CURRENT_EXTENTS.asWktPolygon()
     
     # Prepare query to execute server function to get the number of objects in extents.
     query = pysql.SQL("""
-        SELECT {_qgis_pkg_schema}.gview_counter({_usr_schema},{_cdb_schema},{_gv_name},{_extents});
+        SELECT gv_name, n_selected FROM {_qgis_pkg_schema}.gview_counter_bulk({_usr_schema},{_cdb_schema},{_gv_names},{_extents});
         """).format(
         _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
         _usr_schema = pysql.Literal(dlg.USR_SCHEMA),
         _cdb_schema = pysql.Literal(dlg.CDB_SCHEMA),
-        _gv_name = pysql.Literal(layer.gv_name),  
+        _gv_names = pysql.Literal([layer.gv_name for layer in layers]),
         _extents = pysql.Literal(extents)
         )
 
     try:
         with dlg.conn.cursor() as cur:
             cur.execute(query)
-            count = cur.fetchone()[0] # Tuple has trailing comma.
+            res = cur.fetchall()
         dlg.conn.commit()
 
-        # Assign the result to the view object.
-        layer.n_selected = count
-        return count
+        # Assign the results to the view objects (gviews not found are left with 0).
+        counts: dict = dict(res)
+        layer: CDBLayer
+        for layer in layers:
+            layer.n_selected = counts.get(layer.gv_name, 0)
+        return True
+
+    except (Exception, psycopg2.Error) as error:
+        gen_f.critical_log(
+            func=exec_gview_counter_bulk,
+            location=FILE_LOCATION,
+            header=f"Counting number of geometries objects in {len(layers)} layers",
+            error=error)
+        dlg.conn.rollback()
+
+
+def exec_gview_delta(dlg: CDB4LoaderDialog, extents: str = None) -> Optional[tuple]:
+    """Calls the qgis_pkg function that lists, for each gview (and shared root geometries), the features
+    that were inserted/modified (themselves or their child features) or deleted in the cdb_schema
+    since the last refresh.
+
+    *   :param extents: WKT polygon to count only the changes within it (None: everywhere)
+        :type extents: str
+
+    *   :returns: The time (of the database) at which the changes were listed, and the list of tuples
+            (gv_name, n_features, n_modified, n_deleted, co_ids). Counters and co_ids are None if they
+            could not be determined. The co_ids are never limited to the extents.
+        :rtype: tuple[datetime, list[tuple]]
+    """
+    query = pysql.SQL("""
+        SELECT gv_name, n_features, n_modified, n_deleted, co_ids FROM {_qgis_pkg_schema}.gview_delta({_usr_schema},{_cdb_schema},{_extents});
+        """).format(
+        _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
+        _usr_schema = pysql.Literal(dlg.USR_SCHEMA),
+        _cdb_schema = pysql.Literal(dlg.CDB_SCHEMA),
+        _extents = pysql.Literal(extents)
+        )
+
+    try:
+        with dlg.conn.cursor() as cur:
+            # The changes made after this time are left to the next refresh.
+            cur.execute("SELECT clock_timestamp();")
+            delta_start = cur.fetchone()[0]
+            cur.execute(query)
+            res = cur.fetchall()
+        dlg.conn.commit()
+        return delta_start, res
+
+    except (Exception, psycopg2.Error) as error:
+        gen_f.critical_log(
+            func=exec_gview_delta,
+            location=FILE_LOCATION,
+            header=f"Listing changed features since the last refresh of the layers of schema {dlg.CDB_SCHEMA}",
+            error=error)
+        dlg.conn.rollback()
+
+
+def count_gviews_to_populate(dlg: CDB4LoaderDialog) -> int:
+    """SQL query that counts the gviews of the current cdb_schema that are queued
+    to be populated in the background, or whose population was interrupted.
+
+    *   :returns: Number of gviews to populate (None if the query fails)
+        :rtype: int
+    """
+    query = pysql.SQL("""
+        SELECT count(*) FROM {_usr_schema}.layer_metadata
+        WHERE cdb_schema = {_cdb_schema} AND gv_state IN ('queued', 'populating');
+        """).format(
+        _usr_schema = pysql.Identifier(dlg.USR_SCHEMA),
+        _cdb_schema = pysql.Literal(dlg.CDB_SCHEMA)
+        )
+
+    try:
+        with dlg.conn.cursor() as cur:
+            cur.execute(query)
+            res = cur.fetchone()[0]
+        dlg.conn.commit()
+        return res
 
     except (Exception, psycopg2.Error) as error:
         gen_f.critical_log(
-            func=exec_gview_counter,
+            func=count_gviews_to_populate,
             location=FILE_LOCATION,
-            header=f"Counting number of geometries objects in layer {layer.layer_name} (via gview {layer.gv_name})",
+            header=f"Counting layers to populate of schema {dlg.CDB_SCHEMA}",
             error=error)
         dlg.conn.rollback()
 
 
+def set_session_parallel_query(conn: pyconn, n_workers: int) -> None:
+    """SQL query that sets the parallel query parameters of the session (e.g. of a worker connection),
+    so that the server can use up to n_workers processes to create or refresh each gview.
+    Nothing is changed if n_workers is 0, i.e. the server settings are used.
+    The parameters are reset when the connection is given back to the connection pool.
+    """
+    if not n_workers:
+        return None
+
+    query = pysql.SQL("""
+        SET max_parallel_workers_per_gather = {_n_workers};
+        SET parallel_setup_cost = 100;
+        """).format(
+        _n_workers = pysql.Literal(n_workers)
+        )
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute(query)
+        conn.commit()
+
+    except (Exception, psycopg2.Error) as error:
+        gen_f.critical_log(
+            func=set_session_parallel_query,
+            location=FILE_LOCATION,
+            header="Setting the parallel query parameters of the session",
+            error=error)
+        conn.rollback()
+
+
+def refresh_root_geom_caches(dlg: CDB4LoaderDialog, conn: pyconn, gv_names: list[str], is_concurrent: bool = False,
+                             deltas: Optional[dict] = None, delta_start = None) -> Optional[dict]:
+    """SQL query that refreshes the shared root geometries (e.g. '_rg_citydb_bdg') that the given gviews
+    select from. They must be refreshed before the gviews. The caches that none of the given gviews
+    selects from are not refreshed. If the changed owners (co_ids) of a cache are in deltas, only
+    their rows are replaced (see qgis_pkg.refresh_gview_delta()). Otherwise, it is refreshed in full,
+    without locking out its readers if is_concurrent (see qgis_pkg.refresh_gview()).
+
+    *   :param deltas: The co_ids to refresh, by gview (or cache) name, as listed by exec_gview_delta().
+            None: refresh in full.
+        :type deltas: dict[str, list[int]]
+
+    *   :param delta_start: The time (of the database) at which the deltas were listed
+        :type delta_start: datetime
+
+    *   :returns: The time (of the database) up to which the cache contains the changes, by gview name,
+            for the gviews selecting from a cache (None if the refresh failed).
+            The gviews selecting from a cache do not contain the changes made after it.
+        :rtype: dict[str, datetime]
+    """
+    # The caches are found through the dependencies of the gviews (of their definition views) on them.
+    query = pysql.SQL("""
+        SELECT rg_name, array_agg(gv_name) AS gv_names
+        FROM {_qgis_pkg_schema}.list_gview_root_geoms({_usr_schema})
+        WHERE gv_name = ANY({_gv_names}::varchar[])
+        GROUP BY rg_name
+        ORDER BY rg_name;
+        """).format(
+        _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
+        _usr_schema = pysql.Literal(dlg.USR_SCHEMA),
+        _gv_names = pysql.Literal(list(gv_names))
+        )
+
+    try:
+        rg_starts: dict = {}
+        with conn.cursor() as cur:
+            cur.execute(query)
+            rg_deps = cur.fetchall()
+            for rg_name, rg_gv_names in rg_deps:
+                rg_co_ids = deltas.get(rg_name) if deltas else None
+                if rg_co_ids is not None and delta_start:
+                    rg_start = delta_start
+                    cur.execute(pysql.SQL("SELECT {_qgis_pkg_schema}.refresh_gview_delta({_usr_schema}, {_rg_name}, {_co_ids}::bigint[]);").format(
+                        _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
+                        _usr_schema = pysql.Literal(dlg.USR_SCHEMA),
+                        _rg_name = pysql.Literal(rg_name),
+                        _co_ids = pysql.Literal(list(rg_co_ids))))
+                else:
+                    cur.execute("SELECT clock_timestamp();")
+                    rg_start = cur.fetchone()[0]
+                    cur.execute(pysql.SQL("SELECT {_qgis_pkg_schema}.refresh_gview({_usr_schema}, {_rg_name}, {_is_concurrent});").format(
+                        _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
+                        _usr_schema = pysql.Literal(dlg.USR_SCHEMA),
+                        _rg_name = pysql.Literal(rg_name),
+                        _is_concurrent = pysql.Literal(is_concurrent)))
+                for gv_name in rg_gv_names:
+                    rg_starts[gv_name] = rg_start
+        conn.commit()
+        return rg_starts
+
+    except (Exception, psycopg2.Error) as error:
+        gen_f.critical_log(
+            func=refresh_root_geom_caches,
+            location=FILE_LOCATION,
+            header=f"Refreshing the root geometries of schema {dlg.CDB_SCHEMA}",
+            error=error)
+        conn.rollback()
+        return None
+
+
 def has_layers_for_cdb_schema(dlg: CDB4LoaderDialog) -> bool:
     """Calls the qgis_pkg function that determines whether the {usr_schema} has layers
     regarding the current {cdb_schema}.
@@ -640,6 +820,82 @@ def list_CityGML_codelist_set_names(dlg: CDB4LoaderDialog) -> Union[tuple[str, .
         dlg.conn.rollback()
 
 
+def get_layers_geometry_metadata(dlg: CDB4LoaderDialog, layer_names: list[str]) -> dict[str, tuple[str, int]]:
+    """SQL query that reads the geometry type and srid of the geometry column of the given layers (views)
+    of the usr_schema from the catalog, all at once.
+
+    *   :returns: Dictionary of (geometry type, srid) by layer name, e.g. {'citydb_bdg_lod2': ('MULTIPOLYGONZ', 28992)}
+        :rtype: dict
+    """
+    query = pysql.SQL("""
+        SELECT gc.f_table_name::varchar, concat(gc.type, CASE WHEN gc.coord_dimension = 4 THEN 'ZM' WHEN gc.coord_dimension = 3 AND right(gc.type, 1) <> 'M' THEN 'Z' END), gc.srid
+        FROM geometry_columns AS gc
+        WHERE gc.f_table_schema = {_usr_schema} AND gc.f_geometry_column = 'geom' AND gc.f_table_name = ANY({_layer_names}::varchar[]);
+        """).format(
+        _usr_schema = pysql.Literal(dlg.USR_SCHEMA),
+        _layer_names = pysql.Literal(layer_names)
+        )
+
+    try:
+        with dlg.conn.cursor() as cur:
+            cur.execute(query)
+            res = cur.fetchall()
+        dlg.conn.commit()
+        # Generic 'GEOMETRY' columns are left to the provider
+        return {r[0]: (r[1], r[2]) for r in res if r[1] and not r[1].startswith("GEOMETRY") and r[2]}
+
+    except (Exception, psycopg2.Error) as error:
+        gen_f.critical_log(
+            func=get_layers_geometry_metadata,
+            location=FILE_LOCATION,
+            header=f"Retrieving the geometry metadata of the layers of schema {dlg.USR_SCHEMA}",
+            error=error)
+        dlg.conn.rollback()
+
+
+def exec_upd_atts_bulk(dlg: CDB4LoaderDialog, cdb_schema: str, class_name: str, changes: list[dict]) -> int:
+    """Calls the qgis_pkg function that updates the attributes of many features of the same class
+    with set-based statements, instead of firing the update trigger of the view once per feature.
+    A connection is borrowed from the pool, as the layer may be edited after the dialog was closed.
+
+    *   :param changes: One dictionary per feature, with the 'id' and only the changed attributes
+        :type changes: list[dict]
+
+    *   :returns: Number of updated features (None if the update failed)
+        :rtype: int
+    """
+    query = pysql.SQL("""
+        SELECT count(*) FROM {_qgis_pkg_schema}.upd_atts_bulk({_cdb_schema},{_class_name},%(changes)s);
+        """).format(
+        _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
+        _cdb_schema = pysql.Literal(cdb_schema),
+        _class_name = pysql.Literal(class_name)
+        )
+
+    conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(Update attributes)"]))
+    if not conn:
+        return None
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute(query, {"changes": Json(changes)})
+            n_updated = cur.fetchone()[0]
+        conn.commit()
+        return n_updated
+
+    except (Exception, psycopg2.Error) as error:
+        gen_f.critical_log(
+            func=exec_upd_atts_bulk,
+            location=FILE_LOCATION,
+            header=f"Updating the attributes of {len(changes)} features of class {class_name} in schema {cdb_schema}",
+            error=error)
+        conn.rollback()
+        return None
+
+    finally:
+        conn_f.release_db_connection(conn=conn)
+
+
 # def fetch_ADE_codelist_set_names(dlg: CDB4LoaderDialog) -> list:
 #     """SQL query that retrieves the codelist set names to fill the codelist selection box 
     
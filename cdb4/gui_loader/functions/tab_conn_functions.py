@@ -233,8 +233,9 @@ def check_layers_status(dlg: CDB4LoaderDialog) -> bool:
 
         # Now check whether layers were already refreshed/populated
         refresh_date = sql.get_layer_metadata(dlg=dlg, cols_list=["refresh_date"])
-        # Extract a date.
-        date = list(set(refresh_date[1]))[0][0]
+        # Extract the latest date (some layers may still be waiting to be populated in the background).
+        dates = [i[0] for i in refresh_date[1] if i[0]]
+        date = max(dates) if dates else None
 
         if not date:  # The layers do already exist but were NOT (yet) refreshed/populated
             # Set the labels in the connection tab
@@ -8,10 +8,12 @@ if TYPE_CHECKING:
     from ..other_classes import FeatureType, CDBDetailView, EnumConfig 
 
 from collections import OrderedDict
+from qgis.PyQt.QtCore import Qt, QTimer, QVariant, QDate, QDateTime
 from qgis.core import (QgsProject, QgsMessageLog, QgsEditorWidgetSetup, 
                         QgsVectorLayer, QgsDataSourceUri, QgsAttributeEditorElement,
                         QgsAttributeEditorRelation, Qgis, QgsLayerTreeGroup,
-                        QgsRelation, QgsAttributeEditorContainer, QgsMapLayer, QgsLayerTreeLayer)
+                        QgsRelation, QgsAttributeEditorContainer, QgsMapLayer, QgsLayerTreeLayer,
+                        QgsFeatureRequest, QgsWkbTypes, QgsRectangle, QgsCoordinateReferenceSystem)
 
 from ..other_classes import CDBLayer, CodeListConfig
 from .. import loader_constants as c
@@ -64,6 +66,7 @@ def add_layers_to_feature_type_registry(dlg: CDB4LoaderDialog) -> None:
 
     # Format metadata into a list of dictionaries where each element is a layer.
     layer_metadata_dict_items: list = [dict(zip(col_names, values)) for values in layer_metadata]
+    layers: list[CDBLayer] = []
 
     for layer_metadata_dict_item in layer_metadata_dict_items:
         # keys: id, cdb_schema, layer_type, feature_type, lod, root_class, curr_class, layer_name, 
@@ -80,8 +83,7 @@ def add_layers_to_feature_type_registry(dlg: CDB4LoaderDialog) -> None:
         # Create a Layer object with all the values extracted from 'layer_metadata'.
         layer = CDBLayer(*layer_metadata_dict_item.values())
 
-        # Count the number of features that the layer has in the current extents.
-        sql.exec_gview_counter(dlg=dlg, layer=layer) # Stores number in layer.n_selected.
+        layers.append(layer)
 
         # Get the FeatureType object of the current layer
         curr_FeatureType: FeatureType = dlg.FeatureTypesRegistry[layer_metadata_dict_item['feature_type']]
@@ -89,6 +91,22 @@ def add_layers_to_feature_type_registry(dlg: CDB4LoaderDialog) -> None:
         # Add the view to the FeatureObject views list
         curr_FeatureType.layers.append(layer)
 
+    # Count the number of features that the layers have in the current extents.
+    # Cached counts are reused, the others are all counted in one call.
+    layers_to_count: list[CDBLayer] = []
+    for layer in layers:
+        n_selected = dlg.GViewCountCache.get(dlg.GViewCountCache.make_key(dlg.USR_SCHEMA, layer, dlg.CURRENT_EXTENTS))
+        if n_selected is None:
+            layers_to_count.append(layer)
+        else:
+            layer.n_selected = n_selected
+
+    if layers_to_count:
+        is_counted = sql.exec_gview_counter_bulk(dlg=dlg, layers=layers_to_count) # Stores numbers in layer.n_selected.
+        if is_counted:
+            for layer in layers_to_count:
+                dlg.GViewCountCache.put(dlg.GViewCountCache.make_key(dlg.USR_SCHEMA, layer, dlg.CURRENT_EXTENTS), layer.n_selected)
+
     return None
 
 
@@ -795,21 +813,26 @@ def add_detail_view_tables_to_ToC(dlg: CDB4LoaderDialog) -> None:
     return None
 
 
-def create_qgis_vector_layer(dlg: CDB4LoaderDialog, layer_name: str) -> QgsVectorLayer:
-    """Function that creates a PostgreSQL layer based on the input layer name. This function is used to import
-    updatable views from the usr_schema queried to the selected spatial extents.
+def create_qgis_vector_layer_uri(dlg: CDB4LoaderDialog, layer_name: str, geom_type: str = None, srid: int = None) -> str:
+    """Function that creates the datasource uri of a PostgreSQL layer based on the input layer name.
+    The uri points to the updatable view in the usr_schema, queried to the selected spatial extents.
 
-    *   :param v_name: View name to connect to server.
-        :type v_name: str
+    *   :param layer_name: View name to connect to server.
+        :type layer_name: str
 
-    *   :returns: the created layer object
-        :rtype: QgsVectorLayer
+    *   :param geom_type: Geometry type of the view (e.g. 'MULTIPOLYGONZ'), if already known (see sql.get_layers_geometry_metadata)
+        :type geom_type: str
+
+    *   :param srid: Srid of the geometry column of the view, if already known
+        :type srid: int
+
+    *   :returns: the datasource uri
+        :rtype: str
     """
     # Shorten the variable names.
     db = dlg.DB
     usr_schema = dlg.USR_SCHEMA
     extents = dlg.QGIS_EXTENTS.asWktPolygon()
-    crs = dlg.CRS
 
     uri = QgsDataSourceUri()
     uri.setConnection(aHost=db.host, aPort=db.port, aDatabase=db.database_name, aUsername=db.username, aPassword=db.password)
@@ -820,18 +843,134 @@ def create_qgis_vector_layer(dlg: CDB4LoaderDialog, layer_name: str) -> QgsVecto
     else:
         uri.setDataSource(aSchema=usr_schema, aTable=layer_name, aGeometryColumn="geom", aSql=f"ST_GeomFromText('{extents}') && geom", aKeyColumn="id")
 
-    new_layer = QgsVectorLayer(uri.uri(False), layer_name, "postgres")
+    # Spare the postgres provider the queries to the catalog and to the view when opening the layer.
+    if geom_type and srid:
+        uri.setWkbType(QgsWkbTypes.parseType(geom_type))
+        uri.setSrid(str(srid))
+    uri.setUseEstimatedMetadata(True)
+    # The ids of the views are the primary keys of the underlying tables.
+    uri.setParam("checkPrimaryKeyUnicity", "0")
+
+    return uri.uri(False)
+
+
+def open_qgis_vector_layer(uri: str, layer_name: str, crs: QgsCoordinateReferenceSystem) -> QgsVectorLayer:
+    """Function that opens a PostgreSQL layer from its datasource uri (see create_qgis_vector_layer_uri).
+    It can be called from a background thread.
+    The layer extents are left to the provider, which estimates them (see setUseEstimatedMetadata):
+    the features crossing the border of the bbox of the gviews can lie partly outside of it.
+
+    *   :returns: the created layer object
+        :rtype: QgsVectorLayer
+    """
+    options = QgsVectorLayer.LayerOptions()
+    # The layers are styled with the qml files of the plugin: no need to look for a default style in the database.
+    options.loadDefaultStyle = False
+
+    new_layer = QgsVectorLayer(uri, layer_name, "postgres", options)
     new_layer.setCrs(crs)
 
     return new_layer
+
+
+def create_qgis_vector_layer(dlg: CDB4LoaderDialog, layer_name: str) -> QgsVectorLayer:
+    """Function that creates a PostgreSQL layer based on the input layer name. This function is used to import
+    updatable views from the usr_schema queried to the selected spatial extents.
+
+    *   :param layer_name: View name to connect to server.
+        :type layer_name: str
+
+    *   :returns: the created layer object
+        :rtype: QgsVectorLayer
+    """
+    new_layer = open_qgis_vector_layer(create_qgis_vector_layer_uri(dlg, layer_name=layer_name), layer_name=layer_name, crs=dlg.CRS)
+
+    return new_layer
     
 
-def add_selected_layers_to_ToC(dlg: CDB4LoaderDialog, layers: list[CDBLayer]) -> int:
+def commit_attribute_changes_in_bulk(dlg: CDB4LoaderDialog, layer: QgsVectorLayer, cdb_layer: CDBLayer) -> None:
+    """Function connected to the beforeCommitChanges signal of the layers. If the edit buffer contains only
+    attribute changes of many features, they are written with a single call to qgis_pkg.upd_atts_bulk()
+    instead of firing the update trigger of the view once per feature, and the edit buffer is then emptied.
+    Otherwise (or if the bulk update fails) nothing is done, and QGIS commits the changes as usual.
+
+    The bulk update runs on a connection of the plugin, not on the one of the layer: it is therefore skipped
+    if the layer is part of a transaction group, whose open transaction may hold locks on the rows to update.
+    """
+    edit_buffer = layer.editBuffer()
+    if not edit_buffer:
+        return None
+
+    if layer.dataProvider().transaction() is not None:
+        return None # Exit, the changes must be written in the transaction of the layer
+    project = QgsProject.instance()
+    if hasattr(project, "transactionMode"): # QGIS >= 3.26
+        if project.transactionMode() != Qgis.TransactionMode.Disabled: # Automatic or buffered transaction groups
+            return None
+    elif project.autoTransaction():
+        return None
+
+    if any((edit_buffer.addedFeatures(), edit_buffer.deletedFeatureIds(), edit_buffer.changedGeometries(),
+            edit_buffer.addedAttributes(), edit_buffer.deletedAttributeIds())):
+        return None # Exit, not only attribute changes
+
+    changed_values: dict = edit_buffer.changedAttributeValues()
+    if len(changed_values) < c.BULK_EDIT_MIN_FEATURES:
+        return None # Exit, the triggers are fast enough
+
+    # The feature ids of QGIS are not necessarily the ids in the database
+    fields = layer.fields()
+    id_idx: int = fields.indexOf("id")
+    request = QgsFeatureRequest().setFilterFids(list(changed_values.keys())).setFlags(QgsFeatureRequest.Flag.NoGeometry).setSubsetOfAttributes([id_idx])
+    co_ids: dict = {feat.id(): feat.attribute(id_idx) for feat in layer.dataProvider().getFeatures(request)}
+
+    def to_db_value(value):
+        if value is None or (isinstance(value, QVariant) and value.isNull()):
+            return None
+        if isinstance(value, QDateTime):
+            return value.toString(Qt.DateFormat.ISODateWithMs)
+        if isinstance(value, QDate):
+            return value.toString(Qt.DateFormat.ISODate)
+        if isinstance(value, (list, tuple)):
+            # As in the update triggers: duplicates are removed and the values joined with '--/\--'
+            values = sorted(set(str(v) for v in value if to_db_value(v) is not None))
+            return "--/\\--".join(values) if values else None
+        return value
+
+    changes: list = []
+    for fid, atts in changed_values.items():
+        if fid not in co_ids:
+            return None # Exit, let QGIS deal with it
+        change: dict = {fields.at(idx).name(): to_db_value(value) for idx, value in atts.items()}
+        change["id"] = co_ids[fid]
+        changes.append(change)
+
+    n_updated = sql.exec_upd_atts_bulk(dlg, cdb_schema=cdb_layer.cdb_schema, class_name=cdb_layer.curr_class, changes=changes)
+    if n_updated is None:
+        msg: str = f"Layer {cdb_layer.layer_name}: bulk update of the attributes failed, the changes are saved feature by feature"
+        QgsMessageLog.logMessage(message=msg, tag=dlg.PLUGIN_NAME, level=Qgis.MessageLevel.Warning, notifyUser=True)
+        return None
+
+    # The changes are already in the database: empty the edit buffer and reload the layer afterwards
+    edit_buffer.rollBack()
+    QTimer.singleShot(0, layer.reload)
+
+    msg: str = f"Layer {cdb_layer.layer_name}: attributes of {n_updated} features updated in bulk"
+    QgsMessageLog.logMessage(message=msg, tag=dlg.PLUGIN_NAME, level=Qgis.MessageLevel.Info, notifyUser=False)
+
+    return None
+
+
+def add_selected_layers_to_ToC(dlg: CDB4LoaderDialog, layers: list[CDBLayer], qgs_layers: dict[str, QgsVectorLayer] = None) -> int:
     """Function to imports the selected layer(s) in the user's qgis project.
 
     *   :param layers: A list containing View object that correspond to the server views.
         :type layers: list(CDBLayer)
 
+    *   :param qgs_layers: The layers already created in the background (see ImportLayersTask), by layer name.
+            The missing ones are created here.
+        :type qgs_layers: dict(str, QgsVectorLayer)
+
     *   :returns: The number of actually imported layers (excluding those already loaded)
         :rtype: int
 
@@ -922,7 +1061,9 @@ def add_selected_layers_to_ToC(dlg: CDB4LoaderDialog, layers: list[CDBLayer]) ->
         # Build the Table of Contents Tree or Restructure it.
         node_lod = add_layer_node_to_ToC(dlg, layer)
 
-        new_layer: QgsVectorLayer = create_qgis_vector_layer(dlg, layer_name=layer.layer_name)
+        new_layer: QgsVectorLayer = qgs_layers.get(layer.layer_name) if qgs_layers else None
+        if new_layer is None:
+            new_layer = create_qgis_vector_layer(dlg, layer_name=layer.layer_name)
 
         if new_layer or new_layer.isValid(): # Success
             pass
@@ -934,6 +1075,9 @@ def add_selected_layers_to_ToC(dlg: CDB4LoaderDialog, layers: list[CDBLayer]) ->
         # Set the layer as read-only if the current cdb_schema is read only
         if dlg.CDBSchemaPrivileges == "ro":
             new_layer.setReadOnly()
+        elif layer.curr_class != "Address" and not layer.ade_prefix:
+            # Mass attribute edits are saved with set-based updates (see commit_attribute_changes_in_bulk())
+            new_layer.beforeCommitChanges.connect(lambda *args, qgs_layer=new_layer, cdb_layer=layer: commit_attribute_changes_in_bulk(dlg, layer=qgs_layer, cdb_layer=cdb_layer))
 
         ###########################################################################################
         # To use "normal" (old) forms, simply set the value to FALSE in the dlg.settings.
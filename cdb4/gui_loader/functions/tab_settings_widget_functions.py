@@ -26,6 +26,7 @@ def tabSettings_reset(dlg: CDB4LoaderDialog) -> None:
     dlg.tabSettings.setDisabled(True)
     gbxGeomSimp_reset(dlg)
     gbxLayerOptions_reset(dlg)
+    gbxPerformance_reset(dlg)
     gbxMisc_reset(dlg)
 
     return None
@@ -51,6 +52,21 @@ def gbxLayerOptions_reset(dlg: CDB4LoaderDialog) -> None:
     return None
 
 
+def gbxPerformance_reset(dlg: CDB4LoaderDialog) -> None:
+    """Function to reset the 'Performance' groupbox to the DEFAULT values
+    """
+    dlg.qspbRefreshJobs.setValue(dlg.settings.refresh_jobs_default)
+    dlg.cbxRefreshIncremental.setChecked(dlg.settings.refresh_incremental_default)
+    dlg.qspbRefreshDeltaMax.setValue(dlg.settings.refresh_delta_max_default)
+    dlg.qspbCreateJobs.setValue(dlg.settings.create_jobs_default)
+    dlg.cbxPopulateOnCreate.setChecked(dlg.settings.populate_on_create_default)
+    dlg.qspbParallelWorkers.setValue(dlg.settings.parallel_workers_default)
+    dlg.cbxRefreshConcurrently.setChecked(dlg.settings.refresh_concurrently_default)
+    dlg.cbxRefreshArea.setChecked(dlg.settings.refresh_area_default)
+
+    return None
+
+
 def gbxMisc_reset(dlg: CDB4LoaderDialog) -> None:
     """Function to reset the 'Miscellaneous option' groupbox to the DEFAULT values
     """
@@ -18,13 +18,17 @@ heavy process. In the main thread the progress bar is assigned to
 update following the heavy process taking place in the worker thread.
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 if TYPE_CHECKING:       
     from ...gui_loader.loader_dialog import CDB4LoaderDialog
+    from ..other_classes import CDBLayer
 
 import time
+import queue
+import threading
+import concurrent.futures
 from qgis.PyQt.QtCore import QObject, QThread, pyqtSignal
-from qgis.core import Qgis, QgsMessageLog
+from qgis.core import Qgis, QgsMessageLog, QgsApplication, QgsTask, QgsVectorLayer, QgsProject, QgsCoordinateReferenceSystem
 import psycopg2, psycopg2.sql as pysql
 
 from ...gui_db_connector.functions import conn_functions as conn_f
@@ -32,6 +36,7 @@ from ...shared.dataTypes import BBoxType
 from ...shared.functions import general_functions as gen_f
 from .. import loader_constants as c
 from . import tab_conn_functions as tc_f
+from . import tab_layers_functions as tl_f
 from . import sql
 
 FILE_LOCATION = gen_f.get_file_relative_path(file=__file__)
@@ -56,7 +61,16 @@ def run_create_layers_thread(dlg: CDB4LoaderDialog) -> None:
     # Create new thread object.
     dlg.thread = QThread()
     # Instantiate worker object for the operation.
-    dlg.worker = CreateLayersWorker(dlg)
+    # The settings are read here, as the widgets must not be accessed from the worker thread.
+    dlg.worker = CreateLayersWorker(dlg,
+        n_jobs=dlg.qspbCreateJobs.value(),
+        n_parallel_workers=dlg.qspbParallelWorkers.value(),
+        populate_on_create=dlg.cbxPopulateOnCreate.isChecked(),
+        is_feat_sel=dlg.gbxFeatSel.isChecked(),
+        is_geom_simp=dlg.gbxGeomSimp.isChecked(),
+        decimal_prec=dlg.qspbDecimalPrec.value(),
+        min_area=dlg.qspbMinArea.value(),
+        force_layer_gen=dlg.cbxForceLayerGen.isChecked())
     # Move worker object to the be executed on the new thread.
     dlg.worker.moveToThread(dlg.thread)
 
@@ -105,6 +119,10 @@ def run_create_layers_thread(dlg: CDB4LoaderDialog) -> None:
     dlg.worker.sig_success.connect(lambda: evt_create_layers_success(dlg))
     dlg.worker.sig_fail.connect(lambda: evt_create_layers_fail(dlg))
 
+    # Populate the new layers in the background, if requested (they are queued only if all layers and detail views were created)
+    if dlg.worker.populate_on_create:
+        dlg.thread.finished.connect(lambda: run_populate_layers_thread(dlg))
+
     #-SIGNALS (end) #######################################################
 
     # Initiate worker thread
@@ -120,12 +138,25 @@ class CreateLayersWorker(QObject):
     sig_success = pyqtSignal()
     sig_fail = pyqtSignal()
 
-    def __init__(self, dlg: CDB4LoaderDialog):
+    def __init__(self, dlg: CDB4LoaderDialog, n_jobs: int, n_parallel_workers: int, populate_on_create: bool,
+                 is_feat_sel: bool, is_geom_simp: bool, decimal_prec: int, min_area: float, force_layer_gen: bool):
         super().__init__()
         self.dlg = dlg
+        self.n_jobs = n_jobs
+        self.n_parallel_workers = n_parallel_workers
+        self.populate_on_create = populate_on_create
+        self.is_feat_sel = is_feat_sel
+        self.is_geom_simp = is_geom_simp
+        self.decimal_prec = decimal_prec
+        self.min_area = min_area
+        self.force_layer_gen = force_layer_gen
 
     def create_layers_thread(self):
         """Execution method that creates the layers using function from the 'qgis_pkg' installation.
+
+        The feature types are independent from each other, therefore their layers are created by a bounded
+        pool of worker connections (see setting 'create_jobs'). The writes to table layer_metadata are serialized
+        in the database. The detail views are created at the end, once all layers exist.
         """
         dlg = self.dlg
 
@@ -134,7 +165,7 @@ class CreateLayersWorker(QObject):
 
         funcs_list: list[str] = []
         # ft: FeatureType
-        if dlg.gbxFeatSel.isChecked():
+        if self.is_feat_sel:
             # Update the FeatureTypeMetadata with the information about the selected ones
             for ft in dlg.FeatureTypesRegistry.values():
                 if ft.is_selected and ft.name != "CityObjectGroup":
@@ -155,6 +186,9 @@ class CreateLayersWorker(QObject):
         # Set progress bar goal
         dlg.bar.setMaximum(n_iter_steps)
 
+        # Degree of parallelism: never open more connections than feature types to process.
+        n_jobs: int = max(1, min(self.n_jobs, len(funcs_list)))
+
         bbox: str
         if dlg.LAYER_EXTENTS == dlg.CDB_SCHEMA_EXTENTS:
             bbox = None
@@ -170,53 +204,83 @@ class CreateLayersWorker(QObject):
         params = [
             dlg.DB.username,
             dlg.CDB_SCHEMA,
-            int(dlg.gbxGeomSimp.isChecked()), # 0 (False) or 1 (True)
-            dlg.qspbDecimalPrec.value(),
-            dlg.qspbMinArea.value(),
+            int(self.is_geom_simp),          # 0 (False) or 1 (True)
+            self.decimal_prec,
+            self.min_area,
             bbox,
             dlg.CRS_is_geographic,           # True or False
-            dlg.cbxForceLayerGen.isChecked() # True or False
+            self.force_layer_gen             # True or False
             ]
 
-        try:
-            # Open new temp session
-            temp_conn = conn_f.open_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(Create layers and detail views)"]))
-            with temp_conn:
-
-                # Start measuring time
-                time_start = time.time()
-
-                # 1) Create the layers 
-                for step, module_func in enumerate(funcs_list, start=1):
-
-                    query = pysql.SQL("""
-                                SELECT {_qgis_pkg_schema}.{_module_func}({_params});
-                                """).format(
-                                _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
-                                _module_func = pysql.Identifier(module_func),
-                                _params = pysql.SQL(", ").join(pysql.Placeholder() * len(params))
-                                )
-
-                    # Update progress bar
-                    msg = f"Executing: {module_func}"
-                    self.sig_progress.emit(step, msg)
+        # Pool of worker connections, each one used by one feature type at a time.
+        conn_pool: queue.Queue = queue.Queue()
+        progress_lock = threading.Lock()
+        create_failed = threading.Event() # Set by the first failure: the modules not started yet are skipped
+        step: int = 0
+
+        def create_layers(module_func: str) -> bool:
+            nonlocal step
+            if create_failed.is_set():
+                return False
+            query = pysql.SQL("""
+                        SELECT {_qgis_pkg_schema}.{_module_func}({_params});
+                        """).format(
+                        _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
+                        _module_func = pysql.Identifier(module_func),
+                        _params = pysql.SQL(", ").join(pysql.Placeholder() * len(params))
+                        )
 
-                    try:
-                        with temp_conn.cursor() as cur:
-                            cur.execute(query, params)
-                        temp_conn.commit()
+            worker_conn = conn_pool.get()
+            try:
+                with worker_conn.cursor() as cur:
+                    cur.execute(query, params)
+                worker_conn.commit()
+                is_created = True
+
+            except (Exception, psycopg2.Error) as error:
+                worker_conn.rollback()
+                is_created = False
+                create_failed.set()
+                gen_f.critical_log(
+                    func=self.create_layers_thread,
+                    location=FILE_LOCATION,
+                    header=f"Creating layers ({module_func})",
+                    error=error)
+            finally:
+                conn_pool.put(worker_conn)
+
+            with progress_lock:
+                step += 1
+                # Update progress bar
+                msg = f"Executed: {module_func} ({step}/{len(funcs_list)})"
+                self.sig_progress.emit(step, msg)
 
-                    except (Exception, psycopg2.Error) as error:
-                        temp_conn.rollback()
-                        fail_flag = True
-                        gen_f.critical_log(
-                            func=self.create_layers_thread,
-                            location=FILE_LOCATION,
-                            header="Creating layers",
-                            error=error)
-                        self.sig_fail.emit()
-                        break
+            return is_created
 
+        try:
+            # Open new temp sessions
+            for i in range(n_jobs):
+                worker_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, f"(Create layers and detail views {i+1}/{n_jobs})"]))
+                if not worker_conn:
+                    raise psycopg2.OperationalError("Could not open all connections to create the layers")
+                sql.set_session_parallel_query(conn=worker_conn, n_workers=self.n_parallel_workers)
+                conn_pool.put(worker_conn)
+
+            # Start measuring time
+            time_start = time.time()
+
+            # 1) Create the layers 
+            with concurrent.futures.ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [executor.submit(create_layers, module_func) for module_func in funcs_list]
+                results = [f.result() for f in futures]
+
+            if not all(results):
+                fail_flag = True
+                self.sig_fail.emit()
+
+            # Nothing depends on a partial layer set: once a module has failed, neither the detail views
+            # are created, nor the new layers are queued to be populated.
+            if not fail_flag:
                 # 2) Create the detail views
                 step += 1 
                 query = pysql.SQL("""
@@ -232,6 +296,7 @@ class CreateLayersWorker(QObject):
                 msg = "Creating detail views"
                 self.sig_progress.emit(step, msg)
 
+                temp_conn = conn_pool.get()
                 try:
                     with temp_conn.cursor() as cur:
                         cur.execute(query)
@@ -246,16 +311,45 @@ class CreateLayersWorker(QObject):
                         header="Creating detail views",
                         error=error)
                     self.sig_fail.emit()
+                finally:
+                    conn_pool.put(temp_conn)
+
+            if not fail_flag and self.populate_on_create:
+                # Queue the new (empty) gviews, they will be populated in the background (see PopulateLayersWorker)
+                query = pysql.SQL("""
+                    UPDATE {_usr_schema}.layer_metadata
+                    SET gv_state = 'queued'
+                    WHERE cdb_schema = {_cdb_schema} AND layer_type IN ('VectorLayer', 'VectorLayerNoGeom') AND refresh_date IS NULL;
+                    """).format(
+                    _usr_schema = pysql.Identifier(dlg.USR_SCHEMA),
+                    _cdb_schema = pysql.Literal(dlg.CDB_SCHEMA)
+                    )
+
+                temp_conn = conn_pool.get()
+                try:
+                    with temp_conn.cursor() as cur:
+                        cur.execute(query)
+                    temp_conn.commit()
+
+                except (Exception, psycopg2.Error) as error:
+                    temp_conn.rollback()
+                    gen_f.critical_log(
+                        func=self.create_layers_thread,
+                        location=FILE_LOCATION,
+                        header="Queueing layers to populate",
+                        error=error)
+                finally:
+                    conn_pool.put(temp_conn)
 
-                # Measure elapsed time
-                print(f"Creation of layers and detail views completed in {round((time.time() - time_start), 4)} seconds")
+            # Measure elapsed time
+            print(f"Creation of layers and detail views ({n_jobs} connections) completed in {round((time.time() - time_start), 4)} seconds")
 
         except (Exception, psycopg2.Error) as error:
             fail_flag = True
             gen_f.critical_log(
                 func=self.create_layers_thread,
                 location=FILE_LOCATION,
-                header="Establishibng temporary connection",
+                header="Establishing temporary connections",
                 error=error)
             self.sig_fail.emit()
 
@@ -264,8 +358,9 @@ class CreateLayersWorker(QObject):
             self.sig_success.emit()
         
         self.sig_finished.emit()
-        # Close temp connection
-        temp_conn.close()
+        # Give temp connections back to the pool
+        while not conn_pool.empty():
+            conn_f.release_db_connection(conn=conn_pool.get())
         return None
 
 ###--EVENTS (start)########################################################
@@ -318,7 +413,7 @@ def evt_create_layers_fail(dlg: CDB4LoaderDialog) -> None:
 #####################################################################################
 
 def run_refresh_layers_thread(dlg: CDB4LoaderDialog) -> None:
-    """Function that refreshes the materialized views in the database
+    """Function that refreshes the gviews in the database
     by branching a new Worker thread to execute the operation on.
     """
     for index in range(dlg.vLayoutUserConn.count()):
@@ -333,7 +428,14 @@ def run_refresh_layers_thread(dlg: CDB4LoaderDialog) -> None:
     # Create new thread object.
     dlg.thread = QThread()
     # Instantiate worker object for the operation.
-    dlg.worker = RefreshLayersWorker(dlg)
+    # The settings are read here, as the widgets must not be accessed from the worker thread.
+    dlg.worker = RefreshLayersWorker(dlg,
+        n_jobs=dlg.qspbRefreshJobs.value(),
+        n_parallel_workers=dlg.qspbParallelWorkers.value(),
+        is_concurrent=dlg.cbxRefreshConcurrently.isChecked(),
+        refresh_extents=dlg.CURRENT_EXTENTS.asWktPolygon() if dlg.cbxRefreshArea.isChecked() else None,
+        is_incremental=dlg.cbxRefreshIncremental.isChecked(),
+        delta_max=dlg.qspbRefreshDeltaMax.value())
     # Move worker object to the be executed on the new thread.
     dlg.worker.moveToThread(dlg.thread)
 
@@ -395,12 +497,27 @@ class RefreshLayersWorker(QObject):
     sig_fail = pyqtSignal()
     # sig_success = pyqtSignal()
 
-    def __init__(self, dlg: CDB4LoaderDialog):
+    def __init__(self, dlg: CDB4LoaderDialog, n_jobs: int, n_parallel_workers: int, is_concurrent: bool,
+                 refresh_extents: Optional[str], is_incremental: bool, delta_max: float):
         super().__init__()
         self.dlg = dlg
+        self.n_jobs = n_jobs
+        self.n_parallel_workers = n_parallel_workers
+        self.is_concurrent = is_concurrent
+        self.refresh_extents = refresh_extents # WKT of the current extents, if only the views changed there are refreshed
+        self.is_incremental = is_incremental
+        self.delta_max = delta_max
 
     def refresh_all_gviews_thread(self):
-        """Execution method that refreshes the materialized views in the server (for a specific schema).
+        """Execution method that refreshes the gviews in the server (for a specific schema).
+
+        The views are refreshed by a bounded pool of worker connections (see setting 'refresh_jobs'),
+        starting from the largest ones (according to layer_metadata.n_features). The refresh_date of
+        all successfully refreshed views is updated at the end with a single statement. It is the time
+        at which the refresh of each view (or of the root geometries it selects from) started, so that
+        the changes made during the refresh are still considered as changes by the next refresh.
+        If 'refresh_incremental' is set, unchanged views are skipped, and only the rows of the changed
+        features of the others are replaced (see filter_changed_gviews).
         """
         dlg = self.dlg
         usr_schema = dlg.USR_SCHEMA
@@ -409,68 +526,170 @@ class RefreshLayersWorker(QObject):
         fail_flag: bool = False
 
         # Get feature types from layer_metadata table.
-        cols_to_fetch: list[str] = ["feature_type","gv_name"]
+        cols_to_fetch: list[str] = ["feature_type","gv_name","n_features"]
         col_names, feattype_geom_mview = sql.get_layer_metadata(dlg=dlg, cols_list=cols_to_fetch)
         col_names = None # Discard byproduct.
 
-        # Set progress bar goal
-        dlg.bar.setMaximum(len(feattype_geom_mview))
+        # Largest views first, so that the longest refreshes do not end up at the tail of the queue.
+        feattype_geom_mview = sorted(feattype_geom_mview, key=lambda r: r[2] or 0, reverse=True)
 
-        try:
-            # Open new temp session, reserved for mat refresh.
-            temp_conn = conn_f.open_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(Refresh layers)"]))
-            with temp_conn:
+        deltas: dict = {} # gv_name -> co_ids of the changed features (views not listed are refreshed in full)
+        delta_start = None # time at which the changed features were listed
+        if self.refresh_extents:
+            # Refresh only the views whose features changed within the current extents
+            # (blue box) since their last refresh (see setting 'refresh_area').
+            # All the changes of these views are refreshed, not only those within the extents.
+            feattype_geom_mview, deltas, delta_start = self.filter_changed_gviews(feattype_geom_mview, extents=self.refresh_extents)
+        elif self.is_incremental:
+            # Refresh only the features changed since the last refresh of the views
+            # (see setting 'refresh_incremental'), unless too many features changed.
+            feattype_geom_mview, deltas, delta_start = self.filter_changed_gviews(feattype_geom_mview)
 
-                # Start measuring time
-                time_start = time.time()
+        # Degree of parallelism: never open more connections than views to refresh.
+        n_jobs: int = max(1, min(self.n_jobs, len(feattype_geom_mview)))
 
-                for step, (ftype, mview) in enumerate(feattype_geom_mview):
+        # Set progress bar goal
+        dlg.bar.setMaximum(len(feattype_geom_mview))
 
-                    query = pysql.SQL("""
-                        REFRESH MATERIALIZED VIEW {_usr_schema}.{_gv_name};
-                        """).format(
-                        _usr_schema = pysql.Identifier(usr_schema),
-                        _gv_name = pysql.Identifier(mview)
-                        )
-                    query2 = pysql.SQL("""
-                        UPDATE {_usr_schema}.layer_metadata
-                        SET refresh_date = clock_timestamp()
-                        WHERE gv_name = {_gv_name};
-                        """).format(
-                        _usr_schema = pysql.Identifier(usr_schema),
-                        _gv_name = pysql.Literal(mview)
-                        )
+        # Pool of worker connections, each one used by one refresh at a time.
+        conn_pool: queue.Queue = queue.Queue()
+        refreshed_gviews: dict = {} # gv_name -> time at which its refresh started
+        rg_starts: dict = {} # gv_name -> time at which the refresh of the root geometries it selects from started
+        progress_lock = threading.Lock()
+        step: int = 0
+
+        # Refresh the views without locking out the users reading them (see setting 'refresh_concurrently').
+        is_concurrent: bool = self.is_concurrent
+
+        def refresh_gview(ftype: str, mview: str) -> bool:
+            nonlocal step
+            co_ids = deltas.get(mview)
+            if co_ids is not None:
+                # Replace only the rows of the changed features.
+                query = pysql.SQL("""
+                    SELECT {_qgis_pkg_schema}.refresh_gview_delta({_usr_schema}, {_gv_name}, {_co_ids}::bigint[]);
+                    """).format(
+                    _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
+                    _usr_schema = pysql.Literal(usr_schema),
+                    _gv_name = pysql.Literal(mview),
+                    _co_ids = pysql.Literal(list(co_ids))
+                    )
+            else:
+                query = pysql.SQL("""
+                    SELECT {_qgis_pkg_schema}.refresh_gview({_usr_schema}, {_gv_name}, {_is_concurrent});
+                    """).format(
+                    _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
+                    _usr_schema = pysql.Literal(usr_schema),
+                    _gv_name = pysql.Literal(mview),
+                    _is_concurrent = pysql.Literal(is_concurrent)
+                    )
+
+            worker_conn = conn_pool.get()
+            try:
+                with worker_conn.cursor() as cur:
+                    cur.execute("SELECT clock_timestamp();")
+                    refresh_start = cur.fetchone()[0]
+                    cur.execute(query)
+                worker_conn.commit()
+                # The delta contains the changes made until they were listed.
+                if co_ids is not None:
+                    refresh_start = delta_start
+                # The view is as old as the root geometries it selects from.
+                if mview in rg_starts:
+                    refresh_start = min(refresh_start, rg_starts[mview])
+                is_refreshed = True
+
+            except (Exception, psycopg2.Error) as error:
+                worker_conn.rollback()
+                is_refreshed = False
+                gen_f.critical_log(
+                    func=self.refresh_all_gviews_thread,
+                    location=FILE_LOCATION,
+                    header=f"Refreshing layer {mview}",
+                    error=error)
+            finally:
+                conn_pool.put(worker_conn)
+
+            with progress_lock:
+                step += 1
+                if is_refreshed:
+                    refreshed_gviews[mview] = refresh_start
+                # Update progress bar
+                msg = f"Refreshed {ftype} layers ({step}/{len(feattype_geom_mview)})"
+                self.sig_progress.emit(step, msg)
 
-                    # Update progress bar
-                    msg = f"Refreshing {ftype} layers"
-                    self.sig_progress.emit(step, msg)
+            return is_refreshed
 
-                    try:
-                        with temp_conn.cursor() as cur:
-                            cur.execute(query)
-                            cur.execute(query2)
-                        temp_conn.commit()
-                        # time.sleep(0.05) # Use this for debugging instead of waiting for mats.
+        try:
+            # Open new temp sessions, reserved for mat refresh.
+            for i in range(n_jobs):
+                worker_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, f"(Refresh layers {i+1}/{n_jobs})"]))
+                if not worker_conn:
+                    raise psycopg2.OperationalError("Could not open all connections to refresh the layers")
+                sql.set_session_parallel_query(conn=worker_conn, n_workers=self.n_parallel_workers)
+                conn_pool.put(worker_conn)
+
+            # Start measuring time
+            time_start = time.time()
+
+            # The shared root geometries must be refreshed before the gviews selecting from them.
+            worker_conn = conn_pool.get()
+            try:
+                rg_starts = sql.refresh_root_geom_caches(dlg=dlg, conn=worker_conn, gv_names=[mview for ftype, mview, n_feat in feattype_geom_mview],
+                                                         is_concurrent=is_concurrent, deltas=deltas, delta_start=delta_start)
+                if rg_starts is None:
+                    raise psycopg2.DataError("Could not refresh the root geometries of the layers")
+            finally:
+                conn_pool.put(worker_conn)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [executor.submit(refresh_gview, ftype, mview) for ftype, mview, n_feat in feattype_geom_mview]
+                results = [f.result() for f in futures]
+
+            if not all(results):
+                fail_flag = True
+                self.sig_fail.emit()
+
+            # Update the refresh_date of all refreshed views at once.
+            if refreshed_gviews:
+                query = pysql.SQL("""
+                    UPDATE {_usr_schema}.layer_metadata AS lm
+                    SET refresh_date = r.refresh_date, gv_state = 'populated'
+                    FROM unnest({_gv_names}::varchar[], {_refresh_dates}::timestamptz[]) AS r(gv_name, refresh_date)
+                    WHERE lm.gv_name = r.gv_name;
+                    """).format(
+                    _usr_schema = pysql.Identifier(usr_schema),
+                    _gv_names = pysql.Literal(list(refreshed_gviews.keys())),
+                    _refresh_dates = pysql.Literal(list(refreshed_gviews.values()))
+                    )
+
+                worker_conn = conn_pool.get()
+                try:
+                    with worker_conn.cursor() as cur:
+                        cur.execute(query)
+                    worker_conn.commit()
 
-                    except (Exception, psycopg2.Error) as error:
-                        temp_conn.rollback()
-                        fail_flag = True
-                        gen_f.critical_log(
-                            func=self.refresh_all_gviews_thread,
-                            location=FILE_LOCATION,
-                            header="Refreshing layers",
-                            error=error)
-                        self.sig_fail.emit()
+                except (Exception, psycopg2.Error) as error:
+                    worker_conn.rollback()
+                    fail_flag = True
+                    gen_f.critical_log(
+                        func=self.refresh_all_gviews_thread,
+                        location=FILE_LOCATION,
+                        header="Updating refresh date of layers",
+                        error=error)
+                    self.sig_fail.emit()
+                finally:
+                    conn_pool.put(worker_conn)
 
             # Measure elapsed time
-            print(f"Refresh layers process completed in {round((time.time() - time_start), 4)} seconds")
+            print(f"Refresh layers process ({n_jobs} connections) completed in {round((time.time() - time_start), 4)} seconds")
 
         except (Exception, psycopg2.Error) as error:
             fail_flag = True
             gen_f.critical_log(
                 func=self.refresh_all_gviews_thread,
                 location=FILE_LOCATION,
-                header="Establishibng temporary connection",
+                header="Establishing temporary connections",
                 error=error)
             self.sig_fail.emit()
 
@@ -480,10 +699,58 @@ class RefreshLayersWorker(QObject):
             pass
         
         self.sig_finished.emit()
-        # Close temp connection
-        temp_conn.close()
+        # Give temp connections back to the pool
+        while not conn_pool.empty():
+            conn_f.release_db_connection(conn=conn_pool.get())
         return None
 
+    def filter_changed_gviews(self, feattype_geom_mview: list[tuple], extents: str = None) -> tuple:
+        """Returns the subset of views (feature_type, gv_name, n_features) that contain features
+        inserted, modified or deleted in the cdb_schema since their last refresh, with the co_ids of
+        these features by view (and shared root geometries), and the time at which they were listed.
+
+        A feature is changed also when only its child features are (e.g. the thematic surfaces of a
+        building). All views are returned if the changes cannot be determined. If the changed features
+        exceed the percentage set in 'refresh_delta_max', a full refresh is cheaper: all views are
+        returned, without co_ids. If the extents are given, only the changes within them are considered,
+        and the views changed there are returned regardless of 'refresh_delta_max'.
+
+        Note: the extents (and the counters) only select which views to refresh. The delta of each
+        selected view is applied in full: the changes outside of the extents are refreshed as well.
+        The views whose co_ids are not known (e.g. never refreshed) are refreshed in full.
+        """
+        dlg = self.dlg
+
+        res = sql.exec_gview_delta(dlg=dlg, extents=extents)
+        if res is None:
+            return feattype_geom_mview, {}, None
+        delta_start, deltas = res
+
+        # Views whose changes cannot be determined (e.g. never refreshed) are always refreshed.
+        changed_gviews: set = set()
+        co_ids: dict = {}
+        n_changed: int = 0
+        for gv_name, n_features, n_modified, n_deleted, gv_co_ids in deltas:
+            if gv_co_ids is not None:
+                co_ids[gv_name] = gv_co_ids
+            if gv_name.startswith("_rg_"):
+                # The shared root geometries are refreshed with the views selecting from them.
+                continue
+            if n_modified is None or n_deleted is None:
+                changed_gviews.add(gv_name)
+            elif n_modified + n_deleted > 0:
+                changed_gviews.add(gv_name)
+                n_changed += n_modified + n_deleted
+        checked_gviews: set = {d[0] for d in deltas}
+
+        n_total: int = sum(n_feat or 0 for ftype, mview, n_feat in feattype_geom_mview)
+        if not extents and n_total > 0 and (n_changed * 100 / n_total) > self.delta_max:
+            msg: str = f"Changed features ({n_changed}/{n_total}) exceed {self.delta_max}%: all layers are refreshed in full"
+            QgsMessageLog.logMessage(msg, dlg.PLUGIN_NAME, level=Qgis.MessageLevel.Info)
+            return feattype_geom_mview, {}, None
+
+        return [v for v in feattype_geom_mview if v[1] in changed_gviews or v[1] not in checked_gviews], co_ids, delta_start
+
 
 ###--EVENTS (start)########################################################
 
@@ -500,6 +767,299 @@ def evt_refresh_layers_success(dlg: CDB4LoaderDialog) -> None:
 
 ###--EVENTS (end) ########################################################
 
+#####################################################################################
+##### POPULATE LAYERS WORKER ########################################################
+#####################################################################################
+
+def run_populate_layers_thread(dlg: CDB4LoaderDialog) -> None:
+    """Function that populates the queued gviews in the database
+    by branching a new Worker thread to execute the operation on.
+
+    Contrary to the other workers, the Layers tab remains usable, so that the layers
+    that are already populated can be imported while the others are still being populated.
+    """
+    if not sql.count_gviews_to_populate(dlg=dlg):
+        return None # Nothing to do
+
+    for index in range(dlg.vLayoutUserConn.count()):
+        widget = dlg.vLayoutUserConn.itemAt(index).widget()
+        if not widget:
+            continue
+        if widget.objectName() == "gbxLayerButtons":
+            # Add a new progress bar to follow the population procedure.
+            dlg.create_progress_bar(layout=dlg.vLayoutUserConn, position=index+1)
+            break
+
+    # Create new thread object.
+    dlg.thread = QThread()
+    # Instantiate worker object for the operation.
+    # The settings are read here, as the widgets must not be accessed from the worker thread.
+    dlg.worker = PopulateLayersWorker(dlg,
+        n_jobs=dlg.qspbRefreshJobs.value(),
+        n_parallel_workers=dlg.qspbParallelWorkers.value())
+    # Move worker object to the be executed on the new thread.
+    dlg.worker.moveToThread(dlg.thread)
+
+    #-SIGNALS---(start)--################################################################
+    # Disable widgets to avoid queuing signals.
+    dlg.thread.started.connect(lambda: dlg.gbxConnection.setDisabled(True))
+    dlg.thread.started.connect(lambda: dlg.gbxDatabase.setDisabled(True))
+    dlg.thread.started.connect(lambda: disable_layer_buttons(dlg))
+    dlg.thread.started.connect(lambda: dlg.btnCloseConn.setDisabled(True))
+    dlg.thread.started.connect(lambda: dlg.tabSettings.setDisabled(True))
+
+    # Execute worker's 'run' method.
+    dlg.thread.started.connect(dlg.worker.populate_gviews_thread)
+
+    # Capture progress to show in bar.
+    dlg.worker.sig_progress.connect(dlg.evt_update_bar)
+
+    # As soon as the first layer is ready, set up the Layers tab.
+    dlg.worker.sig_first_populated.connect(lambda: tc_f.check_layers_status(dlg=dlg))
+    dlg.worker.sig_first_populated.connect(lambda: disable_layer_buttons(dlg))
+
+    # Get rid of worker and thread objects.
+    dlg.worker.sig_finished.connect(dlg.thread.quit)
+    dlg.worker.sig_finished.connect(dlg.worker.deleteLater)
+    dlg.thread.finished.connect(dlg.thread.deleteLater)
+
+    # (Re)Enable widgets.
+    dlg.thread.finished.connect(lambda: dlg.gbxConnection.setDisabled(False))
+    dlg.thread.finished.connect(lambda: dlg.gbxDatabase.setDisabled(False))
+    dlg.thread.finished.connect(lambda: dlg.btnCloseConn.setDisabled(False))
+    dlg.thread.finished.connect(lambda: dlg.tabSettings.setDisabled(False))
+    dlg.thread.finished.connect(dlg.msg_bar.clearWidgets)
+
+    # Feature select, Create, Refresh, Drop, Buttons will be taken care by function tc_f.check_layers_status(dlg=dlg)
+    dlg.worker.sig_finished.connect(lambda: evt_refresh_layers_success(dlg))
+    #-SIGNALS---(end)--################################################################
+
+    # Initiate worker thread
+    dlg.thread.start()
+
+    return None
+
+
+def disable_layer_buttons(dlg: CDB4LoaderDialog) -> None:
+    """Function that disables the buttons to create, refresh and drop layers.
+    """
+    dlg.gbxFeatSel.setDisabled(True)
+    dlg.btnCreateLayers.setDisabled(True)
+    dlg.btnRefreshLayers.setDisabled(True)
+    dlg.btnDropLayers.setDisabled(True)
+
+    return None
+
+
+class PopulateLayersWorker(QObject):
+    """Class to assign Worker that populates the queued gviews, one job per gview.
+
+    The queue is kept in table layer_metadata (column gv_state), so it survives QGIS being closed:
+    the population resumes the next time the cdb_schema is selected in the Loader.
+    """
+    # Create custom signals.
+    sig_finished = pyqtSignal()
+    sig_progress = pyqtSignal(int, str)
+    sig_first_populated = pyqtSignal()
+    sig_fail = pyqtSignal()
+
+    def __init__(self, dlg: CDB4LoaderDialog, n_jobs: int, n_parallel_workers: int):
+        super().__init__()
+        self.dlg = dlg
+        self.n_jobs = n_jobs
+        self.n_parallel_workers = n_parallel_workers
+
+    def populate_gviews_thread(self):
+        """Execution method that populates the queued gviews using a bounded pool of worker connections
+        (see setting 'refresh_jobs'), starting from the largest ones.
+
+        Each job is claimed in the database (queued -> populating), so that jobs are never run twice.
+        While populating a gview, the worker session holds an advisory lock on its layer_metadata row:
+        a 'populating' gview whose lock is free was interrupted, and is queued again.
+        Once done, the gview is marked as 'populated' (or 'failed'), and its refresh_date is set to the time
+        at which its refresh (or that of the root geometries it selects from) started.
+        """
+        dlg = self.dlg
+        usr_schema = dlg.USR_SCHEMA
+
+        progress_lock = threading.Lock()
+        step: int = 0
+        n_failed: int = 0
+        rg_starts: dict = {} # gv_name -> time at which the refresh of the root geometries it selects from started
+
+        claim_query = pysql.SQL("""
+            UPDATE {_usr_schema}.layer_metadata AS lm
+            SET gv_state = 'populating'
+            WHERE lm.id = (
+                SELECT l.id FROM {_usr_schema}.layer_metadata AS l
+                WHERE l.cdb_schema = {_cdb_schema} AND l.gv_state = 'queued'
+                ORDER BY l.n_features DESC NULLS LAST
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED)
+            RETURNING lm.id, lm.feature_type, lm.gv_name, pg_advisory_lock(hashtext({_lock_space}), lm.id::integer);
+            """).format(
+            _usr_schema = pysql.Identifier(usr_schema),
+            _cdb_schema = pysql.Literal(dlg.CDB_SCHEMA),
+            _lock_space = pysql.Literal(f"{usr_schema}.layer_metadata")
+            )
+
+        unlock_query = pysql.SQL("""
+            SELECT pg_advisory_unlock(hashtext({_lock_space}), {_id}::integer);
+            """).format(
+            _lock_space = pysql.Literal(f"{usr_schema}.layer_metadata"),
+            _id = pysql.Placeholder('id')
+            )
+
+        def set_state(worker_conn, mview: str, gv_state: str, refresh_date=None) -> None:
+            query = pysql.SQL("""
+                UPDATE {_usr_schema}.layer_metadata
+                SET gv_state = {_gv_state}, refresh_date = CASE WHEN {_gv_state} = 'populated' THEN {_refresh_date}::timestamptz ELSE refresh_date END
+                WHERE gv_name = {_gv_name};
+                """).format(
+                _usr_schema = pysql.Identifier(usr_schema),
+                _gv_state = pysql.Literal(gv_state),
+                _refresh_date = pysql.Literal(refresh_date),
+                _gv_name = pysql.Literal(mview)
+                )
+            with worker_conn.cursor() as cur:
+                cur.execute(query)
+            worker_conn.commit()
+
+        def populate_gviews(worker_conn) -> None:
+            nonlocal step, n_failed
+            while True:
+                # Claim the next job
+                with worker_conn.cursor() as cur:
+                    cur.execute(claim_query)
+                    job = cur.fetchone()
+                worker_conn.commit()
+                if not job:
+                    return None
+                lm_id, ftype, mview, _ = job
+
+                query = pysql.SQL("""
+                    SELECT {_qgis_pkg_schema}.refresh_gview({_usr_schema}, {_gv_name}, FALSE);
+                    """).format(
+                    _qgis_pkg_schema = pysql.Identifier(dlg.QGIS_PKG_SCHEMA),
+                    _usr_schema = pysql.Literal(usr_schema),
+                    _gv_name = pysql.Literal(mview)
+                    )
+
+                try:
+                    with worker_conn.cursor() as cur:
+                        cur.execute("SELECT clock_timestamp();")
+                        refresh_start = cur.fetchone()[0]
+                        cur.execute(query)
+                    worker_conn.commit()
+                    # The view is as old as the root geometries it selects from.
+                    refresh_start = rg_starts.get(mview, refresh_start)
+                    set_state(worker_conn, mview, "populated", refresh_start)
+                    is_populated = True
+
+                except (Exception, psycopg2.Error) as error:
+                    worker_conn.rollback()
+                    set_state(worker_conn, mview, "failed")
+                    is_populated = False
+                    gen_f.critical_log(
+                        func=self.populate_gviews_thread,
+                        location=FILE_LOCATION,
+                        header=f"Populating layer {mview}",
+                        error=error)
+
+                # The job is over, release it.
+                with worker_conn.cursor() as cur:
+                    cur.execute(unlock_query, {'id': lm_id})
+                worker_conn.commit()
+
+                with progress_lock:
+                    step += 1
+                    if is_populated and step - n_failed == 1:
+                        self.sig_first_populated.emit()
+                    if not is_populated:
+                        n_failed += 1
+                    # Update progress bar
+                    msg = f"Populated {ftype} layers ({step}/{n_jobs_tot})"
+                    self.sig_progress.emit(step, msg)
+
+        # Jobs left as 'populating' by a session that is gone (e.g. QGIS was closed) were interrupted: queue them again.
+        # The jobs of a session still populating them (e.g. another QGIS instance) keep their advisory lock, and are left alone.
+        reset_query = pysql.SQL("""
+            UPDATE {_usr_schema}.layer_metadata AS lm
+            SET gv_state = 'queued'
+            FROM (
+                SELECT l.id FROM {_usr_schema}.layer_metadata AS l
+                WHERE l.cdb_schema = {_cdb_schema} AND l.gv_state = 'populating'
+                ) AS p
+            WHERE lm.id = p.id AND pg_try_advisory_xact_lock(hashtext({_lock_space}), p.id::integer);
+            SELECT count(*), array_agg(gv_name) FROM {_usr_schema}.layer_metadata
+            WHERE cdb_schema = {_cdb_schema} AND gv_state = 'queued';
+            """).format(
+            _usr_schema = pysql.Identifier(usr_schema),
+            _cdb_schema = pysql.Literal(dlg.CDB_SCHEMA),
+            _lock_space = pysql.Literal(f"{usr_schema}.layer_metadata")
+            )
+
+        worker_conns: list = []
+        try:
+            worker_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(Populate layers)"]))
+            if not worker_conn:
+                raise psycopg2.OperationalError("Could not open the connection to populate the layers")
+            sql.set_session_parallel_query(conn=worker_conn, n_workers=self.n_parallel_workers)
+            worker_conns.append(worker_conn)
+
+            with worker_conn.cursor() as cur:
+                cur.execute(reset_query)
+                n_jobs_tot, queued_gviews = cur.fetchone()
+            worker_conn.commit()
+
+            # The shared root geometries must be refreshed before the gviews selecting from them.
+            if queued_gviews:
+                rg_starts = sql.refresh_root_geom_caches(dlg=dlg, conn=worker_conn, gv_names=queued_gviews)
+                if rg_starts is None:
+                    raise psycopg2.DataError("Could not refresh the root geometries of the layers")
+
+            n_jobs: int = max(1, min(self.n_jobs, n_jobs_tot))
+
+            # Set progress bar goal
+            dlg.bar.setMaximum(n_jobs_tot)
+
+            # Open new temp sessions, reserved for the population of the gviews.
+            for i in range(1, n_jobs):
+                worker_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, f"(Populate layers {i+1}/{n_jobs})"]))
+                if not worker_conn:
+                    raise psycopg2.OperationalError("Could not open all connections to populate the layers")
+                sql.set_session_parallel_query(conn=worker_conn, n_workers=self.n_parallel_workers)
+                worker_conns.append(worker_conn)
+
+            # Start measuring time
+            time_start = time.time()
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [executor.submit(populate_gviews, worker_conn) for worker_conn in worker_conns]
+                for f in futures:
+                    f.result()
+
+            if n_failed > 0:
+                self.sig_fail.emit()
+
+            # Measure elapsed time
+            print(f"Populate layers process ({n_jobs} connections) completed in {round((time.time() - time_start), 4)} seconds")
+
+        except (Exception, psycopg2.Error) as error:
+            gen_f.critical_log(
+                func=self.populate_gviews_thread,
+                location=FILE_LOCATION,
+                header="Populating layers",
+                error=error)
+            self.sig_fail.emit()
+
+        self.sig_finished.emit()
+        # Give temp connections back to the pool
+        for worker_conn in worker_conns:
+            conn_f.release_db_connection(conn=worker_conn)
+        return None
+
+
 #####################################################################################
 ##### DROP LAYERS WORKER ############################################################
 #####################################################################################
@@ -622,9 +1182,10 @@ class DropLayersWorker(QObject):
         # Set progress bar goal
         dlg.bar.setMaximum(n_iter_steps)
 
+        temp_conn = None
         try:
             # Open new temp session, reserved for dropping layers.
-            temp_conn = conn_f.open_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(Drop layers and detail views)"]))
+            temp_conn = conn_f.borrow_db_connection(db_connection=dlg.DB, app_name=" ".join([dlg.DLG_NAME_LABEL, "(Drop layers and detail views)"]))
             with temp_conn:
 
                 # Start measuring time
@@ -708,7 +1269,7 @@ class DropLayersWorker(QObject):
         
         self.sig_finished.emit()
         # Close temp connection
-        temp_conn.close()
+        conn_f.release_db_connection(conn=temp_conn)
         return None
 
 
@@ -765,4 +1326,153 @@ def evt_drop_layers_fail(dlg: CDB4LoaderDialog) -> None:
             notifyUser=True)
 
     return None
-###--EVENTS (end) ########################################################
\ No newline at end of file
+###--EVENTS (end) ########################################################
+
+
+#####################################################################################
+##### IMPORT LAYERS TASK ############################################################
+#####################################################################################
+
+def run_import_layers_task(dlg: CDB4LoaderDialog, layers: list[CDBLayer]) -> None:
+    """Function that imports the selected layers into the QGIS project.
+    The QgsVectorLayers (i.e. the introspection of the views by the postgres provider, which is the slow part)
+    are created in background tasks, at most c.IMPORT_LAYERS_MAX_TASKS at the same time. Once they are all ready,
+    they are added to the layer tree in one go on the main thread, together with their styles and relations.
+    The import can be cancelled from the task manager of QGIS (in the status bar).
+    """
+    # Layers already in the project are skipped by add_selected_layers_to_ToC(): do not create them at all.
+    new_layers: list[CDBLayer] = [layer for layer in layers if not QgsProject.instance().mapLayersByName(layer.layer_name)]
+
+    # Geometry type and srid of all the views, read at once, to be passed to the provider in the uris.
+    geom_metadata: dict[str, tuple[str, int]] = sql.get_layers_geometry_metadata(dlg, layer_names=[layer.layer_name for layer in new_layers]) or {}
+    layer_uris: list[tuple[str, str]] = [(layer.layer_name, tl_f.create_qgis_vector_layer_uri(dlg, layer.layer_name, *geom_metadata.get(layer.layer_name, (None, None))))
+                                         for layer in new_layers]
+
+    # Split the layers among the subtasks, one subtask per chunk of layers.
+    n_jobs: int = max(1, min(c.IMPORT_LAYERS_MAX_TASKS, len(layer_uris)))
+    chunks: list[list[tuple[str, str]]] = [layer_uris[i::n_jobs] for i in range(n_jobs)]
+
+    # The task must be kept referenced, or it is garbage collected while running.
+    dlg.import_task = ImportLayersTask(description=f"{dlg.DLG_NAME_LABEL}: Import {len(layers)} layers", layers=layers)
+    for i, chunk in enumerate(chunks):
+        if chunk:
+            sub_task = CreateLayersTask(description=f"Create layers ({i+1}/{n_jobs})", layer_uris=chunk, crs=dlg.CRS, qgs_layers=dlg.import_task.qgs_layers)
+            dlg.import_task.addSubTask(sub_task, [], QgsTask.SubTaskDependency.ParentDependsOnSubTask)
+
+    # Anti-panic clicking: Disable the import button until the layers are in the project.
+    dlg.btnImport.setDisabled(True)
+
+    qgs_layers: dict[str, QgsVectorLayer] = dlg.import_task.qgs_layers
+    dlg.import_task.taskCompleted.connect(lambda: evt_import_layers_success(dlg, layers=layers, qgs_layers=qgs_layers))
+    dlg.import_task.taskTerminated.connect(lambda: evt_import_layers_fail(dlg))
+
+    QgsApplication.taskManager().addTask(dlg.import_task)
+
+    return None
+
+
+class CreateLayersTask(QgsTask):
+    """Class to assign the subtask that creates (and validates) a chunk of the layers to import.
+    The layers are stored in qgs_layers, shared by all subtasks of the import.
+    """
+    def __init__(self, description: str, layer_uris: list[tuple[str, str]], crs: QgsCoordinateReferenceSystem, qgs_layers: dict[str, QgsVectorLayer]):
+        super().__init__(description, QgsTask.Flag.CanCancel)
+        self.layer_uris = layer_uris
+        self.crs = crs
+        self.qgs_layers = qgs_layers
+
+    def run(self) -> bool:
+        """Execution method that creates the layers. They are moved to the main thread,
+        as they are going to be added to the project there.
+        """
+        main_thread = QgsApplication.instance().thread()
+
+        for step, (layer_name, uri) in enumerate(self.layer_uris, start=1):
+            if self.isCanceled():
+                return False
+
+            new_layer = tl_f.open_qgis_vector_layer(uri, layer_name=layer_name, crs=self.crs)
+            if new_layer.isValid():
+                new_layer.moveToThread(main_thread)
+                self.qgs_layers[layer_name] = new_layer
+            # Otherwise, the layer is created again (and the failure reported) on the main thread
+
+            self.setProgress(step * 100 / len(self.layer_uris))
+
+        return True
+
+
+class ImportLayersTask(QgsTask):
+    """Class to assign the task that imports the selected layers. It completes once all its
+    subtasks (see CreateLayersTask) have created the layers (in qgs_layers).
+    """
+    def __init__(self, description: str, layers: list[CDBLayer]):
+        super().__init__(description, QgsTask.Flag.CanCancel)
+        self.layers = layers
+        self.qgs_layers: dict[str, QgsVectorLayer] = {}
+
+    def run(self) -> bool:
+        """Execution method. Nothing to do: the work is carried out by the subtasks.
+        """
+        return not self.isCanceled()
+
+###--EVENTS (start)########################################################
+
+def evt_import_layers_success(dlg: CDB4LoaderDialog, layers: list[CDBLayer], qgs_layers: dict[str, QgsVectorLayer]) -> None:
+    """Event that is called when the task creating the layers finishes successfully.
+    It adds the layers to the layer tree and fixes the layout of the latter.
+    """
+    dlg.import_task = None
+    num_imported_layers = tl_f.add_selected_layers_to_ToC(dlg=dlg, layers=layers, qgs_layers=qgs_layers)
+
+    # Fix the layout of the layer tree only if something has been really imported
+    if num_imported_layers > 0:
+        # Structure 'Table of Contents' tree.
+        db_node = tl_f.get_citydb_node(dlg=dlg)
+        tl_f.sort_ToC(group=db_node)
+        tl_f.send_to_ToC_top(group=db_node)
+
+        # Finally bring the Relief Feature type at the bottom of the ToC.
+        tl_f.send_to_ToC_bottom(node=QgsProject.instance().layerTreeRoot())
+
+        # Set CRS of the project to match the one of the 3DCityDB.
+        QgsProject.instance().setCrs(crs=dlg.CRS)
+        
+        # A final success message.
+        msg = "Layer(s) successfully imported"
+        QgsMessageLog.logMessage(message=msg, tag=dlg.PLUGIN_NAME, level=Qgis.MessageLevel.Success, notifyUser=True)
+
+        # When adding a new layer, the dv and lu tables are always expanded.
+        # To reduce the space "consumed" in the layer tree tab, 
+        # close all detail view groups and the look-up tables groups
+        # Additionally, unselect them, thus making the spatial layers in the dv invisible
+
+        dv_lu_nodes = tl_f.get_all_dv_and_lu_nodes(dlg=dlg)
+        if len(dv_lu_nodes) != 0:
+            for node in dv_lu_nodes:
+                # print(node.name())
+                if node.isExpanded():
+                    node.setExpanded(False)
+                    node.setItemVisibilityCheckedRecursive(False)
+
+    # Re-enable the import button (if some layers are still selected)
+    dlg.evt_cbxLayers_changed()
+
+    return None
+
+
+def evt_import_layers_fail(dlg: CDB4LoaderDialog) -> None:
+    """Event that is called when the task creating the layers is cancelled or fails.
+    Nothing is added to the project.
+    """
+    dlg.import_task = None
+
+    msg: str = "Import of the layers cancelled"
+    QgsMessageLog.logMessage(message=msg, tag=dlg.PLUGIN_NAME, level=Qgis.MessageLevel.Warning, notifyUser=True)
+
+    # Re-enable the import button (if some layers are still selected)
+    dlg.evt_cbxLayers_changed()
+
+    return None
+
+###--EVENTS (end) ########################################################
@@ -11,7 +11,7 @@ from ... import cdb_tools_main_constants as main_c
 # QGIS Package minimum version
 QGIS_PKG_MIN_VERSION_MAJOR: int = 0
 QGIS_PKG_MIN_VERSION_MINOR: int = 10
-QGIS_PKG_MIN_VERSION_MINOR_REV: int = 4
+QGIS_PKG_MIN_VERSION_MINOR_REV: int = 5
 QGIS_PKG_MIN_VERSION_TXT: str = ".".join([str(QGIS_PKG_MIN_VERSION_MAJOR), str(QGIS_PKG_MIN_VERSION_MINOR), str(QGIS_PKG_MIN_VERSION_MINOR_REV)])
 
 # Path to QML configuration files
@@ -42,6 +42,16 @@ lookup_tables_group_alias: str = "Look-up tables"
 
 generics_table: str = "cityobject_genericattrib"
 
+# Cache of the number of features of the gviews within the extents
+GVIEW_COUNT_CACHE_SIZE: int = 5000     # Maximum number of entries (least recently used are evicted first)
+GVIEW_COUNT_CACHE_QUANTA: int = 10000  # Extents are snapped to a grid of approx. 1/QUANTA of their largest side
+
+# Maximum number of background tasks creating the layers to import at the same time
+IMPORT_LAYERS_MAX_TASKS: int = 4
+
+# Minimum number of features with changed attributes to save them in bulk, instead of feature by feature
+BULK_EDIT_MIN_FEATURES: int = 50
+
 enumerations_table: str = "v_enumeration_value"
 codelists_table: str = "v_codelist_value"
 
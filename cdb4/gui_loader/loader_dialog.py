@@ -42,7 +42,7 @@ if TYPE_CHECKING:
 import os
 from psycopg2.extensions import connection as pyconn
 
-from qgis.core import Qgis, QgsMessageLog, QgsProject, QgsRectangle, QgsGeometry, QgsWkbTypes, QgsCoordinateReferenceSystem
+from qgis.core import Qgis, QgsMessageLog, QgsProject, QgsRectangle, QgsGeometry, QgsWkbTypes, QgsCoordinateReferenceSystem, QgsTask
 from qgis.gui import QgsRubberBand, QgsMapCanvas, QgsMessageBar 
 from qgis.PyQt import uic
 from qgis.PyQt.QtCore import Qt, QThread
@@ -60,7 +60,7 @@ from .functions import tab_layers_widget_functions as tl_wf
 from .functions import tab_layers_functions as tl_f
 from .functions import tab_settings_widget_functions as ts_wf
 from .functions import canvas, sql, threads as thr
-from .other_classes import DialogChecks, DefaultSettings
+from .other_classes import DialogChecks, DefaultSettings, GViewCountCache
 from . import loader_constants as c
 
 # This loads the .ui file so that PyQt can populate the plugin with the elements from Qt Designer
@@ -111,6 +111,8 @@ class CDB4LoaderDialog(QDialog, FORM_CLASS):
         self.msg_bar: QgsMessageBar
         self.bar: QProgressBar
         self.thread: QThread
+        # Variable to store the background task that imports the layers (see threads.run_import_layers_task)
+        self.import_task: QgsTask = None
 
         self.settings = DefaultSettings()
         self.checks = DialogChecks()
@@ -129,6 +131,8 @@ class CDB4LoaderDialog(QDialog, FORM_CLASS):
         self.EnumConfigRegistry: dict[str, EnumConfig] = {}
         # Dictionary containing config data to set up codelist combo boxes in the attribute forms
         self.CodeListConfigRegistry: dict[str, CodeListConfig] = {}
+        # Cache of the number of features of the gviews within the extents (see GViewCountCache)
+        self.GViewCountCache = GViewCountCache()
         # Variable to store the selected CodeListSet
         self.selectedCityGMLCodeListSet: str = None
 
@@ -622,6 +626,7 @@ class CDB4LoaderDialog(QDialog, FORM_CLASS):
 
         # Initialize/create the FeatureTypeRegistry
         tc_f.initialize_feature_type_registry(dlg=self)
+        self.GViewCountCache.clear()
 
         # Clear status of previous schema.
         self.lblLayerExist_out.clear()
@@ -647,6 +652,9 @@ class CDB4LoaderDialog(QDialog, FORM_CLASS):
         # Check whether layers exist, have been refreshed, and set up the GUI elements accordinly
         tc_f.check_layers_status(dlg=self)
 
+        # Resume the background population of the layers, if it was interrupted (e.g. QGIS was closed)
+        thr.run_populate_layers_thread(dlg=self)
+
         return None
 
     # 'Basemap (OSM)' group box events (in 'User Connection' tab)
@@ -1201,37 +1209,8 @@ class CDB4LoaderDialog(QDialog, FORM_CLASS):
 
         # TODO: Add similar process for selected ADE codelist set
 
-        num_imported_layers = tl_f.add_selected_layers_to_ToC(dlg=self, layers=selected_layers)
-
-        # Fix the layout of the layer tree only if something has been really imported
-        if num_imported_layers > 0:
-            # Structure 'Table of Contents' tree.
-            db_node = tl_f.get_citydb_node(dlg=self)
-            tl_f.sort_ToC(group=db_node)
-            tl_f.send_to_ToC_top(group=db_node)
-
-            # Finally bring the Relief Feature type at the bottom of the ToC.
-            tl_f.send_to_ToC_bottom(node=QgsProject.instance().layerTreeRoot())
-
-            # Set CRS of the project to match the one of the 3DCityDB.
-            QgsProject.instance().setCrs(crs=self.CRS)
-            
-            # A final success message.
-            msg = "Layer(s) successfully imported"
-            QgsMessageLog.logMessage(message=msg, tag=self.PLUGIN_NAME, level=Qgis.MessageLevel.Success, notifyUser=True)
-
-            # When adding a new layer, the dv and lu tables are always expanded.
-            # To reduce the space "consumed" in the layer tree tab, 
-            # close all detail view groups and the look-up tables groups
-            # Additionally, unselect them, thus making the spatial layers in the dv invisible
-
-            dv_lu_nodes = tl_f.get_all_dv_and_lu_nodes(dlg=self)
-            if len(dv_lu_nodes) != 0:
-                for node in dv_lu_nodes:
-                    # print(node.name())
-                    if node.isExpanded():
-                        node.setExpanded(False)
-                        node.setItemVisibilityCheckedRecursive(False)
+        # The layers are created in the background, then added to the project (see evt_import_layers_success)
+        thr.run_import_layers_task(dlg=self, layers=selected_layers)
 
         return None
 
@@ -1281,6 +1260,14 @@ class CDB4LoaderDialog(QDialog, FORM_CLASS):
         minArea = self.qspbMinArea.value()
         maxFeatImp = self.qspbMaxFeatImport.value()
         frcLayerGen = self.cbxForceLayerGen.checkState()
+        refrJobs = self.qspbRefreshJobs.value()
+        refrIncr = self.cbxRefreshIncremental.checkState()
+        refrDeltaMax = self.qspbRefreshDeltaMax.value()
+        creaJobs = self.qspbCreateJobs.value()
+        popOnCrea = self.cbxPopulateOnCreate.checkState()
+        parWorkers = self.qspbParallelWorkers.value()
+        refrConc = self.cbxRefreshConcurrently.checkState()
+        refrArea = self.cbxRefreshArea.checkState()
         enable3D = self.cbxEnable3D.checkState()
 
         if decPrec is None:
@@ -1289,12 +1276,28 @@ class CDB4LoaderDialog(QDialog, FORM_CLASS):
             minArea = self.settings.simp_geom_min_area_default
         if maxFeatImp is None:
             maxFeatImp = self.settings.max_features_to_import_default
+        if refrJobs is None:
+            refrJobs = self.settings.refresh_jobs_default
+        if refrDeltaMax is None:
+            refrDeltaMax = self.settings.refresh_delta_max_default
+        if creaJobs is None:
+            creaJobs = self.settings.create_jobs_default
+        if parWorkers is None:
+            parWorkers = self.settings.parallel_workers_default
 
         if all((geomSimpEn == self.settings.simp_geom_enabled_default,
                 decPrec == self.settings.simp_geom_dec_prec_default,
                 minArea == self.settings.simp_geom_min_area_default,
                 maxFeatImp == self.settings.max_features_to_import_default,
                 frcLayerGen == self.settings.force_all_layers_creation_default,
+                refrJobs == self.settings.refresh_jobs_default,
+                refrIncr == self.settings.refresh_incremental_default,
+                refrDeltaMax == self.settings.refresh_delta_max_default,
+                creaJobs == self.settings.create_jobs_default,
+                popOnCrea == self.settings.populate_on_create_default,
+                parWorkers == self.settings.parallel_workers_default,
+                refrConc == self.settings.refresh_concurrently_default,
+                refrArea == self.settings.refresh_area_default,
                 enable3D == self.settings.enable_3d_renderer_default
                 )):
             # No need to store the settings, they are unchanged. Inform the user
@@ -1308,6 +1311,14 @@ class CDB4LoaderDialog(QDialog, FORM_CLASS):
             {'name': 'minArea'    , 'data_type': 3, 'data_value': minArea    , 'label': self.settings.simp_geom_min_area_label},
             {'name': 'maxFeatImp' , 'data_type': 2, 'data_value': maxFeatImp , 'label': self.settings.max_features_to_import_label},
             {'name': 'frcLayerGen', 'data_type': 4, 'data_value': int(frcLayerGen), 'label': self.settings.force_all_layers_creation_label},
+            {'name': 'refrJobs'   , 'data_type': 2, 'data_value': refrJobs   , 'label': self.settings.refresh_jobs_label},
+            {'name': 'refrIncr'   , 'data_type': 4, 'data_value': int(refrIncr)   , 'label': self.settings.refresh_incremental_label},
+            {'name': 'refrDeltaMax', 'data_type': 2, 'data_value': refrDeltaMax, 'label': self.settings.refresh_delta_max_label},
+            {'name': 'creaJobs'   , 'data_type': 2, 'data_value': creaJobs   , 'label': self.settings.create_jobs_label},
+            {'name': 'popOnCrea'  , 'data_type': 4, 'data_value': int(popOnCrea)  , 'label': self.settings.populate_on_create_label},
+            {'name': 'parWorkers' , 'data_type': 2, 'data_value': parWorkers , 'label': self.settings.parallel_workers_label},
+            {'name': 'refrConc'   , 'data_type': 4, 'data_value': int(refrConc)   , 'label': self.settings.refresh_concurrently_label},
+            {'name': 'refrArea'   , 'data_type': 4, 'data_value': int(refrArea)   , 'label': self.settings.refresh_area_label},
             {'name': 'enable3D'   , 'data_type': 4, 'data_value': int(enable3D)   , 'label': self.settings.enable_3d_renderer_label},
         ]
         # print(settings_list)
@@ -1352,6 +1363,22 @@ class CDB4LoaderDialog(QDialog, FORM_CLASS):
                 self.qspbMaxFeatImport.setValue(s["data_value"])
             elif n == "frcLayerGen":
                 self.cbxForceLayerGen.setChecked(s["data_value"])
+            elif n == "refrJobs":
+                self.qspbRefreshJobs.setValue(s["data_value"])
+            elif n == "refrIncr":
+                self.cbxRefreshIncremental.setChecked(s["data_value"])
+            elif n == "refrDeltaMax":
+                self.qspbRefreshDeltaMax.setValue(s["data_value"])
+            elif n == "creaJobs":
+                self.qspbCreateJobs.setValue(s["data_value"])
+            elif n == "popOnCrea":
+                self.cbxPopulateOnCreate.setChecked(s["data_value"])
+            elif n == "parWorkers":
+                self.qspbParallelWorkers.setValue(s["data_value"])
+            elif n == "refrConc":
+                self.cbxRefreshConcurrently.setChecked(s["data_value"])
+            elif n == "refrArea":
+                self.cbxRefreshArea.setChecked(s["data_value"])
             elif n == "enable3D":
                 self.cbxEnable3D.setChecked(s["data_value"])
             else:
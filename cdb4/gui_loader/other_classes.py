@@ -1,4 +1,6 @@
 import os.path
+import math
+from collections import OrderedDict
 from . import loader_constants as c
 
 class DialogChecks:
@@ -63,6 +65,30 @@ class DefaultSettings:
         self.enable_3d_renderer_default: bool = False
         self.enable_3d_renderer_label: str = "Toggles on or off the 3D rendered and the assignment of the 3D styles to the layers"
 
+        self.refresh_jobs_default: int = 1
+        self.refresh_jobs_label: str = "Number of parallel database connections used to refresh the layers"
+
+        self.refresh_incremental_default: bool = False
+        self.refresh_incremental_label: str = "Toggles on or off the refresh of only those layers whose features changed since the last refresh"
+
+        self.refresh_delta_max_default: int = 20
+        self.refresh_delta_max_label: str = "Percentage of changed features above which all layers are refreshed anyway"
+
+        self.create_jobs_default: int = 1
+        self.create_jobs_label: str = "Number of parallel database connections used to create the layers"
+
+        self.populate_on_create_default: bool = False
+        self.populate_on_create_label: str = "Toggles on or off the population of the layers in the background right after their creation"
+
+        self.parallel_workers_default: int = 0
+        self.parallel_workers_label: str = "Number of server processes used by each connection to create or refresh a layer (0: server settings)"
+
+        self.refresh_concurrently_default: bool = False
+        self.refresh_concurrently_label: str = "Toggles on or off the refresh of the layers without locking out the users reading them (slower)"
+
+        self.refresh_area_default: bool = False
+        self.refresh_area_label: str = "Toggles on or off the refresh of only the layers with features changed within the area extents (each of them is refreshed in full)"
+
         self.enable_ui_based_forms: bool = False
         self.enable_ui_based_forms_label: str = "Toggles on or off the usage of ui-based forms (EXPERIMENTAL)"
 
@@ -74,6 +100,14 @@ class DefaultSettings:
             f"simp_geom_min_area (DEFAULT): {self.simp_geom_min_area_default}<br>" + \
             f"max_features_to_import (DEFAULT): {self.max_features_to_import_default}<br>" + \
             f"force_all_layers_creation (DEFAULT): {self.force_all_layers_creation_default}<br>" + \
+            f"refresh_jobs (DEFAULT): {self.refresh_jobs_default}<br>" + \
+            f"refresh_incremental (DEFAULT): {self.refresh_incremental_default}<br>" + \
+            f"refresh_delta_max (DEFAULT): {self.refresh_delta_max_default}<br>" + \
+            f"create_jobs (DEFAULT): {self.create_jobs_default}<br>" + \
+            f"populate_on_create (DEFAULT): {self.populate_on_create_default}<br>" + \
+            f"parallel_workers (DEFAULT): {self.parallel_workers_default}<br>" + \
+            f"refresh_concurrently (DEFAULT): {self.refresh_concurrently_default}<br>" + \
+            f"refresh_area (DEFAULT): {self.refresh_area_default}<br>" + \
             f"enable_3d_renderer (DEFAULT): {self.enable_3d_renderer_default}<br>"
         return return_str
 
@@ -101,7 +135,8 @@ class CDBLayer():
             qml_symb: str,
             qml_3d: str,
             enum_cols: str,
-            codelist_cols: str
+            codelist_cols: str,
+            gv_state: str = None
             ):
 
         self.l_id = l_id
@@ -123,6 +158,7 @@ class CDBLayer():
         self.qml_3d = qml_3d
         self.enum_cols = enum_cols
         self.codelist_cols = codelist_cols
+        self.gv_state = gv_state
 
         self.n_selected: int = 0
 
@@ -294,6 +330,48 @@ class FeatureType():
         return return_str
 
 
+class GViewCountCache():
+    """This class is used to cache the number of features of each gview within the extents,
+    so that the gviews need not be counted again when the same extents are selected again.
+
+    Entries are keyed by usr_schema, gview name, refresh date and extents (snapped to a grid),
+    so they become stale by themselves as soon as a gview is refreshed.
+    The least recently used entries are evicted first.
+    """
+    def __init__(self, max_size: int = c.GVIEW_COUNT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def make_key(usr_schema: str, layer: CDBLayer, extents) -> tuple:
+        """Returns the cache key of a layer (CDBLayer) within the extents (QgsRectangle)
+        """
+        # Snap the extents to a grid whose cell size is a power of 10, approx. 1/QUANTA of the largest side.
+        size = max(extents.width(), extents.height())
+        exp = math.floor(math.log10(size / c.GVIEW_COUNT_CACHE_QUANTA)) if size > 0 else 0
+        quantum = 10 ** exp
+        q_extents = tuple(round(v / quantum) for v in (extents.xMinimum(), extents.yMinimum(), extents.xMaximum(), extents.yMaximum()))
+
+        return (usr_schema, layer.gv_name, layer.refresh_date, exp, q_extents)
+
+    def get(self, key: tuple):
+        """Returns the cached number of features, or None if not cached
+        """
+        n_selected = self.entries.get(key)
+        if n_selected is not None:
+            self.entries.move_to_end(key)
+        return n_selected
+
+    def put(self, key: tuple, n_selected: int) -> None:
+        self.entries[key] = n_selected
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
 class EnumConfig():
     def __init__(self,
             id: int,
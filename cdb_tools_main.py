@@ -416,6 +416,10 @@ class CDBToolsMain:
         for action in self.actions:
             self.iface.removeDatabaseToolBarIcon(qAction=action)
             self.iface.removePluginDatabaseMenu(name=self.PLUGIN_NAME, action=action)
+
+        # Close the connections still idle in the plugin-wide pool
+        from .cdb4.gui_db_connector.functions import conn_functions as conn_f
+        conn_f.close_db_connection_pool()
         return None
 
 
@@ -28,6 +28,11 @@ URL_GITHUB_PLUGIN: str   = "https://github.com/tudelft3d/3DCityDB-Tools-for-QGIS
 # Database schemas where QGIS Package is installed etc.
 QGIS_PKG_SCHEMA: str = "qgis_pkg"
 
+# Plugin-wide pool of database connections, shared by the workers of all GUIs
+CONN_POOL_MIN_IDLE: int = 1         # Idle connections per database that are kept open regardless of their idle time (none is opened in advance)
+CONN_POOL_MAX_IDLE: int = 8         # Max number of idle connections per database that are kept open
+CONN_POOL_MAX_IDLE_TIME: int = 300  # Seconds after which the idle connections (exceeding CONN_POOL_MIN_IDLE) are closed
+
 # Root folder for cdb4
 CDB4_PLUGIN_DIR: str = "cdb4"
 # Root folder for cdb5